@@ -0,0 +1,320 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import itertools
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from os import PathLike
+
+from .DirectoryWatcher import DirectoryWatcher
+from .FilesIndex import files_indices
+from .FilesIndex import FilesIndex
+from .FilesIndex import FilesIndices
+from .FilesPages import FilesPages
+from .ListingCache import listing_cache
+from .ListingCache import ListingCache
+from .scan import blend_file_names_filter
+from .scan import directory_tree_walk
+from .Template import Template
+from .WatchEvent import WatchEvent
+
+logger = logging.getLogger(__name__)
+
+ScanKey = tuple[str, int, tuple[str, ...]]
+""" resolved directory path, subdirectories depth and their exclusion globs """
+
+@dataclass(frozen = True, slots = True)
+class ScanBatch:
+    """ blend-files found by a scan since its previous batch """
+    files: tuple[str, ...] = ()
+    """ paths relative to the scanned directory """
+    directories: tuple[str, ...] = ()
+    """ resolved paths of the subdirectories listed by a recursive scan, e.g. to watch them """
+    is_first: bool = True
+    is_last: bool = True
+    pages: FilesPages | None = None
+    """ all the files of a complete scan sorted on the worker, given with its last batch """
+
+ScanResult = tuple[ScanKey, ScanBatch | OSError]
+""" a scan and its next batch, or the error listing its directory """
+
+class DirectoriesScanner:
+    """
+    lists directories for blend-files on a worker pool, different directories in parallel,
+    and subtrees of a recursive scan in parallel too, streaming their files in batches.
+    `submit` and `results_pop` are meant to be called from a single thread, e.g. the UI one,
+    which gets only the results of the latest submission of a scan
+    """
+    def __init__(self,
+            workers: int = 4,
+            tree_workers: int = 8,
+            cache: ListingCache = listing_cache,
+            tree_cache: ListingCache | None = None,
+            tree_cache_entries_max: int = 16384,
+            indices: FilesIndices = files_indices,
+            batch_size: int = 512,
+            batch_interval: float = 0.1,
+    ):
+        self.workers = workers
+        self.tree_workers = tree_workers
+        self.cache = cache
+        self.tree_cache = tree_cache if tree_cache is not None else ListingCache()
+        """
+        listings of the subdirectories of recursive scans, apart from the shared `cache`, so a deep
+        tree does not evict the listings of the other directories. it grows to hold all the trees
+        up to `tree_cache_entries_max`
+        """
+        self.tree_cache_entries_min = self.tree_cache.entries_max
+        self.tree_cache_entries_max = max(tree_cache_entries_max, self.tree_cache_entries_min)
+        self.trees_sizes: dict[ScanKey, int] = {}
+        """ directories listed by the last complete recursive scan """
+        self.trees_sizes_lock = threading.Lock()
+        self.indices = indices
+        """ the scanned directories are listed from their indices if indexing is enabled """
+        self.batch_size = batch_size
+        """ files per batch of a recursive scan """
+        self.batch_interval = batch_interval
+        """ seconds after which the files found so far are given anyway """
+        self.executor: ThreadPoolExecutor | None = None
+        self.tree_executor: ThreadPoolExecutor | None = None
+        """ separate from the scans executor, so scans waiting on their subtrees do not starve them """
+        self.generations: dict[ScanKey, int] = {}
+        self.generations_counter = itertools.count(1)
+        """ never reset, so the batches of scans still running after `shutdown` stay stale """
+        """ the latest submission per scan, older results are stale """
+        self.queued: set[ScanKey] = set()
+        """ scans submitted but not started yet """
+        self.queued_lock = threading.Lock()
+        self.templates_warm: dict[ScanKey, set[Template]] = {}
+        """ templates to index the versions of after the queued scans, see `submit` """
+        self.results: queue.SimpleQueue[tuple[ScanKey, int, ScanBatch | OSError]] = queue.SimpleQueue()
+        self.is_watching = False
+        """ whether the watcher is being read on a worker, see `watch_submit` """
+        self.watch_events: queue.SimpleQueue[list[WatchEvent]] = queue.SimpleQueue()
+        self.names_updated: queue.SimpleQueue[str] = queue.SimpleQueue()
+        """ directories indexed by `names_submit` since, see `names_updated_pop` """
+    #
+    @staticmethod
+    def key_get(
+            directory_path: str | PathLike,
+            depth_max: int = 0,
+            excludes: Iterable[str] = (),
+    ) -> ScanKey:
+        return os.path.realpath(directory_path), depth_max, tuple(excludes)
+    def submit(self,
+            directory_path: str | PathLike,
+            depth_max: int = 0,
+            excludes: Iterable[str] = (),
+            templates: Iterable[Template] = (),
+    ) -> ScanKey:
+        """
+        schedule a scan of the directory and its subdirectories down to the depth. the versions of
+        the templates are indexed after the directory index refresh, so they are read from the cache later
+        """
+        key = self.key_get(directory_path, depth_max, excludes)
+        with self.queued_lock:
+            self.templates_warm.setdefault(key, set()).update(templates)
+            if key in self.queued:
+                # the queued scan has not started, so it will see the current state anyway
+                return key
+            self.queued.add(key)
+        generation = next(self.generations_counter)
+        self.generations[key] = generation
+        if self.tree_executor is None and depth_max > 0:
+            self.tree_executor = ThreadPoolExecutor(
+                max_workers = self.tree_workers, thread_name_prefix = "DirectoriesScannerTree")
+        self._executor_get().submit(self._scan, key, generation)
+        return key
+    def _executor_get(self) -> ThreadPoolExecutor:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers = self.workers, thread_name_prefix = "DirectoriesScanner")
+        return self.executor
+    def _scan(self, key: ScanKey, generation: int):
+        with self.queued_lock:
+            self.queued.discard(key)
+            templates = self.templates_warm.pop(key, ())
+        path, depth_max, excludes = key
+        try:
+            index = self.indices.get(path)
+            if index is not None:
+                try:
+                    index.refresh()
+                    self._versions_warm(index, templates)
+                except sqlite3.Error:
+                    index = None
+            if depth_max <= 0:
+                if index is not None:
+                    files = tuple(index.file_names_get())
+                else:
+                    files = tuple(blend_file_names_filter(self.cache.get(path).files))
+                self.results.put((key, generation, ScanBatch(files, pages = FilesPages(files))))
+            else:
+                self._tree_scan(key, generation)
+        except OSError as exc:
+            self.results.put((key, generation, exc))
+    @staticmethod
+    def _versions_warm(index: FilesIndex, templates: Iterable[Template]):
+        for template in templates:
+            index.directory_versions_get(template)
+    def names_submit(self, directory_path: str, names: Iterable[str], templates: Iterable[Template] = ()):
+        """
+        update the directory index with the names in the background, e.g. changed ones from a watcher.
+        its cached versions are dropped meanwhile, see `names_updated_pop` for when they are indexed
+        """
+        if (index := self.indices.get(directory_path, should_open = False)) is not None:
+            index.versions_cache_clear()
+        self._executor_get().submit(self._names_update, directory_path, tuple(names), tuple(templates))
+    def _names_update(self, directory_path: str, names: tuple[str, ...], templates: tuple[Template, ...]):
+        if (index := self.indices.get(directory_path)) is None:
+            return
+        try:
+            index.names_update(names)
+            self._versions_warm(index, templates)
+        except sqlite3.Error as exc:
+            logger.warning(f"could not update the files index of {directory_path!r}: {exc}")
+        self.names_updated.put(directory_path)
+    def names_updated_pop(self) -> set[str]:
+        """ the directories indexed by `names_submit` so far, e.g. to read their versions again """
+        directories_paths = set()
+        while True:
+            try:
+                directories_paths.add(self.names_updated.get_nowait())
+            except queue.Empty:
+                return directories_paths
+    def _tree_scan(self, key: ScanKey, generation: int):
+        path, depth_max, excludes = key
+        def should_stop() -> bool:
+            return self.generations.get(key) != generation
+        files = []
+        files_all = []
+        directories = []
+        is_first = True
+        time_batch = time.monotonic()
+        listings_count = 0
+        for relative_path, listing in directory_tree_walk(
+                path, depth_max, excludes, self.tree_executor, self.tree_cache, should_stop):
+            listings_count += 1
+            if relative_path:
+                directories.append(listing.path)
+            files += [os.path.join(relative_path, e) for e in blend_file_names_filter(listing.files)]
+            if len(files) >= self.batch_size or time.monotonic() - time_batch >= self.batch_interval:
+                self.results.put((key, generation,
+                    ScanBatch(tuple(files), tuple(directories), is_first, False)))
+                files_all += files
+                files = []
+                directories = []
+                is_first = False
+                time_batch = time.monotonic()
+        pages = None
+        if not should_stop():
+            with self.trees_sizes_lock:
+                self.trees_sizes[key] = listings_count
+                self._tree_cache_resize()
+            pages = FilesPages(files_all + files)
+        self.results.put((key, generation,
+            ScanBatch(tuple(files), tuple(directories), is_first, True, pages)))
+    def _tree_cache_resize(self):
+        entries_max = sum(self.trees_sizes.values())
+        self.tree_cache.entries_max_set(
+            max(self.tree_cache_entries_min, min(self.tree_cache_entries_max, entries_max)))
+    def trees_discard(self, keys: Iterable[ScanKey]):
+        """ forget the sizes of the trees not scanned anymore, e.g. of removed templates, to shrink the cache """
+        with self.trees_sizes_lock:
+            for key in keys:
+                self.trees_sizes.pop(key, None)
+            self._tree_cache_resize()
+    #
+    def is_pending(self, key: ScanKey | None = None) -> bool:
+        """ whether the scan, or any if none given, has a submission without its last batch popped """
+        if key is None:
+            return bool(self.generations)
+        return key in self.generations
+    def results_pop(self) -> list[ScanResult]:
+        """ the batches ready so far in their order, without stale ones """
+        results = []
+        while True:
+            try:
+                key, generation, result = self.results.get_nowait()
+            except queue.Empty:
+                return results
+            if self.generations.get(key) == generation:
+                if isinstance(result, OSError) or result.is_last:
+                    del self.generations[key]
+                results.append((key, result))
+    #
+    def watch_submit(self, watcher: DirectoryWatcher, directories_paths: Iterable[str]):
+        """
+        watch exactly the directories and read their changes on a worker, as polling lists the
+        changed directories. see `watch_events_pop`. skipped while the previous read is running,
+        so the watcher is used by one thread at a time
+        """
+        with self.queued_lock:
+            if self.is_watching:
+                return
+            self.is_watching = True
+        self._executor_get().submit(self._watch, watcher, frozenset(directories_paths))
+    def _watch(self, watcher: DirectoryWatcher, directories_paths: frozenset[str]):
+        try:
+            watcher.watched_set(directories_paths)
+            if events := watcher.events_read():
+                self.watch_events.put(events)
+        except OSError:
+            # e.g. the watcher closed meanwhile on unregister
+            pass
+        finally:
+            with self.queued_lock:
+                self.is_watching = False
+    def watch_events_pop(self) -> list[WatchEvent]:
+        """ the changes read so far in their order """
+        events = []
+        while True:
+            try:
+                events += self.watch_events.get_nowait()
+            except queue.Empty:
+                return events
+    #
+    def shutdown(self, wait: bool = False):
+        """
+        stop scanning, the queued scans are cancelled and pending results are discarded.
+        the scanner can be used again, its workers are started on the next `submit`
+        """
+        for executor in [self.executor, self.tree_executor]:
+            if executor is not None:
+                executor.shutdown(wait = wait, cancel_futures = True)
+        self.executor = None
+        self.tree_executor = None
+        self.generations.clear()
+        with self.trees_sizes_lock:
+            self.trees_sizes.clear()
+            self.tree_cache.entries_max_set(self.tree_cache_entries_min)
+        with self.queued_lock:
+            self.queued.clear()
+            self.templates_warm.clear()
+            self.is_watching = False
+        self.watch_events_pop()
+        self.names_updated_pop()
+        while True:
+            try:
+                self.results.get_nowait()
+            except queue.Empty:
+                break
@@ -0,0 +1,58 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import time
+from dataclasses import dataclass
+from os import PathLike
+
+@dataclass(frozen = True, slots = True)
+class DirectoryListing:
+    """ names of the files and subdirectories of a directory at the time of its scan """
+    path: str
+    """ resolved directory path """
+    mtime_ns: int
+    inode: int
+    files: tuple[str, ...] = ()
+    directories: tuple[str, ...] = ()
+    time: float = 0.0
+    """ `time.monotonic` of the scan """
+    #
+    @classmethod
+    def scan(cls, directory_path: str | PathLike, stat: os.stat_result | None = None):
+        path = os.path.realpath(directory_path)
+        if stat is None:
+            stat = os.stat(path)
+        files = []
+        directories = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        directories.append(entry.name)
+                    else:
+                        files.append(entry.name)
+                except OSError:
+                    # removed while scanning
+                    continue
+        return cls(path, stat.st_mtime_ns, stat.st_ino, tuple(files), tuple(directories), time.monotonic())
+    #
+    def is_valid(self, stat: os.stat_result, ttl: float) -> bool:
+        """
+        adding, removing or renaming entries changes the directory modification time.
+        the time to live bounds staleness where its resolution is coarse
+        """
+        return (self.mtime_ns == stat.st_mtime_ns and self.inode == stat.st_ino
+            and time.monotonic() - self.time < ttl)
@@ -0,0 +1,115 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import functools
+from collections.abc import Iterable
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
+
+from .parse import parse_stems
+from .scan import blend_extension
+from .scan import blend_file_names_filter
+from .Template import Template
+from .TemplateBuilder import template_builder_get
+from .VersionIndex import VersionIndex
+from .VersionKey import VersionKey
+from .VersionParts import VersionParts
+
+@dataclass
+class DirectoryVersions:
+    """
+    versions per root of the files in a directory which were named with a template.
+    see `from_file_names`
+    """
+    template: Template
+    indices: dict[str, VersionIndex] = field(default_factory = dict)
+    """ existing versions per root """
+    file_names: set[str] = field(default_factory = set)
+    #
+    @classmethod
+    def from_file_names(cls, file_names: Iterable[str], template: Template):
+        """
+        collect versions from a directory listing in one pass. a file counts only if
+        it has the template prefix, suffix and version, in any width
+        """
+        directory_versions = cls(template, file_names = set(file_names))
+        keys_per_root = directory_versions._keys_per_root_get(directory_versions.file_names)
+        directory_versions.indices = {root: VersionIndex.from_keys(keys, template.version.count)
+            for root, keys in keys_per_root.items()}
+        return directory_versions
+    #
+    def _keys_per_root_get(self, file_names: Iterable[str]) -> dict[str, list[int]]:
+        keys_per_root = {}
+        for _, root, key in file_names_versions_get(file_names, self.template):
+            keys_per_root.setdefault(root, []).append(key)
+        return keys_per_root
+    #
+    def file_name_add(self, file_name: str):
+        """ update with a single new file """
+        self.file_names.add(file_name)
+        for root, keys in self._keys_per_root_get([file_name]).items():
+            index = self.indices.setdefault(root, VersionIndex(self.template.version.count))
+            for key in keys:
+                index.key_add(key)
+    #
+    def index_get(self, root: str) -> VersionIndex | None:
+        return self.indices.get(root)
+    #
+    def latest_get(self, root: str) -> VersionParts | None:
+        """ the highest existing version of the root """
+        index = self.indices.get(root)
+        return index.latest_get() if index is not None else None
+    #
+    def increment_free_get(self, root: str, parts: VersionParts, idx: int) -> VersionParts:
+        """
+        increment the version part at the index like `version_increment`, but past
+        the highest existing version with the same preceding parts, and past any
+        existing file with the resulting name
+        """
+        builder = template_builder_get(self.template)
+        parts_inc = builder.increments_get(parts)[idx]
+        index = self.indices.get(root)
+        if index is not None:
+            latest = index.latest_with_get(parts_inc[:idx])
+            if latest is not None and latest[idx] >= parts_inc[idx]:
+                parts_inc[idx] = latest[idx] + 1
+        while builder.name_get(root, parts_inc) in self.file_names:
+            parts_inc[idx] += 1
+        return parts_inc
+
+def file_names_versions_get(file_names: Iterable[str], template: Template) -> list[tuple[str, str, VersionKey]]:
+    """
+    names, roots and version keys of the blend-files named with the template,
+    see `DirectoryVersions.from_file_names`
+    """
+    if template.version is None:
+        return []
+    names = list(blend_file_names_filter(file_names))
+    stems = [e[:-len(blend_extension)] for e in names]
+    parse_template = replace(template, version = replace(template.version, width = 0))
+    columns = parse_stems(stems, parse_template)
+    prefix = template.prefix or ""
+    suffix = template.suffix or ""
+    keys = columns.versions_keys_get()
+    return [(names[idx], root, keys[idx]) for idx, root in enumerate(columns.roots)
+        if (columns.matched_get(idx)
+            and columns.prefixes[idx] == prefix
+            and columns.suffixes[idx] == suffix)]
+
+@functools.lru_cache(maxsize = 32)
+def directory_versions_get(template: Template, file_names: frozenset[str]) -> DirectoryVersions:
+    """ cached `DirectoryVersions.from_file_names`. the result is shared, do not modify it """
+    return DirectoryVersions.from_file_names(file_names, template)
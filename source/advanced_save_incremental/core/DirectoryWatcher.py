@@ -0,0 +1,98 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+from collections.abc import Iterable
+from os import PathLike
+
+from .WatchEvent import WatchEvent
+
+class DirectoryWatcher:
+    """
+    watches directories for created and deleted entries by polling: every `events_read`
+    stats the watched directories and lists only the ones with changed modification time.
+    see `InotifyWatcher` for the event-driven one and `directory_watcher_get`
+    """
+    def __init__(self):
+        self.states: dict[str, tuple[int, int, set[str], set[str]]] = {}
+        """ modification time, inode, files and subdirectories names per watched directory """
+    #
+    @property
+    def watched(self) -> set[str]:
+        return set(self.states)
+    def watch(self, directory_path: str | PathLike) -> str:
+        """ raises `OSError` if the directory cannot be watched. returns its resolved path """
+        path = os.path.realpath(directory_path)
+        if path not in self.states:
+            self.states[path] = self._state_get(path)
+        return path
+    def unwatch(self, directory_path: str | PathLike):
+        self.states.pop(os.path.realpath(directory_path), None)
+    def watched_set(self, directories_paths: Iterable[str | PathLike]):
+        """ watch exactly these directories, the ones which cannot be watched are skipped """
+        paths = {os.path.realpath(e) for e in directories_paths}
+        for path in self.watched - paths:
+            self.unwatch(path)
+        for path in paths - self.watched:
+            try:
+                self.watch(path)
+            except OSError:
+                continue
+    #
+    @staticmethod
+    def _state_get(path: str) -> tuple[int, int, set[str], set[str]]:
+        stat = os.stat(path)
+        files = set()
+        directories = set()
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    (directories if entry.is_dir() else files).add(entry.name)
+                except OSError:
+                    continue
+        return stat.st_mtime_ns, stat.st_ino, files, directories
+    def events_read(self) -> list[WatchEvent]:
+        """ the changes since the previous call, without blocking on them """
+        events = []
+        for path, (mtime_ns, inode, files, directories) in list(self.states.items()):
+            try:
+                stat = os.stat(path)
+                if (stat.st_mtime_ns, stat.st_ino) == (mtime_ns, inode):
+                    continue
+                state = self._state_get(path)
+            except OSError:
+                del self.states[path]
+                events.append(WatchEvent(path, "rescan"))
+                continue
+            if state[1] != inode:
+                events.append(WatchEvent(path, "rescan"))
+            else:
+                for names_old, names_new, is_directory in [(files, state[2], False), (directories, state[3], True)]:
+                    events += [WatchEvent(path, "deleted", e, is_directory) for e in names_old - names_new]
+                    events += [WatchEvent(path, "created", e, is_directory) for e in names_new - names_old]
+            self.states[path] = state
+        return events
+    #
+    def close(self):
+        self.states.clear()
+
+def directory_watcher_get() -> DirectoryWatcher:
+    """ an `InotifyWatcher` where inotify is available, otherwise a polling `DirectoryWatcher` """
+    # import here to prevent circular dependencies
+    from .InotifyWatcher import InotifyWatcher
+    try:
+        return InotifyWatcher()
+    except OSError:
+        return DirectoryWatcher()
@@ -15,7 +15,7 @@
 
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(frozen = True, slots = True)
 class FileSaveData:
     label: str
     file_name: str
@@ -0,0 +1,263 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from os import PathLike
+
+from .DirectoryVersions import DirectoryVersions
+from .DirectoryVersions import file_names_versions_get
+from .scan import blend_file_name_matches
+from .scan import blend_files_scan
+from .Template import Template
+from .VersionIndex import VersionIndex
+from .VersionKey import version_key_part_bits
+from .VersionKey import VersionKey
+
+class FilesIndex:
+    """
+    blend-files of a directory with their sizes and modification times, and their roots and
+    versions per template, kept in a SQLite database to be listed without scanning the directory
+    again. `refresh` updates only the changed files when the directory changed. safe to use
+    from many threads
+    """
+    format = 1
+    """ version of the database schema, databases of other versions are recreated """
+    mtime_resolution = 2.0
+    """
+    seconds within which a directory may change again without changing its modification time,
+    e.g. on network file systems. a directory modified so recently is listed again on next refresh
+    """
+    #
+    def __init__(self, directory_path: str | PathLike, database_path: str | PathLike):
+        self.directory_path = os.path.realpath(directory_path)
+        self.database_path = database_path
+        self.lock = threading.Lock()
+        self.generation = 0
+        """ incremented on every change of the files """
+        self.versions_cache: dict[Template, tuple[int, DirectoryVersions]] = {}
+        self.connection = sqlite3.connect(database_path, check_same_thread = False)
+        try:
+            self._schema_create()
+        except sqlite3.Error:
+            self.connection.close()
+            raise
+    def _schema_create(self):
+        connection = self.connection
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        if connection.execute("PRAGMA user_version").fetchone()[0] != self.format:
+            with connection:
+                for table in ["meta", "files", "versions"]:
+                    connection.execute(f"DROP TABLE IF EXISTS {table}")
+        with connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS files (name TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER)")
+            # versions of the files named with a template, the unmatched files have no root and key
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS versions ("
+                "template TEXT, name TEXT, root TEXT, key BLOB, PRIMARY KEY (template, name))")
+            connection.execute("CREATE INDEX IF NOT EXISTS versions_roots ON versions (template, root, key)")
+            connection.execute(f"PRAGMA user_version = {self.format}")
+    def close(self):
+        with self.lock:
+            self.connection.close()
+    #
+    @staticmethod
+    def template_id_get(template: Template) -> str:
+        """ the template fields a files versions depend on, the name does not matter """
+        return repr((template.prefix, template.suffix, template.version))
+    @staticmethod
+    def key_pack(key: VersionKey, count: int) -> bytes:
+        """ keys overflow SQLite integers, big-endian bytes of a fixed width compare as the keys do """
+        return key.to_bytes(count * version_key_part_bits // 8, "big")
+    #
+    def directory_stat_get(self) -> tuple[int, int] | None:
+        """ modification time and inode of the directory as of the last refresh """
+        row = self.connection.execute(
+            "SELECT value FROM meta WHERE key = 'directory_stat'").fetchone()
+        return tuple(map(int, row[0].split())) if row is not None and row[0] else None
+    def refresh(self) -> bool:
+        """
+        update the files if the directory changed since the last refresh, comparing the sizes and
+        modification times of its files with the indexed ones. raises `OSError` if the directory
+        cannot be listed. returns whether any file changed
+        """
+        stat = os.stat(self.directory_path)
+        directory_stat = (stat.st_mtime_ns, stat.st_ino)
+        with self.lock:
+            if self.directory_stat_get() == directory_stat:
+                return False
+        # list without the lock, so the indexed files can be read meanwhile
+        files = {}
+        for entry in blend_files_scan(self.directory_path):
+            try:
+                entry_stat = entry.stat()
+            except OSError:
+                # removed while scanning
+                continue
+            files[entry.name] = (entry_stat.st_size, entry_stat.st_mtime_ns)
+        with self.lock:
+            files_old = {name: (size, mtime_ns) for name, size, mtime_ns in
+                self.connection.execute("SELECT name, size, mtime_ns FROM files")}
+            changed = [(name, *e) for name, e in files.items() if files_old.get(name) != e]
+            deleted = [(name,) for name in files_old if name not in files]
+            is_stat_settled = time.time_ns() - stat.st_mtime_ns > self.mtime_resolution * 1e9
+            with self.connection:
+                self._files_write(changed, deleted)
+                self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('directory_stat', ?)",
+                    (" ".join(map(str, directory_stat)) if is_stat_settled else "",))
+            return bool(changed or deleted)
+    def names_update(self, names: Iterable[str]):
+        """ update the files with the names, e.g. just saved or reported by a `DirectoryWatcher` """
+        changed = []
+        deleted = []
+        for name in names:
+            if not blend_file_name_matches(name):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory_path, name))
+            except OSError:
+                deleted.append((name,))
+                continue
+            changed.append((name, stat.st_size, stat.st_mtime_ns))
+        with self.lock:
+            with self.connection:
+                self._files_write(changed, deleted)
+    def _files_write(self, changed: list[tuple[str, int, int]], deleted: list[tuple[str]]):
+        if not (changed or deleted):
+            return
+        connection = self.connection
+        connection.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?)", changed)
+        connection.executemany("DELETE FROM files WHERE name = ?", deleted)
+        # parsed again when the versions are queried
+        connection.executemany("DELETE FROM versions WHERE name = ?", [e[:1] for e in changed] + deleted)
+        self.generation += 1
+    #
+    def file_names_get(self, root: str = "") -> list[str]:
+        """ names of the indexed blend-files containing the root, see `blend_file_name_matches` """
+        with self.lock:
+            names = [e for e, in self.connection.execute("SELECT name FROM files ORDER BY name")]
+        if root:
+            return [e for e in names if blend_file_name_matches(e, root)]
+        return names
+    def __len__(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT count(*) FROM files").fetchone()[0]
+    #
+    def _versions_parse(self, template: Template):
+        """ parse and index the versions of the files not parsed with the template yet """
+        template_id = self.template_id_get(template)
+        connection = self.connection
+        names = [e for e, in connection.execute(
+            "SELECT name FROM files WHERE name NOT IN (SELECT name FROM versions WHERE template = ?)",
+            (template_id,))]
+        if not names:
+            return
+        count = template.version.count
+        versions = {name: (root, self.key_pack(key, count))
+            for name, root, key in file_names_versions_get(names, template)}
+        with connection:
+            connection.executemany("INSERT OR REPLACE INTO versions VALUES (?, ?, ?, ?)",
+                [(template_id, name, *versions.get(name, (None, None))) for name in names])
+    def versions_cache_clear(self):
+        """ e.g. when files changed and are not indexed yet, so the cached versions are not taken as current """
+        with self.lock:
+            self.versions_cache.clear()
+    def directory_versions_cached_get(self, template: Template) -> DirectoryVersions | None:
+        """ `directory_versions_get` if it is up to date with the files, without reading the database """
+        with self.lock:
+            cached = self.versions_cache.get(template)
+            return cached[1] if cached is not None and cached[0] == self.generation else None
+    def directory_versions_get(self, template: Template) -> DirectoryVersions:
+        """ `DirectoryVersions.from_file_names` of the indexed files. the result is shared, do not modify it """
+        with self.lock:
+            cached = self.versions_cache.get(template)
+            if cached is not None and cached[0] == self.generation:
+                return cached[1]
+            names = {e for e, in self.connection.execute("SELECT name FROM files")}
+            directory_versions = DirectoryVersions(template, file_names = names)
+            if template.version is not None:
+                self._versions_parse(template)
+                count = template.version.count
+                keys_per_root = {}
+                for root, key in self.connection.execute(
+                        "SELECT root, key FROM versions WHERE template = ? AND root IS NOT NULL",
+                        (self.template_id_get(template),)):
+                    keys_per_root.setdefault(root, []).append(int.from_bytes(key, "big"))
+                directory_versions.indices = {root: VersionIndex.from_keys(keys, count)
+                    for root, keys in keys_per_root.items()}
+            self.versions_cache[template] = (self.generation, directory_versions)
+            return directory_versions
+
+class FilesIndices:
+    """ `FilesIndex` per directory, with their databases in a directory, e.g. the add-on cache one """
+    def __init__(self, databases_path: str | PathLike | None = None):
+        self.databases_path = databases_path
+        """ indexing is disabled without it """
+        self.indices: dict[str, FilesIndex] = {}
+        self.lock = threading.Lock()
+    #
+    def databases_path_set(self, databases_path: str | PathLike | None):
+        with self.lock:
+            if databases_path == self.databases_path:
+                return
+            self.databases_path = databases_path
+        self.close()
+    def database_path_get(self, directory_path: str) -> str:
+        digest = hashlib.blake2b(directory_path.encode(), digest_size = 16).hexdigest()
+        return os.path.join(self.databases_path, f"files-{digest}.sqlite3")
+    def get(self, directory_path: str | PathLike, should_open: bool = True) -> FilesIndex | None:
+        """
+        the index of the directory, none if indexing is disabled, the directory does not exist
+        or its database cannot be opened. without opening, none if it is not open yet,
+        e.g. on the UI thread while the scanner opens it
+        """
+        path = os.path.realpath(directory_path)
+        with self.lock:
+            if self.databases_path is None:
+                return None
+            index = self.indices.get(path)
+            if index is not None or not should_open:
+                return index
+            if not os.path.isdir(path):
+                return None
+            database_path = self.database_path_get(path)
+            try:
+                index = FilesIndex(path, database_path)
+            except sqlite3.DatabaseError:
+                # e.g. a damaged database, it is only a cache
+                try:
+                    os.remove(database_path)
+                    index = FilesIndex(path, database_path)
+                except (OSError, sqlite3.Error):
+                    return None
+            except sqlite3.Error:
+                return None
+            self.indices[path] = index
+            return index
+    def close(self):
+        with self.lock:
+            indices = list(self.indices.values())
+            self.indices.clear()
+        for index in indices:
+            index.close()
+
+files_indices = FilesIndices()
@@ -0,0 +1,143 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+from bisect import bisect_left
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from .scan import blend_extension
+from .scan import name_normcase
+from .sort import natural_key_get
+from .sort import NaturalKey
+
+@dataclass(frozen = True, slots = True)
+class FilesPage:
+    """ a page of the files matching the filters, see `FilesPages.page_get` """
+    file_paths: tuple[str, ...] = ()
+    page: int = 0
+    """ the page index, clamped to the existing pages """
+    pages_count: int = 1
+    count: int = 0
+    """ how many files matched the filters """
+
+class FilesPages:
+    """
+    files of a directory in the natural order of their names, for the files openers to show
+    a page of them at a time instead of all of them, newest first. filtering and paging go
+    through the paths here, only the files of a page are given to the UI
+    """
+    #
+    def __init__(self, file_paths: Iterable[str] = ()):
+        self.keys: list[tuple[NaturalKey, str]] = []
+        """ sorting keys of the paths, in ascending order """
+        self.file_paths: list[str] = []
+        """ paths relative to the directory, in the order of their keys """
+        self.names: list[str] = []
+        """ names of the files of the paths as matched, to filter them, see `name_normcase` """
+        self.file_paths_set(file_paths)
+    #
+    def __len__(self) -> int:
+        return len(self.file_paths)
+    def __contains__(self, file_path: str) -> bool:
+        key = self.key_get(file_path)
+        idx = bisect_left(self.keys, key)
+        return idx < len(self.keys) and self.keys[idx] == key
+    @staticmethod
+    def key_get(file_path: str) -> tuple[NaturalKey, str]:
+        """ the name orders the files of different subdirectories, the path breaks the ties """
+        return natural_key_get(os.path.basename(file_path)), file_path
+    #
+    updates_max = 64
+    """ more changed files than this are merged with all the others instead of changed one by one """
+    def file_paths_set(self, file_paths: Iterable[str]) -> bool:
+        """ replace the files, e.g. with a complete scan of the directory. returns whether any changed """
+        file_paths = set(file_paths)
+        file_paths_old = set(self.file_paths)
+        return self.update(file_paths - file_paths_old, file_paths_old - file_paths)
+    def update(self, added: Iterable[str] = (), removed: Iterable[str] = ()) -> bool:
+        """ add and remove files, e.g. reported by a `DirectoryWatcher`. returns whether any changed """
+        removed = set(removed)
+        added = set(added) - removed
+        is_changed = False
+        if len(removed) > self.updates_max:
+            count = len(self.file_paths)
+            entries = [e for e in zip(self.keys, self.file_paths, self.names) if e[1] not in removed]
+            self.keys, self.file_paths, self.names = map(list, zip(*entries)) if entries else ([], [], [])
+            is_changed = len(self.file_paths) != count
+        else:
+            for file_path in removed:
+                key = self.key_get(file_path)
+                idx = bisect_left(self.keys, key)
+                if idx < len(self.keys) and self.keys[idx] == key:
+                    del self.keys[idx]
+                    del self.file_paths[idx]
+                    del self.names[idx]
+                    is_changed = True
+        if len(added) > self.updates_max:
+            # sort only the added files, then merge them into the sorted ones
+            added -= set(self.file_paths)
+            if not added:
+                return is_changed
+            keys_added = sorted(map(self.key_get, added))
+            file_paths_added = [e for _, e in keys_added]
+            names_added = [name_normcase(os.path.basename(e)) for e in file_paths_added]
+            if not self.keys:
+                self.keys, self.file_paths, self.names = keys_added, file_paths_added, names_added
+                return True
+            # copy the runs of sorted files between the insertion points of the added ones
+            keys, file_paths, names = [], [], []
+            idx_prev = 0
+            for key, file_path, name in zip(keys_added, file_paths_added, names_added):
+                idx = bisect_left(self.keys, key, idx_prev)
+                keys += self.keys[idx_prev:idx]
+                file_paths += self.file_paths[idx_prev:idx]
+                names += self.names[idx_prev:idx]
+                keys.append(key)
+                file_paths.append(file_path)
+                names.append(name)
+                idx_prev = idx
+            keys += self.keys[idx_prev:]
+            file_paths += self.file_paths[idx_prev:]
+            names += self.names[idx_prev:]
+            self.keys, self.file_paths, self.names = keys, file_paths, names
+            return True
+        for file_path in added:
+            key = self.key_get(file_path)
+            idx = bisect_left(self.keys, key)
+            if idx == len(self.keys) or self.keys[idx] != key:
+                self.keys.insert(idx, key)
+                self.file_paths.insert(idx, file_path)
+                self.names.insert(idx, name_normcase(os.path.basename(file_path)))
+                is_changed = True
+        return is_changed
+    #
+    def page_get(self, page: int, page_size: int, root: str = "", name_filter: str = "") -> FilesPage:
+        """
+        the files containing the root like `blend_file_name_matches` and the filter in any case,
+        newest first
+        """
+        file_paths = self.file_paths
+        if root or name_filter:
+            root = name_normcase(root)
+            name_filter = name_filter.casefold()
+            suffix_len = len(blend_extension)
+            file_paths = [e for e, name in zip(file_paths, self.names)
+                if root in name[:-suffix_len] and (not name_filter or name_filter in name.casefold())]
+        count = len(file_paths)
+        pages_count = max(1, -(-count // page_size))
+        page = max(0, min(page, pages_count - 1))
+        end = count - page * page_size
+        return FilesPage(tuple(reversed(file_paths[max(0, end - page_size):end])), page, pages_count, count)
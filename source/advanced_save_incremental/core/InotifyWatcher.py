@@ -0,0 +1,156 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+from os import PathLike
+
+from .DirectoryWatcher import DirectoryWatcher
+from .WatchEvent import WatchEvent
+
+# see `man 7 inotify`
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = os.O_CLOEXEC if hasattr(os, "O_CLOEXEC") else 0o2000000
+IN_NONBLOCK = os.O_NONBLOCK if hasattr(os, "O_NONBLOCK") else 0o4000
+
+_event_header = struct.Struct("iIII")
+""" watch descriptor, mask, cookie and name length of `struct inotify_event` """
+
+filesystems_remote_magics = frozenset([
+    0x6969,  # NFS
+    0x517B,  # SMB
+    0xFE534D42,  # SMB2
+    0xFF534D42,  # CIFS
+    0x65735546,  # FUSE, e.g. SSHFS or rclone mounts
+    0x01021997,  # 9P
+    0x00C36400,  # Ceph
+    0x5346414F,  # AFS
+    0x6B414653,  # kAFS
+    0x47504653,  # GPFS
+    0x0BD00BD0,  # Lustre
+])
+""" `statfs` types of network file systems, on which inotify does not see the changes made by other machines """
+
+class InotifyWatcher(DirectoryWatcher):
+    """
+    watches directories with Linux inotify via ctypes. the kernel queues the changes,
+    so reading them costs only as much as there are changes, unlike polling.
+    directories on network file systems are polled instead, see `is_remote`.
+    raises `OSError` where inotify is not available
+    """
+    mask = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+    read_size = 1 << 16
+    #
+    def __init__(self):
+        super().__init__()
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is available only on Linux")
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno = True)
+        if not hasattr(self.libc, "inotify_init1"):
+            raise OSError("inotify is not available in the C library")
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.paths: dict[int, str] = {}
+        """ watched directory per watch descriptor """
+        self.descriptors: dict[str, int] = {}
+    #
+    @property
+    def watched(self) -> set[str]:
+        return set(self.descriptors) | set(self.states)
+    def is_remote(self, path: str) -> bool:
+        """ whether the directory is on a network file system, see `filesystems_remote_magics` """
+        buffer = ctypes.create_string_buffer(256)
+        if self.libc.statfs(os.fsencode(path), buffer) != 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        # `f_type` is the first field of `struct statfs`, a word on every architecture
+        return (ctypes.c_ulong.from_buffer(buffer).value & 0xFFFFFFFF) in filesystems_remote_magics
+    def watch(self, directory_path: str | PathLike) -> str:
+        path = os.path.realpath(directory_path)
+        if path in self.states:
+            return path
+        if path not in self.descriptors:
+            if self.is_remote(path):
+                return super().watch(path)
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), self.mask)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, os.strerror(errno), path)
+            self.paths[wd] = path
+            self.descriptors[path] = wd
+        return path
+    def unwatch(self, directory_path: str | PathLike):
+        super().unwatch(directory_path)
+        wd = self.descriptors.pop(os.path.realpath(directory_path), None)
+        if wd is not None:
+            self.paths.pop(wd, None)
+            self.libc.inotify_rm_watch(self.fd, wd)
+    #
+    def events_read(self) -> list[WatchEvent]:
+        # the polled directories
+        events = super().events_read()
+        while True:
+            try:
+                data = os.read(self.fd, self.read_size)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, name_len = _event_header.unpack_from(data, offset)
+                offset += _event_header.size
+                name = os.fsdecode(data[offset:offset + name_len].rstrip(b"\0"))
+                offset += name_len
+                if mask & IN_Q_OVERFLOW:
+                    # events were lost, all watched directories may have changed
+                    events += [WatchEvent(path, "rescan") for path in self.descriptors]
+                    continue
+                path = self.paths.get(wd)
+                if path is None:
+                    continue
+                is_directory = bool(mask & IN_ISDIR)
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    events.append(WatchEvent(path, "created", name, is_directory))
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    events.append(WatchEvent(path, "deleted", name, is_directory))
+                elif mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    # the kernel removes the watch of a removed directory, it has to be watched again
+                    self.paths.pop(wd, None)
+                    if self.descriptors.get(path) == wd:
+                        del self.descriptors[path]
+                        if mask & IN_MOVE_SELF:
+                            self.libc.inotify_rm_watch(self.fd, wd)
+                        events.append(WatchEvent(path, "rescan"))
+    #
+    def close(self):
+        super().close()
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+        self.paths.clear()
+        self.descriptors.clear()
@@ -0,0 +1,110 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import replace
+from os import PathLike
+
+from .DirectoryListing import DirectoryListing
+from .WatchEvent import WatchEvent
+
+class ListingCache:
+    """
+    process-wide cache of directory listings, so templates sharing a directory share its scan
+    and an unchanged directory is not scanned again. least recently used listings are evicted.
+    safe to use from many threads
+    """
+    def __init__(self, ttl: float = 30.0, entries_max: int = 64):
+        self.ttl = ttl
+        """ seconds to trust a listing of a directory with unchanged modification time """
+        self.entries_max = entries_max
+        self.entries: OrderedDict[str, DirectoryListing] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    #
+    def get(self, directory_path: str | PathLike) -> DirectoryListing:
+        """ raises `OSError` if the directory cannot be listed """
+        path = os.path.realpath(directory_path)
+        stat = os.stat(path)
+        with self.lock:
+            listing = self.entries.get(path)
+            if listing is not None and listing.is_valid(stat, self.ttl):
+                self.entries.move_to_end(path)
+                self.hits += 1
+                return listing
+            self.misses += 1
+        # scan without the lock, so different directories are scanned in parallel
+        listing = DirectoryListing.scan(path, stat)
+        with self.lock:
+            self.entries[path] = listing
+            self.entries.move_to_end(path)
+            while len(self.entries) > self.entries_max:
+                self.entries.popitem(last = False)
+        return listing
+    #
+    def events_apply(self, events: Iterable[WatchEvent]):
+        """
+        update the listings of the directories with the changes from a `DirectoryWatcher`,
+        each listing once with all the changes of its directory
+        """
+        events_per_directory: dict[str, list[WatchEvent]] = {}
+        for event in events:
+            events_per_directory.setdefault(event.directory, []).append(event)
+        for directory, events in events_per_directory.items():
+            if directory not in self.entries:
+                continue
+            try:
+                # the changes updated the modification time, the changes after them have their own events
+                stat = os.stat(directory) if all(e.kind != "rescan" for e in events) else None
+            except OSError:
+                stat = None
+            with self.lock:
+                listing = self.entries.get(directory)
+                if listing is None:
+                    continue
+                if stat is None:
+                    del self.entries[directory]
+                    continue
+                # the last change of a name wins
+                files = dict.fromkeys(listing.files, True)
+                directories = dict.fromkeys(listing.directories, True)
+                for event in events:
+                    (directories if event.is_directory else files)[event.name] = event.kind == "created"
+                self.entries[directory] = replace(listing,
+                    mtime_ns = stat.st_mtime_ns, inode = stat.st_ino,
+                    files = tuple(name for name, is_present in files.items() if is_present),
+                    directories = tuple(name for name, is_present in directories.items() if is_present))
+    def entries_max_set(self, entries_max: int):
+        """ e.g. grow to the size of the trees scanned recursively, so they do not evict themselves """
+        with self.lock:
+            self.entries_max = entries_max
+            while len(self.entries) > self.entries_max:
+                self.entries.popitem(last = False)
+    def discard(self, directory_path: str | PathLike):
+        with self.lock:
+            self.entries.pop(os.path.realpath(directory_path), None)
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+listing_cache = ListingCache()
+
+def directory_listing_get(directory_path: str | PathLike) -> DirectoryListing:
+    """ listing from the process-wide `listing_cache` """
+    return listing_cache.get(directory_path)
@@ -17,9 +17,9 @@ from dataclasses import dataclass
 
 from .Version import Version
 
-@dataclass
+@dataclass(frozen = True, slots = True)
 class StemParts:
     prefix: str
     root: str
     suffix: str
-    version: Version
+    version: Version | None
@@ -0,0 +1,75 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from array import array
+from dataclasses import dataclass
+from dataclasses import field
+
+from .VersionKey import version_key_get
+from .VersionKey import VersionKey
+from .VersionParts import VersionParts
+
+@dataclass
+class StemsColumns:
+    """
+    parsed parts of many stems with the same template in parallel columns, one row per stem.
+    see `parse_stems`.
+    """
+    count: int
+    """ version parts per row """
+    roots: list[str] = field(default_factory = list)
+    prefixes: list[str] = field(default_factory = list)
+    suffixes: list[str] = field(default_factory = list)
+    versions_parts: array = field(default_factory = lambda: array("Q"))
+    """ version parts of all rows packed one after another, `count` parts per row """
+    versions_widths: array = field(default_factory = lambda: array("I"))
+    """ detected version width per row, 0 if the version did not match """
+    matched: bytearray = field(default_factory = bytearray)
+    """ bitmap of rows where the version matched the template """
+    #
+    def __len__(self) -> int:
+        return len(self.roots)
+    def matched_get(self, idx: int) -> bool:
+        return bool(self.matched[idx >> 3] & (1 << (idx & 7)))
+    def version_parts_get(self, idx: int) -> VersionParts:
+        return self.versions_parts[idx * self.count:(idx + 1) * self.count].tolist()
+    def versions_keys_get(self) -> list[VersionKey]:
+        """ packed version key per row, see `version_key_get` """
+        count = self.count
+        parts = self.versions_parts
+        return [version_key_get(parts[idx:idx + count], count)
+            for idx in range(0, len(parts), count)] if count else [0] * len(self)
+    #
+    def row_append(self,
+            prefix: str,
+            root: str,
+            suffix: str,
+            version_parts: VersionParts | None,
+            version_width: int = 0,
+    ):
+        """ append a row. `None` version parts mark the row as not matched """
+        idx = len(self.roots)
+        if idx & 7 == 0:
+            self.matched.append(0)
+        if version_parts is not None:
+            self.versions_parts.extend(version_parts)
+            self.versions_widths.append(version_width)
+            self.matched[idx >> 3] |= 1 << (idx & 7)
+        else:
+            self.versions_parts.extend([0] * self.count)
+            self.versions_widths.append(0)
+        self.prefixes.append(prefix)
+        self.roots.append(root)
+        self.suffixes.append(suffix)
@@ -14,22 +14,26 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from dataclasses import dataclass
+from typing import Any
 
 from .VersionTemplate import VersionTemplate
+from ..exts.stdx import tomlx
 from ..exts.stdx.dataclassesx import DataclassFromDictMixIn
 
-@dataclass
+@dataclass(frozen = True, slots = True)
 class Template(DataclassFromDictMixIn):
     name: str = "Unnamed Template"
     prefix: str | None = None
     suffix: str | None = None
     version: VersionTemplate | None = None
-    def to_toml(template) -> str:
-        lines = [f'name = "{template.name}"']
-        if template.prefix is not None: lines.append(f'prefix = "{template.prefix}"')
-        if template.suffix is not None: lines.append(f'suffix = "{template.suffix}"')
+    def to_toml_items(template) -> list[tuple[str, Any]]:
+        items = [("name", template.name)]
+        if template.prefix is not None: items.append(("prefix", template.prefix))
+        if template.suffix is not None: items.append(("suffix", template.suffix))
         if template.version is not None:
-            lines.append(f'version.separator = "{template.version.separator}"')
-            lines.append(f'version.count = {template.version.count}')
-            lines.append(f'version.width = {template.version.width}')
-        return '\n'.join(lines)
+            items.append(("version.separator", template.version.separator))
+            items.append(("version.count", template.version.count))
+            items.append(("version.width", template.version.width))
+        return items
+    def to_toml(template) -> str:
+        return tomlx.items_dumps(template.to_toml_items())
@@ -0,0 +1,68 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import functools
+from collections.abc import Iterable
+
+from .Template import Template
+from .VersionParts import VersionParts
+
+class TemplateBuilder:
+    """
+    a template compiled once into a format string to build many file names.
+    gives the same results as `file_name_get` and `build_version_str` with the default fill.
+    """
+    def __init__(self, template: Template):
+        self.template = template
+        def format_escape(s: str) -> str:
+            return s.replace("{", "{{").replace("}", "}}")
+        prefix = format_escape(template.prefix or "")
+        suffix = format_escape(template.suffix or "")
+        if template.version is None:
+            self.count = 0
+            self.version_format = ""
+        else:
+            self.count = template.version.count
+            part_format = "{:0>" + str(max(template.version.width, 0)) + "}"
+            self.version_format = format_escape(template.version.separator).join(
+                [part_format] * self.count)
+        self.zeros = (0,) * self.count
+        self.name_format = f"{prefix}{{}}{suffix}{self.version_format}.blend"
+    #
+    def version_str_get(self, parts: VersionParts) -> str:
+        # missing parts are taken from the zeros, extra ones are ignored by the format
+        return self.version_format.format(*parts, *self.zeros)
+    #
+    def name_get(self, root: str, parts: VersionParts) -> str:
+        return self.name_format.format(root, *parts, *self.zeros)
+    #
+    def names_get(self, root: str, versions_parts: Iterable[VersionParts]) -> list[str]:
+        name_format = self.name_format.format
+        zeros = self.zeros
+        return [name_format(root, *parts, *zeros) for parts in versions_parts]
+    #
+    def increments_get(self, parts: VersionParts) -> list[VersionParts]:
+        """
+        `version_increment` of the parts at every index up to the template count,
+        already truncated to the count
+        """
+        parts = [int(e) for e in parts[:self.count]] + list(self.zeros[len(parts):])
+        return [parts[:idx] + [parts[idx] + 1] + [0] * (self.count - idx - 1)
+            for idx in range(self.count)]
+
+@functools.lru_cache(maxsize = 64)
+def template_builder_get(template: Template) -> TemplateBuilder:
+    """ cached `TemplateBuilder` for the template """
+    return TemplateBuilder(template)
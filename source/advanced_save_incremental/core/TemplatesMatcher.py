@@ -0,0 +1,104 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import functools
+import re
+from collections.abc import Iterable
+from collections.abc import Sequence
+
+from .parse import version_part_pattern_get
+from .parse import version_template_width_get
+from .StemParts import StemParts
+from .Template import Template
+from .Version import Version
+
+class TemplatesMatcher:
+    """
+    classify stems against many templates with a single compiled pattern.
+
+    unlike `parse_stem`, a template matches only when the stem has all its parts:
+    the prefix, the suffix and the version if the template has them.
+    when several templates match, the most specific one wins: templates with a version
+    before templates without one, then longer prefix and suffix, then more version parts,
+    then the templates order.
+    like in `parse_version`, the first version part takes all the digits before it.
+    """
+    def __init__(self, templates: Sequence[Template]):
+        self.templates = tuple(templates)
+        def specificity_key(idx: int):
+            template = self.templates[idx]
+            affixes_len = len(template.prefix or "") + len(template.suffix or "")
+            version_count = template.version.count if template.version is not None else 0
+            return template.version is None, -affixes_len, -version_count, idx
+        alternatives = [
+            f"(?P<t{idx}>{self._template_pattern_get(idx, self.templates[idx])})"
+            for idx in sorted(range(len(self.templates)), key = specificity_key)]
+        self.pattern = re.compile("|".join(alternatives) or "(?!)", re.DOTALL)
+    #
+    @staticmethod
+    def _template_pattern_get(idx: int, template: Template) -> str:
+        """ pattern for the reversed stem, see `version_pattern_get` for why """
+        prefix = re.escape((template.prefix or "")[::-1])
+        suffix = re.escape((template.suffix or "")[::-1])
+        if template.version is None:
+            return f"{suffix}(?P<r{idx}>.*){prefix}"
+        else:
+            version_part_pattern = version_part_pattern_get(template.version)
+            version_pattern = re.escape(template.version.separator[::-1]).join([
+                f"(?P<v{idx}_{part_idx}>{version_part_pattern})"
+                for part_idx in reversed(range(template.version.count))])
+            return fr"{version_pattern}(?!\d){suffix}(?P<r{idx}>.*){prefix}"
+    #
+    def index_get(self, stem: str) -> int:
+        """ index of the best matching template or -1 """
+        match = self.pattern.fullmatch(stem[::-1])
+        return int(match.lastgroup[1:]) if match else -1
+    #
+    def indices_get(self, stems: Iterable[str]) -> list[int]:
+        fullmatch = self.pattern.fullmatch
+        return [int(match.lastgroup[1:]) if (match := fullmatch(stem[::-1])) else -1
+            for stem in stems]
+    #
+    def match(self, stem: str) -> tuple[int, StemParts] | None:
+        """ index of the best matching template and the stem parts parsed with it """
+        match = self.pattern.fullmatch(stem[::-1])
+        if not match:
+            return None
+        idx = int(match.lastgroup[1:])
+        template = self.templates[idx]
+        stem_len = len(stem)
+        def group_get(name: str) -> str:
+            start, end = match.span(name)
+            return stem[stem_len - end:stem_len - start]
+        if template.version is None:
+            version = None
+        else:
+            version_parts_strs = [group_get(f"v{idx}_{part_idx}")
+                for part_idx in range(template.version.count)]
+            version = Version(
+                [int(e) for e in version_parts_strs],
+                version_template_width_get(
+                    template.version, min([len(e) for e in version_parts_strs])))
+        return idx, StemParts(
+            prefix = template.prefix or "",
+            root = group_get(f"r{idx}"),
+            suffix = template.suffix or "",
+            version = version,
+        )
+
+@functools.lru_cache(maxsize = 16)
+def templates_matcher_get(templates: tuple[Template, ...]) -> TemplatesMatcher:
+    """ cached `TemplatesMatcher` for the templates """
+    return TemplatesMatcher(templates)
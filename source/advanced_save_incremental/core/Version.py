@@ -13,13 +13,53 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import functools
+from collections.abc import Iterable
 from dataclasses import dataclass
 from dataclasses import field
+from operator import attrgetter
 
-from .VersionParts import VersionParts
+from .VersionKey import version_key_get
+from .VersionKey import VersionKey
 from .VersionTemplate import VersionTemplate
 
-@dataclass
+@functools.total_ordering
+@dataclass(frozen = True, slots = True, eq = False)
 class Version:
-    parts: VersionParts = field(default_factory = list)
+    """
+    compared and hashed by the packed `key`, so only versions with the same template
+    count are comparable. the parts are stored as a tuple.
+
+    the template separator and width are ignored by the comparisons, e.g. "1.2" and "1_02"
+    with the same count are equal and collapse in sets. comparing versions runs Python code
+    per comparison, sort and deduplicate many of them by their keys with `versions_sort`
+    and `versions_dedup`
+    """
+    parts: tuple[int, ...] = ()
     template: VersionTemplate = field(default_factory = VersionTemplate)
+    key: VersionKey = field(init = False, repr = False)
+    def __post_init__(self):
+        object.__setattr__(self, "parts", tuple(self.parts))
+        object.__setattr__(self, "key", version_key_get(self.parts, self.template.count))
+    #
+    def __eq__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.template.count == other.template.count and self.key == other.key
+    def __lt__(self, other):
+        if not isinstance(other, Version) or self.template.count != other.template.count:
+            return NotImplemented
+        return self.key < other.key
+    def __hash__(self):
+        return hash(self.key)
+
+_key_get = attrgetter("key")
+
+def versions_sort(versions: Iterable[Version], reverse: bool = False) -> list[Version]:
+    """ `sorted` comparing the keys in C instead of calling `Version.__lt__` """
+    return sorted(versions, key = _key_get, reverse = reverse)
+
+def versions_dedup(versions: Iterable[Version]) -> list[Version]:
+    """ the first of the versions with the same key, in their order, see `Version` about the equality """
+    keys = set()
+    return [e for e in versions if not (e.key in keys or keys.add(e.key))]
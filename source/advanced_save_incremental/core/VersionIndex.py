@@ -0,0 +1,108 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from bisect import bisect_left
+from bisect import bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass
+from dataclasses import field
+
+from .VersionKey import version_key_get
+from .VersionKey import VersionKey
+from .VersionKey import version_key_part_max
+from .VersionKey import version_parts_from_key
+from .VersionParts import VersionParts
+
+@dataclass
+class VersionIndex:
+    """
+    sorted packed keys of all versions of a single root, see `version_key_get`.
+    queries bisect the keys, adding and removing a version keeps them sorted
+    """
+    count: int
+    """ version template count """
+    keys: list[VersionKey] = field(default_factory = list)
+    #
+    @classmethod
+    def from_keys(cls, keys: Iterable[VersionKey], count: int):
+        return cls(count, sorted(set(keys)))
+    #
+    def __len__(self) -> int:
+        return len(self.keys)
+    def __contains__(self, parts: VersionParts) -> bool:
+        key = version_key_get(parts, self.count)
+        idx = bisect_left(self.keys, key)
+        return idx < len(self.keys) and self.keys[idx] == key
+    #
+    def key_add(self, key: VersionKey):
+        idx = bisect_left(self.keys, key)
+        if idx == len(self.keys) or self.keys[idx] != key:
+            self.keys.insert(idx, key)
+    def add(self, parts: VersionParts):
+        self.key_add(version_key_get(parts, self.count))
+    def key_discard(self, key: VersionKey):
+        idx = bisect_left(self.keys, key)
+        if idx < len(self.keys) and self.keys[idx] == key:
+            del self.keys[idx]
+    def discard(self, parts: VersionParts):
+        self.key_discard(version_key_get(parts, self.count))
+    #
+    def _parts_get(self, idx: int) -> VersionParts | None:
+        if 0 <= idx < len(self.keys):
+            return version_parts_from_key(self.keys[idx], self.count)
+        else:
+            return None
+    def latest_get(self) -> VersionParts | None:
+        return self._parts_get(len(self.keys) - 1)
+    def is_latest(self, parts: VersionParts) -> bool:
+        return not self.keys or version_key_get(parts, self.count) >= self.keys[-1]
+    def previous_get(self, parts: VersionParts) -> VersionParts | None:
+        """ the highest version lower than the given one """
+        return self._parts_get(bisect_left(self.keys, version_key_get(parts, self.count)) - 1)
+    def next_get(self, parts: VersionParts) -> VersionParts | None:
+        """ the lowest version higher than the given one """
+        return self._parts_get(bisect_right(self.keys, version_key_get(parts, self.count)))
+    #
+    def _range_get(self, parts_prefix: VersionParts) -> tuple[int, int]:
+        """ the slice of the keys of versions starting with the parts """
+        parts_prefix = list(parts_prefix[:self.count])
+        key_min = version_key_get(parts_prefix, self.count)
+        key_max = version_key_get(
+            parts_prefix + [version_key_part_max] * (self.count - len(parts_prefix)), self.count)
+        return bisect_left(self.keys, key_min), bisect_right(self.keys, key_max)
+    def count_get(self, parts_prefix: VersionParts) -> int:
+        """ count versions starting with the parts, e.g. per major with one part """
+        start, end = self._range_get(parts_prefix)
+        return end - start
+    def latest_with_get(self, parts_prefix: VersionParts) -> VersionParts | None:
+        """ the highest version starting with the parts """
+        start, end = self._range_get(parts_prefix)
+        return self._parts_get(end - 1) if end > start else None
+    #
+    def missing_get(self, idx: int = -1) -> list[VersionParts]:
+        """
+        versions missing between consecutive existing versions which differ only
+        in the part at the index and the parts after it, which are zeroes for the missing ones
+        """
+        if idx < 0: idx += self.count
+        missing = []
+        parts_prev = None
+        for key in self.keys:
+            parts = version_parts_from_key(key, self.count)
+            if parts_prev is not None and parts_prev[:idx] == parts[:idx]:
+                for part in range(parts_prev[idx] + 1, parts[idx]):
+                    missing.append(parts[:idx] + [part] + [0] * (self.count - idx - 1))
+            parts_prev = parts
+        return missing
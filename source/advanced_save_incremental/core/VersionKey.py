@@ -0,0 +1,42 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from .VersionParts import VersionParts
+
+VersionKey = int
+"""
+version parts packed into a single integer with a fixed-width field per part,
+so that comparing keys compares versions. see `version_key_get`
+"""
+
+version_key_part_bits = 64
+version_key_part_max = (1 << version_key_part_bits) - 1
+
+def version_key_get(parts: VersionParts, count: int) -> VersionKey:
+    """
+    pack the first `count` parts into a key, missing parts are zeroes.
+    keys are comparable only between versions with the same count
+    """
+    key = 0
+    for idx in range(count):
+        part = parts[idx] if idx < len(parts) else 0
+        if not 0 <= part <= version_key_part_max:
+            raise ValueError(f"version part out of range for a key: {part}")
+        key = (key << version_key_part_bits) | part
+    return key
+
+def version_parts_from_key(key: VersionKey, count: int) -> VersionParts:
+    return [(key >> (version_key_part_bits * (count - 1 - idx))) & version_key_part_max
+        for idx in range(count)]
@@ -0,0 +1,156 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+
+from .StemsColumns import StemsColumns
+from .VersionParts import VersionParts
+from .VersionTemplate import VersionTemplate
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+""" optional, bundled with Blender. without it `VersionTable` works on lists """
+
+@dataclass
+class VersionTable:
+    """
+    versions of many files with the same version template, one row per file and
+    one column per version part, for bulk arithmetic over whole directories or archives.
+    rows are a 2-D integer array with NumPy, otherwise lists of parts
+    """
+    template: VersionTemplate
+    roots: list[str] = field(default_factory = list)
+    rows: Any = field(default_factory = list)
+    """ `numpy.ndarray` of shape (rows, template count) or `list[list[int]]` """
+    #
+    @classmethod
+    def from_parts(cls,
+            template: VersionTemplate,
+            roots: Iterable[str],
+            versions_parts: Iterable[VersionParts],
+            use_numpy: bool | None = None,
+    ):
+        """ missing parts are zeroes, extra ones are dropped. NumPy is used by default if present """
+        count = template.count
+        zeros = [0] * count
+        rows = [[int(e) for e in parts[:count]] + zeros[len(parts):] for parts in versions_parts]
+        roots = list(roots)
+        if len(roots) != len(rows):
+            raise ValueError(f"{len(roots)} roots for {len(rows)} versions")
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        if use_numpy:
+            if numpy is None:
+                raise ImportError("NumPy is not available")
+            # parts are at most `part_digits_max` digits, so they fit in 64 bits with the increment
+            rows = numpy.array(rows, dtype = numpy.int64).reshape(len(rows), count)
+        return cls(template, roots, rows)
+    @classmethod
+    def from_columns(cls,
+            template: VersionTemplate,
+            columns: StemsColumns,
+            use_numpy: bool | None = None,
+    ):
+        """ the rows of parsed stems where the version matched, see `parse_stems` """
+        idxs = [idx for idx in range(len(columns)) if columns.matched_get(idx)]
+        return cls.from_parts(template,
+            [columns.roots[idx] for idx in idxs],
+            [columns.version_parts_get(idx) for idx in idxs],
+            use_numpy)
+    #
+    def __len__(self) -> int:
+        return len(self.roots)
+    @property
+    def is_numpy(self) -> bool:
+        return numpy is not None and isinstance(self.rows, numpy.ndarray)
+    def parts_get(self) -> list[VersionParts]:
+        return self.rows.tolist() if self.is_numpy else [list(row) for row in self.rows]
+    #
+    def _idx_get(self, idx: int) -> int:
+        count = self.template.count
+        if not -count <= idx < count:
+            raise IndexError(f"version part index out of range for {count} parts: {idx}")
+        return idx % count
+    def increment(self, idx: int = -1) -> "VersionTable":
+        """
+        `version_increment` of every row at the index: the part is incremented
+        and all following parts are reset to 0
+        """
+        idx = self._idx_get(idx)
+        if self.is_numpy:
+            rows = self.rows.copy()
+            rows[:, idx] += 1
+            rows[:, idx + 1:] = 0
+        else:
+            tail = [0] * (self.template.count - idx - 1)
+            rows = [row[:idx] + [row[idx] + 1] + tail for row in self.rows]
+        return VersionTable(self.template, list(self.roots), rows)
+    #
+    def compare(self, other: "VersionTable") -> Any:
+        """
+        row-wise comparison: -1 where the version is lower than the other's one,
+        0 where equal and 1 where higher. an int8 array with NumPy, otherwise a list
+        """
+        if len(self) != len(other) or self.template.count != other.template.count:
+            raise ValueError("versions tables of different shapes are not comparable")
+        if self.is_numpy and other.is_numpy:
+            signs = numpy.sign(self.rows - other.rows).astype(numpy.int8)
+            if signs.shape[1] == 0:
+                return numpy.zeros(len(self), dtype = numpy.int8)
+            # the sign of the first differing part decides, 0 if none differs
+            first = numpy.argmax(signs != 0, axis = 1)
+            return signs[numpy.arange(len(self)), first]
+        else:
+            return [(a > b) - (a < b) for a, b in zip(map(list, self.rows), map(list, other.rows))]
+    #
+    def latest_per_root_get(self) -> dict[str, VersionParts]:
+        """ the highest version per root """
+        if self.is_numpy and len(self):
+            codes = {}
+            roots_codes = numpy.array(
+                [codes.setdefault(root, len(codes)) for root in self.roots], dtype = numpy.int64)
+            # sort by root, then by parts from the first one, the last row of every root is its latest
+            order = numpy.lexsort((*self.rows.T[::-1], roots_codes))
+            roots_codes = roots_codes[order]
+            lasts = order[numpy.append(roots_codes[1:] != roots_codes[:-1], True)]
+            return {self.roots[idx]: parts for idx, parts in zip(lasts.tolist(), self.rows[lasts].tolist())}
+        else:
+            latest = {}
+            for root, row in zip(self.roots, self.rows):
+                row = list(row)
+                if root not in latest or row > latest[root]:
+                    latest[root] = row
+            return latest
+    #
+    def version_strs_get(self) -> list[str]:
+        """ `build_version_str` of every row, parts zero-padded to the template width """
+        width = max(self.template.width, 0)
+        if self.is_numpy:
+            if not len(self):
+                return []
+            strs = numpy.char.zfill(self.rows.astype(str), width)
+            version_strs = strs[:, 0]
+            for idx in range(1, self.template.count):
+                version_strs = numpy.char.add(numpy.char.add(version_strs, self.template.separator), strs[:, idx])
+            return version_strs.tolist()
+        else:
+            separator = self.template.separator.replace("{", "{{").replace("}", "}}")
+            version_format = separator.join(["{:0>" + str(width) + "}"] * self.template.count).format
+            return [version_format(*row) for row in self.rows]
@@ -17,7 +17,7 @@ from dataclasses import dataclass
 
 from ..exts.stdx import DataclassFromDictMixIn
 
-@dataclass
+@dataclass(frozen = True, slots = True)
 class VersionTemplate(DataclassFromDictMixIn):
     separator: str = "."
     count: int = 3
@@ -26,6 +26,11 @@ class VersionTemplate(DataclassFromDictMixIn):
     class config:
         parts = ["Major", "Minor", "Patch"]
         width_max = 3
+        part_digits_max = 18
+        """
+        longer digit runs, like hashes or timestamps, are not versions. this also keeps
+        converting digits to numbers cheap and the parts within 64 bits
+        """
     #
     @staticmethod
     def part_get(idx: int):
@@ -0,0 +1,32 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from dataclasses import dataclass
+from typing import Literal
+
+WatchEventKind = Literal["created", "deleted", "rescan"]
+
+@dataclass(frozen = True, slots = True)
+class WatchEvent:
+    """
+    a change in a watched directory. renames are a deletion and a creation.
+    "rescan" means the changes are unknown, e.g. events were lost or the directory itself
+    was removed or moved, so the directory should be listed again
+    """
+    directory: str
+    """ resolved path of the watched directory """
+    kind: WatchEventKind
+    name: str = ""
+    is_directory: bool = False
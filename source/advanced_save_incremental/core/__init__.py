@@ -15,19 +15,55 @@
 
 """ core structures and functions not depending on the Blender API """
 
-import re
-
 from .build import build_version_str
 from .build import file_name_get
+from .build import files_save_datas_get
 from .build import version_increment
+from .DirectoriesScanner import DirectoriesScanner
+from .DirectoriesScanner import ScanBatch
+from .DirectoriesScanner import ScanKey
+from .DirectoriesScanner import ScanResult
+from .DirectoryListing import DirectoryListing
+from .DirectoryVersions import DirectoryVersions
+from .DirectoryWatcher import DirectoryWatcher
+from .DirectoryWatcher import directory_watcher_get
+from .DirectoryVersions import directory_versions_get
+from .DirectoryVersions import file_names_versions_get
 from .FileSaveData import FileSaveData
+from .FilesIndex import FilesIndex
+from .FilesIndex import files_indices
+from .FilesIndex import FilesIndices
+from .FilesPages import FilesPage
+from .FilesPages import FilesPages
+from .InotifyWatcher import InotifyWatcher
+from .ListingCache import directory_listing_get
+from .ListingCache import ListingCache
+from .ListingCache import listing_cache
 from .parse import parse_stem
+from .parse import parse_stems
+from .parse import ParseEngine
+from .scan import blend_file_name_matches
+from .scan import blend_file_names_filter
+from .scan import blend_files_scan
+from .scan import directory_tree_walk
+from .sort import natural_key_get
+from .sort import NaturalKey
 from .StemParts import StemParts
+from .StemsColumns import StemsColumns
 from .VersionParts import VersionParts
 from .Template import Template
+from .TemplateBuilder import TemplateBuilder
+from .TemplateBuilder import template_builder_get
+from .TemplatesMatcher import TemplatesMatcher
+from .TemplatesMatcher import templates_matcher_get
 from .Version import Version
+from .Version import versions_dedup
+from .Version import versions_sort
+from .VersionIndex import VersionIndex
+from .VersionKey import version_key_get
+from .VersionKey import VersionKey
+from .VersionKey import version_parts_from_key
+from .VersionTable import VersionTable
 from .VersionTemplate import VersionTemplate
-
-def tokenize_words_and_numbers(stem: str) -> tuple[str, ...]:
-    return tuple(int(e) if e.isdigit() else e
-        for e in re.split(r"(\d+)", stem))
+from .WatchEvent import WatchEvent
+from .WatchEvent import WatchEventKind
@@ -13,11 +13,16 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import functools
 from typing import Any
 
+from .DirectoryVersions import DirectoryVersions
 from .FileSaveData import FileSaveData
 from .Template import Template
+from .TemplateBuilder import template_builder_get
 from .Version import Version
+from .VersionIndex import VersionIndex
+from .VersionKey import VersionKey
 from .VersionParts import VersionParts
 from .VersionTemplate import VersionTemplate
 
@@ -25,7 +30,7 @@ def version_str(version: Version, fill: int = 0) -> str:
     separator = version.template.separator
     width = version.template.width
     count = version.template.count
-    parts = version.parts
+    parts = list(version.parts)
     return separator.join([str(e).rjust(width, str(fill))
         for e in (parts + [fill] * (count - len(parts)))])
 
@@ -62,7 +67,7 @@ def build_version_str(
     if template is None:
         return ""
     else:
-        parts = parts[:min(len(parts), template.count)]
+        parts = list(parts[:min(len(parts), template.count)])
         return template.separator.join([
             str(e).rjust(template.width, str(fill))
             for e in (parts + [fill] * (template.count - len(parts)))])
@@ -72,34 +77,60 @@ def file_name_get(
         root: str,
         version_parts: VersionParts,
 ):
-    prefix = template.prefix if template.prefix else ""
-    suffix = template.suffix if template.suffix else ""
-    version = build_version_str(template.version, version_parts)
-    return f"{prefix}{root}{suffix}{version}.blend"
+    return template_builder_get(template).name_get(root, version_parts)
 
 def files_save_datas_gen(
         template: Template,
         version_parts: VersionParts,
         root: str,
         phrase: str = "Save",
+        directory_versions: DirectoryVersions | None = None,
 ):
+    """
+    data for the save buttons. with `directory_versions` of the target directory
+    the incremental saves skip to versions not taken yet
+    """
+    builder = template_builder_get(template)
     # simple save
     yield FileSaveData(
         label = phrase,
-        file_name = file_name_get(template, root, version_parts),
+        file_name = builder.name_get(root, version_parts),
     )
     # incremental saves
-    if template.version is not None:
-        count = template.version.count
-        for increment_idx in range(count):
-            version_parts_inc = version_increment(version_parts, increment_idx, count)
-            version_str = build_version_str(template.version, version_parts_inc)
-            if count == 1:
-                label = f"{phrase} Incremental: {version_str}"
-            else:
-                version_part_name = VersionTemplate.part_get(increment_idx)
-                label = f"{phrase} Incremented {version_part_name}: {version_str}"
-            yield FileSaveData(
-                label = label,
-                file_name = file_name_get(template, root, version_parts_inc),
-            )
+    count = builder.count
+    for increment_idx, version_parts_inc in enumerate(builder.increments_get(version_parts)):
+        if directory_versions is not None:
+            version_parts_inc = directory_versions.increment_free_get(
+                root, version_parts, increment_idx)
+        version_str = builder.version_str_get(version_parts_inc)
+        if count == 1:
+            label = f"{phrase} Incremental: {version_str}"
+        else:
+            version_part_name = VersionTemplate.part_get(increment_idx)
+            label = f"{phrase} Incremented {version_part_name}: {version_str}"
+        yield FileSaveData(
+            label = label,
+            file_name = builder.name_get(root, version_parts_inc),
+        )
+
+saves_datas_cache_size = 256
+""" how many save buttons data sets to keep, see `files_save_datas_get` """
+
+@functools.lru_cache(maxsize = saves_datas_cache_size)
+def files_save_datas_get(
+        template: Template,
+        version_parts: tuple[int, ...],
+        root: str,
+        phrase: str = "Save",
+        version_keys: tuple[VersionKey, ...] = (),
+) -> tuple[FileSaveData, ...]:
+    """
+    memoised `files_save_datas_gen`. the directory is given by the sorted keys
+    of the existing versions of the root, see `DirectoryVersions.index_get`
+    """
+    if template.version is not None and version_keys:
+        directory_versions = DirectoryVersions(template,
+            {root: VersionIndex(template.version.count, list(version_keys))})
+    else:
+        directory_versions = None
+    return tuple(files_save_datas_gen(template, list(version_parts), root, phrase, directory_versions))
@@ -13,10 +13,16 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import functools
 import logging
 import re
+from collections.abc import Iterable
+from dataclasses import replace
+from typing import Literal
 
+from ..prefs import config
 from .StemParts import StemParts
+from .StemsColumns import StemsColumns
 from .Template import Template
 from .Version import Version
 from .VersionTemplate import VersionTemplate
@@ -35,34 +41,168 @@ def parse_suffix(root: str, template: Template):
     suffix = template.suffix if len(root) < root_len_old else ""
     return root, suffix
 
-def parse_version(stem: str, version_template: VersionTemplate):
-    if version_template.width <= 0:
-        version_part_pattern = r"(\d+)"
+def version_part_pattern_get(version_template: VersionTemplate) -> str:
+    """ pattern of a single version part without a group """
+    width_min = max(1, version_template.width)
+    width_max = VersionTemplate.config.part_digits_max
+    if width_min > width_max:
+        return "(?!)"
     else:
-        version_part_pattern = r"(\d{" + str(version_template.width) + ",})"
-    version_parts_patterns = (
-            [version_part_pattern] +
-            [f"{version_part_pattern}"] * (version_template.count - 1))
+        return r"\d{" + str(width_min) + "," + str(width_max) + "}"
+
+version_patterns_cache_size = 256
+""" how many compiled version patterns to keep. one per distinct version template """
+
+@functools.lru_cache(maxsize = version_patterns_cache_size)
+def version_pattern_get(version_template: VersionTemplate) -> re.Pattern:
+    """
+    compiled pattern matching the reversed version at the start of the reversed stem.
+    cached per version template, see `version_pattern_get.cache_info()` for the hit rate.
+
+    searching the version anchored at the end of the stem retries the pattern from
+    every position, which is quadratic on long digit runs. matching the reversed stem
+    from its start is tried only once, and the parts are bounded runs of digits,
+    so the matching is linear in the stem length if the separator has no digits.
+    """
+    version_part_pattern = f"({version_part_pattern_get(version_template)})"
+    separator_pattern = f"({re.escape(version_template.separator[::-1])})"
+    # the first part of the version must not continue into the root
     version_pattern = (
-            f"({re.escape(version_template.separator)})"
-            .join(version_parts_patterns) + "$")
-    logger.debug(f"{version_pattern=}")
-    version_match = re.search(version_pattern, stem)
-    logger.debug(f"{version_match=}")
+            separator_pattern.join([version_part_pattern] * version_template.count) +
+            r"(?!\d)")
+    if config.log: logger.debug(f"{version_pattern=}")
+    return re.compile(version_pattern)
+
+@functools.lru_cache(maxsize = version_patterns_cache_size)
+def version_template_width_get(version_template: VersionTemplate, width: int) -> VersionTemplate:
+    """
+    a copy of the template with the detected width instead of mutating the given one.
+    cached to share the same copy between all parsed versions
+    """
+    return replace(version_template, width = width)
+
+VersionMatch = tuple[int, list[int], int]
+""" version start index in the stem, version parts, version width """
+
+ParseEngine = Literal["regex", "scan"]
+"""
+how to find the version at the end of a stem:
+
+* "regex" - compiled regular expression, see `version_pattern_get`
+* "scan" - regex-free right-to-left scanner, see `version_scan`
+"""
+
+engine_default: ParseEngine = "regex"
+
+def version_search(stem: str, version_template: VersionTemplate) -> VersionMatch | None:
+    stem_reversed = stem[::-1]
+    version_match = version_pattern_get(version_template).match(stem_reversed)
+    if config.log: logger.debug(f"{version_match=}")
     if version_match:
-        version_groups = version_match.groups()
-        logger.debug(f"{version_groups=}")
-        version_parts_strs = version_groups[::2]
-        version_template.width = min([len(e) for e in version_parts_strs])
-        version_parts = [int(e) for e in version_parts_strs if e.isnumeric()]
-        root = stem.removesuffix("".join(version_groups))
+        version_parts_strs = version_match.groups()[::2]
+        return (len(stem) - version_match.end(),
+                [int(e[::-1]) for e in reversed(version_parts_strs)],
+                min([len(e) for e in version_parts_strs]))
+    else:
+        return None
+
+def version_scan(stem: str, version_template: VersionTemplate) -> VersionMatch | None:
+    """
+    find the version walking backwards from the end of the stem over digit runs and separators.
+    gives the same results as `version_search`. separators which are empty or contain
+    digits are ambiguous for the scanner, so such templates fall back to `version_search`.
+    every character is visited at most once, and digit runs longer than
+    `VersionTemplate.config.part_digits_max` are rejected before converting them to numbers.
+    """
+    separator = version_template.separator
+    if not separator or any(c.isdecimal() for c in separator):
+        return version_search(stem, version_template)
+    separator_len = len(separator)
+    width_min = max(1, version_template.width)
+    width_max = VersionTemplate.config.part_digits_max
+    parts = [0] * version_template.count
+    width = end = len(stem)
+    for part_idx in range(version_template.count - 1, -1, -1):
+        start = end
+        while start > 0 and stem[start - 1].isdecimal():
+            start -= 1
+            if end - start > width_max:
+                return None
+        part_width = end - start
+        if part_width < width_min:
+            return None
+        parts[part_idx] = int(stem[start:end])
+        if part_width < width:
+            width = part_width
+        if part_idx > 0:
+            if not stem.endswith(separator, 0, start):
+                return None
+            end = start - separator_len
+    return start, parts, width
+
+version_matchers = {
+    "regex": version_search,
+    "scan": version_scan,
+}
+
+def parse_version(
+        stem: str,
+        version_template: VersionTemplate,
+        engine: ParseEngine | None = None,
+):
+    version_match = version_matchers[engine or engine_default](stem, version_template)
+    if version_match:
+        start, version_parts, width = version_match
+        version_template = version_template_width_get(version_template, width)
+        root = stem[:start]
     else:
         version_parts = [0]
         root = stem
     return root, Version(version_parts, version_template)
 
-def parse_stem(stem: str, template: Template) -> StemParts:
-    root, version = parse_version(stem, template.version)
+def parse_stem(
+        stem: str,
+        template: Template,
+        engine: ParseEngine | None = None,
+) -> StemParts:
+    root, version = parse_version(stem, template.version, engine)
     root, prefix = parse_prefix(root, template)
     root, suffix = parse_suffix(root, template)
     return StemParts(prefix, root, suffix, version)
+
+def parse_stems(
+        stems: Iterable[str],
+        template: Template,
+        engine: ParseEngine | None = None,
+) -> StemsColumns:
+    """
+    parse many stems with the same template like `parse_stem`, but into columns
+    without allocating parts objects per stem.
+    """
+    prefix = template.prefix or ""
+    suffix = template.suffix or ""
+    version_template = template.version
+    version_matcher = version_matchers[engine or engine_default]
+    columns = StemsColumns(count = version_template.count if version_template else 0)
+    row_append = columns.row_append
+    for stem in stems:
+        version_match = version_matcher(stem, version_template) if version_template else None
+        if version_match:
+            start, version_parts, version_width = version_match
+            root = stem[:start]
+        else:
+            version_parts = None
+            version_width = 0
+            root = stem
+        if prefix and root.startswith(prefix):
+            root = root[len(prefix):]
+            stem_prefix = prefix
+        else:
+            stem_prefix = ""
+        if suffix and root.endswith(suffix):
+            root = root[:-len(suffix)]
+            stem_suffix = suffix
+        else:
+            stem_suffix = ""
+        row_append(stem_prefix, root, stem_suffix, version_parts, version_width)
+    return columns
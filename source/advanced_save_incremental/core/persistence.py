@@ -13,19 +13,131 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import contextlib
+import hashlib
+import marshal
+import os
 import tomllib
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from os import PathLike
+from pathlib import Path
 
 from .Template import Template
+from ..exts.stdx import iox
+from ..exts.stdx import tomlx
 
-def templates_import(file_path: str | bytes | PathLike) -> list[Template]:
-    with open(file_path, "rb") as file:
-        templates_dict = tomllib.load(file)["templates"]
-    templates = list(map(Template.from_dict, templates_dict))
-    return templates
+library_cache_format = 1
+""" bump when the layout of the cached libraries changes to ignore the old caches """
+
+def _library_cache_path_get(cache_dir: str | PathLike, file_path: Path) -> Path:
+    name = hashlib.blake2b(os.fsencode(file_path.resolve()), digest_size = 16).hexdigest()
+    return Path(cache_dir) / f"{name}.templates.marshal"
+
+def templates_dicts_load(
+        file_path: str | bytes | PathLike,
+        cache_dir: str | PathLike | None = None,
+) -> list[dict] | None:
+    """
+    the templates tables of a TOML library, `None` if it has none.
+    with a cache directory, the parsed tables are kept there in `marshal` format
+    and reused while the library size and modification time are the same,
+    or its content hash is, so unchanged libraries are not parsed again
+    """
+    file_path = Path(os.fsdecode(file_path))
+    if cache_dir is None:
+        with open(file_path, "rb") as file:
+            return tomllib.load(file).get("templates")
+    stat = file_path.stat()
+    cache_path = _library_cache_path_get(cache_dir, file_path)
+    cache = None
+    with contextlib.suppress(OSError, EOFError, ValueError, TypeError):
+        cache_format, size, mtime_ns, digest, templates_dicts = marshal.loads(cache_path.read_bytes())
+        if cache_format == library_cache_format:
+            cache = size, mtime_ns, digest, templates_dicts
+    if cache is not None and cache[:2] == (stat.st_size, stat.st_mtime_ns):
+        return cache[3]
+    content = file_path.read_bytes()
+    digest = hashlib.blake2b(content, digest_size = 16).digest()
+    if cache is not None and cache[2] == digest:
+        # touched or copied, but not changed
+        templates_dicts = cache[3]
+    else:
+        templates_dicts = tomllib.loads(content.decode()).get("templates")
+    # the cache is only an optimization, a read-only or full cache directory is not an error
+    with contextlib.suppress(OSError, ValueError):
+        payload = marshal.dumps(
+            (library_cache_format, len(content), stat.st_mtime_ns, digest, templates_dicts))
+        with iox.open_atomic(cache_path, binary = True) as file:
+            file.write(payload)
+    return templates_dicts
+
+library_suffix = ".toml"
+
+def library_paths_get(dir_path: str | bytes | PathLike) -> list[Path]:
+    """ template libraries in the directory, sorted by name for a deterministic merge """
+    dir_path = Path(os.fsdecode(dir_path))
+    return sorted((path for path in dir_path.iterdir()
+        if path.suffix.lower() == library_suffix and path.is_file()), key = lambda path: path.name)
+
+def templates_dicts_load_dir(
+        dir_path: str | bytes | PathLike,
+        cache_dir: str | PathLike | None = None,
+        workers: int | None = None,
+) -> list[dict]:
+    """
+    `templates_dicts_load` of all libraries in the directory, read on a thread pool
+    to overlap their open and read latency, e.g. on shared network storage.
+    merged in the libraries names order, see `templates_dicts_names_dedup`
+    """
+    def load(path: Path) -> list[dict]:
+        try:
+            return templates_dicts_load(path, cache_dir) or []
+        except tomllib.TOMLDecodeError as exc:
+            raise tomllib.TOMLDecodeError(f"{path.name}: {exc}") from exc
+    paths = library_paths_get(dir_path)
+    if len(paths) <= 1:
+        libraries = list(map(load, paths))
+    else:
+        with ThreadPoolExecutor(max_workers = workers or min(32, len(paths))) as executor:
+            libraries = list(executor.map(load, paths))
+    return templates_dicts_names_dedup([d for library in libraries for d in library])
+
+def templates_dicts_names_dedup(templates_dicts: Iterable[dict | None]) -> list[dict]:
+    """
+    the first template with a name keeps it, the following ones get a numbered suffix
+    like Blender gives to duplicated data-blocks, e.g. "Shot" and "Shot.001"
+    """
+    templates_dicts = list(templates_dicts)
+    names = {d["name"] for d in templates_dicts if d and "name" in d}
+    names_taken = set()
+    templates_dicts_deduped = []
+    for d in templates_dicts:
+        if d and (name := d.get("name")) is not None:
+            if name in names_taken:
+                idx = 1
+                while (name_new := f"{name}.{idx:03}") in names or name_new in names_taken:
+                    idx += 1
+                d = {**d, "name": name_new}
+                name = name_new
+            names_taken.add(name)
+        templates_dicts_deduped.append(d)
+    return templates_dicts_deduped
+
+def templates_import(
+        file_path: str | bytes | PathLike,
+        cache_dir: str | PathLike | None = None,
+) -> list[Template]:
+    """
+    templates of a library file or of all libraries in a directory, see `templates_dicts_load_dir`.
+    see `templates_dicts_load` for the cache directory
+    """
+    if os.path.isdir(file_path):
+        templates_dicts = templates_dicts_load_dir(file_path, cache_dir)
+    else:
+        templates_dicts = templates_dicts_load(file_path, cache_dir) or []
+    return Template.from_dicts(templates_dicts)
 
 def templates_export(file_path: str | bytes | PathLike, templates: Iterable[Template]):
-    with open(file_path, "w") as file:
-        for template in templates:
-            file.write(f"[[templates]]\n{template.to_toml()}\n\n")
+    """ written to a temporary file first, so a failed export does not leave a partial file """
+    tomlx.tables_array_dump(file_path, "templates", (template.to_toml_items() for template in templates))
@@ -0,0 +1,128 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import fnmatch
+import os
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from concurrent.futures import Executor
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import wait
+from os import PathLike
+
+from .DirectoryListing import DirectoryListing
+from .ListingCache import listing_cache
+from .ListingCache import ListingCache
+
+blend_extension = ".blend"
+
+is_case_insensitive = os.path.normcase("A") == "a"
+""" whether file names match in any case, like on Windows, as `Path.glob` matched them there """
+
+def name_normcase(name: str) -> str:
+    """ the name as matched, see `is_case_insensitive` """
+    return name.lower() if is_case_insensitive else name
+
+def blend_file_name_matches(file_name: str, root: str = "") -> bool:
+    """
+    a blend-file name containing the root before the extension,
+    the same as the `*{root}*.blend` glob but with the root taken literally
+    """
+    if is_case_insensitive:
+        file_name = file_name.lower()
+        root = root.lower()
+    return (file_name.endswith(blend_extension)
+        and (not root or root in file_name[:-len(blend_extension)]))
+
+def blend_file_names_filter(file_names: Iterable[str], root: str = "") -> Iterator[str]:
+    """ see `blend_file_name_matches` """
+    suffix = blend_extension
+    suffix_len = len(suffix)
+    if is_case_insensitive:
+        root = root.lower()
+        return (e for e in file_names if (name := e.lower()).endswith(suffix) and root in name[:-suffix_len])
+    if root:
+        return (e for e in file_names if e.endswith(suffix) and root in e[:-suffix_len])
+    else:
+        return (e for e in file_names if e.endswith(suffix))
+
+def blend_files_scan(directory_path: str | PathLike, root: str = "") -> Iterator[os.DirEntry]:
+    """
+    blend-files in the directory as they are listed, see `blend_file_name_matches`.
+    entries carry the file type, and on Windows the stat data, from the listing itself
+    """
+    suffix = blend_extension
+    suffix_len = len(suffix)
+    root = name_normcase(root)
+    with os.scandir(directory_path) as entries:
+        for entry in entries:
+            name = name_normcase(entry.name)
+            if name.endswith(suffix) and (not root or root in name[:-suffix_len]):
+                try:
+                    if entry.is_file():
+                        yield entry
+                except OSError:
+                    # removed while scanning
+                    continue
+
+def directory_name_excluded(name: str, excludes: Iterable[str]) -> bool:
+    return any(fnmatch.fnmatch(name, pattern) for pattern in excludes)
+
+def directory_tree_walk(
+        directory_path: str | PathLike,
+        depth_max: int,
+        excludes: Iterable[str],
+        executor: Executor,
+        cache: ListingCache = listing_cache,
+        should_stop: Callable[[], bool] = lambda: False,
+) -> Iterator[tuple[str, DirectoryListing]]:
+    """
+    listings of the directory and its subdirectories down to the depth, with the relative
+    path of each, as they are listed. subdirectories are listed in parallel on the executor.
+    subdirectories with names matching the exclusion globs are skipped with their subtrees,
+    as well as ones which cannot be listed and ones already visited via links.
+    raises `OSError` if the directory itself cannot be listed
+    """
+    excludes = tuple(excludes)
+    listing = cache.get(directory_path)
+    visited = {listing.path}
+    pending = {}
+    def subdirectories_submit(relative_path: str, listing: DirectoryListing, depth: int):
+        if depth >= depth_max:
+            return
+        for name in listing.directories:
+            if not directory_name_excluded(name, excludes):
+                future = executor.submit(cache.get, os.path.join(listing.path, name))
+                pending[future] = (os.path.join(relative_path, name), depth + 1)
+    yield "", listing
+    subdirectories_submit("", listing, 0)
+    try:
+        while pending and not should_stop():
+            done, _ = wait(pending, return_when = FIRST_COMPLETED)
+            for future in done:
+                relative_path, depth = pending.pop(future)
+                try:
+                    listing = future.result()
+                except OSError:
+                    continue
+                if listing.path in visited:
+                    continue
+                visited.add(listing.path)
+                yield relative_path, listing
+                subdirectories_submit(relative_path, listing, depth)
+    finally:
+        for future in pending:
+            future.cancel()
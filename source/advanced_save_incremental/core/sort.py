@@ -0,0 +1,41 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import functools
+import re
+
+NaturalKey = tuple[str, ...]
+"""
+text and number chunks alternating, always starting and ending with text.
+all chunks are strings, so keys of any strings compare without errors and fast
+"""
+
+_digits_split = re.compile(r"(\d+)").split
+
+natural_keys_cache_size = 1 << 17
+""" how many keys to keep, enough for the files of a few large directories """
+
+@functools.lru_cache(maxsize = natural_keys_cache_size)
+def natural_key_get(s: str) -> NaturalKey:
+    """
+    case-insensitive key to sort strings with numbers in numerical order, e.g. "v2" before "v10".
+    numbers are encoded as their count of significant digits as a character followed
+    by the digits, so they compare numerically without converting long runs of digits
+    """
+    chunks = _digits_split(s.casefold())
+    for idx in range(1, len(chunks), 2):
+        digits = chunks[idx].lstrip("0")
+        chunks[idx] = chr(len(digits)) + digits
+    return tuple(chunks)
@@ -107,6 +107,13 @@ class AddonSetup:
             return func
         return append
 
+    # functions to release what the add-on holds outside of Blender, e.g. threads and files
+    unregister_hooks_defs: list[Callable[[], None]] = field(default_factory = list)
+    def unregister_hook(self, func: Callable[[], None]):
+        """ append *func* to the functions to call on unregistration """
+        self.unregister_hooks_defs.append(func)
+        return func
+
     def register(self,
             should_force_append_handlers = False,
             should_overwrite_attrs = False,
@@ -176,6 +183,12 @@ class AddonSetup:
             except:
                 pass  # ¯\_(ツ)_/¯
             logger.debug(f"unregistered timer: {f}")
+        for f in reversed(self.unregister_hooks_defs):
+            try:
+                f()
+                logger.debug(f"called unregister hook: {f}")
+            except Exception as exc:
+                logger.error(f"unregister hook failed: {f}", exc_info = exc)
         logger.debug("unregistration finished")
 
     def registry_get(self):
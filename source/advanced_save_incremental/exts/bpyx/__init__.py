@@ -21,6 +21,7 @@ from types import ModuleType
 
 import bpy
 
+from . import diff
 from .AddonSetup import addon_setup
 from .AddonPreferences import AddonPreferences
 from .types import PropCollection
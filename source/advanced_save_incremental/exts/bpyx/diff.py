@@ -0,0 +1,69 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+""" updating Blender collection properties in place from `stdx.diffx` differences """
+
+from collections import Counter
+from collections.abc import Callable
+from typing import Any
+from typing import TypeVar
+
+import bpy
+
+from ..stdx.diffx import ItemsDiff
+from .types import PropCollection
+
+_T = TypeVar("_T")
+
+rna_writes_counter: Counter[str] = Counter()
+""" RNA writes made by the updates so far per update name, for profiling """
+
+def prop_set_if_changed(struct: bpy.types.bpy_struct, key: str, value: Any) -> int:
+    """ set the property only if the value differs, returns the number of writes """
+    if getattr(struct, key) == value:
+        return 0
+    setattr(struct, key, value)
+    return 1
+
+def collection_diff_apply(
+        collection: PropCollection,
+        diff: ItemsDiff[_T],
+        item_set: Callable[[Any, _T], int],
+        active_owner: bpy.types.bpy_struct | None = None,
+        active_key: str | None = None,
+) -> int:
+    """
+    apply the difference to the collection, `item_set` sets an item and returns its writes count.
+    the active index property of the owner, if given, keeps pointing to the same item,
+    or to none if it was removed. returns the number of writes
+    """
+    writes = 0
+    active_idx = getattr(active_owner, active_key) if active_owner is not None else -1
+    active_idx_new = active_idx
+    for idx in diff.removed:
+        collection.remove(idx)
+        writes += 1
+        if idx < active_idx_new:
+            active_idx_new -= 1
+        elif idx == active_idx_new:
+            active_idx_new = -1
+    for idx, item in diff.updated:
+        writes += item_set(collection[idx], item)
+    for item in diff.added:
+        writes += 1 + item_set(collection.add(), item)
+    if active_owner is not None and active_idx_new != active_idx:
+        setattr(active_owner, active_key, active_idx_new)
+        writes += 1
+    return writes
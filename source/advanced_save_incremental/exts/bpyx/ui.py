@@ -35,3 +35,10 @@ def draw_op_preferences_addon_show(layout: Layout, module: str, **kwargs):
     kwargs.setdefault("icon", 'PREFERENCES')
     op = layout.operator("preferences.addon_show", **kwargs)
     op["module"] = module
+
+def areas_tag_redraw(area_type: str):
+    """ redraw all areas of the type in all windows, e.g. after data changed outside of the UI """
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == area_type:
+                area.tag_redraw()
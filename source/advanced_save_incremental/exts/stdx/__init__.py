@@ -17,7 +17,10 @@
 miscellaneous reusable Python code not depending on a non-standard library
 """
 
+from . import diffx
 from . import importlibx
+from . import iox
+from . import tomlx
 from .enumeratex import enumeratex
 from .dataclassesx import DataclassFromDictMixIn
 from .SafeCallMixIn import SafeCallMixIn
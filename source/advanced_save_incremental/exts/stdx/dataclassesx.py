@@ -13,33 +13,62 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import functools
+from collections.abc import Callable
+from collections.abc import Iterable
 from typing import get_args
 from typing import get_origin
 from types import UnionType
-from dataclasses import dataclass
 from dataclasses import fields
 
-@dataclass
+def _field_decoder_get(t) -> Callable | None:
+    """ `from_dict` of the dataclass in the field type or its union, `None` to take the value as is """
+    for t in (get_args(t) if get_origin(t) is UnionType else (t,)):
+        if isinstance(t, type) and issubclass(t, DataclassFromDictMixIn):
+            return t.from_dict
+    return None
+
+@functools.cache
+def from_dict_plan_get(cls: type) -> tuple[tuple[str, ...], tuple[tuple[str, Callable], ...]]:
+    """
+    how to decode a dict into the dataclass, computed once per class:
+    names of the fields taken as they are and names of nested dataclass fields with their decoders
+    """
+    names = []
+    nested = []
+    for f in fields(cls):
+        decoder = _field_decoder_get(f.type)
+        if decoder is None:
+            names.append(f.name)
+        else:
+            nested.append((f.name, decoder))
+    return tuple(names), tuple(nested)
+
 class DataclassFromDictMixIn:
+    """
+    mix-in for dataclasses to build an instance from a dict with nested dataclasses.
+    not a dataclass itself, so it can be mixed into both frozen and regular dataclasses.
+    """
+    __slots__ = ()
     def __init__(self, **kwargs):
         pass
     @classmethod
-    def from_dict(cls, d: dict | None):
+    def _from_dict_with_plan(cls, d: dict | None, plan: tuple[tuple[str, ...], tuple[tuple[str, Callable], ...]]):
+        """ `from_dict` with the plan from `from_dict_plan_get` """
         if d is None:
             return cls()
-        else:
-            args = {}
-            for f in fields(cls):
-                if f.name in d:
-                    if get_origin(f.type) is UnionType:
-                        for t in get_args(f.type):
-                            if issubclass(t, DataclassFromDictMixIn):
-                                args[f.name] = t.from_dict(d[f.name])
-                                break
-                        else:
-                            args[f.name] = d[f.name]
-                    elif issubclass(f.type, DataclassFromDictMixIn):
-                        args[f.name] = f.type.from_dict(d[f.name])
-                    else:
-                        args[f.name] = d[f.name]
-            return cls(**args)
+        names, nested = plan
+        args = {name: d[name] for name in names if name in d}
+        for name, decoder in nested:
+            if name in d:
+                args[name] = decoder(d[name])
+        return cls(**args)
+    @classmethod
+    def from_dict(cls, d: dict | None):
+        return cls._from_dict_with_plan(d, from_dict_plan_get(cls))
+    @classmethod
+    def from_dicts(cls, ds: Iterable[dict | None]) -> list:
+        """ `from_dict` of many dicts with the decoding plan looked up once """
+        plan = from_dict_plan_get(cls)
+        from_dict_with_plan = cls._from_dict_with_plan
+        return [from_dict_with_plan(d, plan) for d in ds]
@@ -0,0 +1,79 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+differences between an old and a new list of items, to update the old one in place
+with as few changes as possible
+"""
+
+from collections.abc import Callable
+from collections.abc import Hashable
+from collections.abc import Iterable
+from collections.abc import Sequence
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Generic
+from typing import TypeVar
+
+T = TypeVar('T')
+
+@dataclass(slots = True)
+class ItemsDiff(Generic[T]):
+    """
+    apply in the order of the fields: remove the items at the old indices, which are descending
+    so they can be removed one by one, then update the items at the indices in the list
+    left after the removals, then append the added items
+    """
+    removed: list[int] = field(default_factory = list)
+    updated: list[tuple[int, T]] = field(default_factory = list)
+    added: list[T] = field(default_factory = list)
+    #
+    def __bool__(self) -> bool:
+        return bool(self.removed or self.updated or self.added)
+
+def items_diff(
+        old: Iterable[T],
+        new: Iterable[T],
+        key: Callable[[T], Hashable] = lambda e: e,
+) -> ItemsDiff[T]:
+    """
+    match the items by their keys. the kept items keep their order, the new ones
+    are appended in their order. of the items with the same key only the first is kept
+    """
+    new_by_key = {}
+    for e in new:
+        new_by_key.setdefault(key(e), e)
+    diff = ItemsDiff()
+    keys_kept = set()
+    for idx, e in enumerate(old):
+        k = key(e)
+        if k in new_by_key and k not in keys_kept:
+            e_new = new_by_key[k]
+            if e_new != e:
+                diff.updated.append((len(keys_kept), e_new))
+            keys_kept.add(k)
+        else:
+            diff.removed.append(idx)
+    diff.removed.reverse()
+    diff.added = [e for k, e in new_by_key.items() if k not in keys_kept]
+    return diff
+
+def items_diff_positional(old: Sequence[T], new: Sequence[T]) -> ItemsDiff[T]:
+    """ match the items by their indices """
+    return ItemsDiff(
+        removed = list(range(len(old) - 1, len(new) - 1, -1)),
+        updated = [(idx, e_new) for idx, (e, e_new) in enumerate(zip(old, new)) if e_new != e],
+        added = list(new[len(old):]),
+    )
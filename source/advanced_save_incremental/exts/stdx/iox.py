@@ -0,0 +1,46 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from os import PathLike
+from pathlib import Path
+from typing import IO
+
+@contextmanager
+def open_atomic(
+        file_path: str | PathLike,
+        binary: bool = False,
+        buffering: int = 1 << 16,
+) -> Iterator[IO]:
+    """
+    a handle to a temporary file next to the path, UTF-8 text unless binary, renamed to the path
+    when the block succeeds and removed otherwise, so the path never has a partially written file
+    """
+    file_path = Path(file_path)
+    temp_path = file_path.with_name(f".{file_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        if binary:
+            file = open(temp_path, "xb", buffering = buffering)
+        else:
+            file = open(temp_path, "x", encoding = "utf-8", newline = "\n", buffering = buffering)
+        with file:
+            yield file
+        os.replace(temp_path, file_path)
+    except BaseException:
+        temp_path.unlink(missing_ok = True)
+        raise
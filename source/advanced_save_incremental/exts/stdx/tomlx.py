@@ -0,0 +1,88 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+streaming TOML writer for arrays of tables of simple values, the counterpart of `tomllib`
+"""
+
+from collections.abc import Iterable
+from os import PathLike
+from typing import Any
+from typing import TextIO
+
+from .iox import open_atomic
+
+TomlItems = Iterable[tuple[str, Any]]
+""" key and value pairs of a table. keys are written as they are, so they can be dotted """
+
+_str_escapes = {
+    '"': '\\"',
+    '\\': '\\\\',
+    '\b': '\\b',
+    '\t': '\\t',
+    '\n': '\\n',
+    '\f': '\\f',
+    '\r': '\\r',
+}
+_str_translation = str.maketrans({
+    **{chr(c): f"\\u{c:04X}" for c in [*range(0x20), 0x7F]},
+    **_str_escapes,
+})
+
+def str_dump(s: str) -> str:
+    """ basic string with quotes, backslashes and control characters escaped """
+    if not s.isprintable():
+        s = s.translate(_str_translation)
+    elif '"' in s or "\\" in s:
+        # cheaper than the translation when there are no control characters
+        s = s.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{s}"'
+
+_value_dumps = {
+    str: str_dump,
+    bool: lambda value: "true" if value else "false",
+    int: repr,
+    float: repr,
+}
+
+def value_dump(value: Any) -> str:
+    dump = _value_dumps.get(type(value))
+    if dump is None:
+        raise TypeError(f"unsupported TOML value type: {type(value).__name__}")
+    return dump(value)
+
+def items_dumps(items: TomlItems) -> str:
+    lines = []
+    for key, value in items:
+        # the common values without escaping or the types lookup, the others as `value_dump`
+        cls = value.__class__
+        if cls is str and value.isprintable() and '"' not in value and "\\" not in value:
+            lines.append(f'{key} = "{value}"')
+        elif cls is int:
+            lines.append(f"{key} = {value}")
+        else:
+            lines.append(f"{key} = {value_dump(value)}")
+    return "\n".join(lines)
+
+def tables_array_write(file: TextIO, name: str, tables: Iterable[TomlItems]):
+    """ write an array of tables, one `[[name]]` header per table """
+    header = f"[[{name}]]\n"
+    for items in tables:
+        file.write(f"{header}{items_dumps(items)}\n\n")
+
+def tables_array_dump(file_path: str | PathLike, name: str, tables: Iterable[TomlItems]):
+    """ `tables_array_write` to a file atomically, see `open_atomic` """
+    with open_atomic(file_path) as file:
+        tables_array_write(file, name, tables)
@@ -13,11 +13,13 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import sqlite3
 from pathlib import Path
 
 import bpy
 
 from .. import bpyx
+from .. import core
 from ..prefs import config
 from ..props.FileSaveOperatorProps import FileSaveOperatorProps
 from ..props.Props import logger
@@ -58,12 +60,24 @@ class FileSaveOperator(BasePathOperator):
                     filepath = str(self.path),
                     copy = self.save_copy,
                 )
+                # saved already, unlike with the dialog, indexed before the refresh reads the index
+                self.files_index_update()
             # trigger update (via save_pre handler) to refresh file openers
             bpy.ops.wm.save_mainfile()
         except Exception as exc:
             self.report_exception_current(f"{repr(self.path)}")
             logger.error(f"could not save {self.path}\n", exc_info = exc)
         return {'FINISHED'}
+    def files_index_update(self):
+        """ index the saved file, so the directory is not listed again for it """
+        # opened by the scanner, not on the UI thread
+        files_index = core.files_indices.get(self.path.parent, should_open = False)
+        if files_index is None:
+            return
+        try:
+            files_index.names_update([self.path.name])
+        except sqlite3.Error as exc:
+            logger.warning(f"could not index {self.path}: {exc}")
     #
     @classmethod
     def description(cls, context, properties):
@@ -0,0 +1,37 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import bpy
+
+from ..exts import bpyx
+from ..prefs import config
+from ..props.Props import props_templates_get_or_crt
+from .TemplatesBaseOperator import TemplatesBaseOperator
+
+@bpyx.addon_setup.registree
+class FilesPageOperator(TemplatesBaseOperator):
+    bl_idname = f"{config.addon_key}.files_page"
+    bl_label = "Page"
+    bl_description = "Show the previous or the next page of the files openers"
+    index_key = "index"
+    index: bpy.props.IntProperty(name = "Index", description = "Index of the template")
+    delta_key = "delta"
+    delta: bpy.props.IntProperty(name = "Delta",
+        description = "How many pages to go forward or back")
+    def execute(self, context):
+        template = props_templates_get_or_crt()[self.index]
+        # the files of the page are updated by the property update
+        template.files_page = max(0, min(template.files_page + self.delta, template.files_pages_count_get() - 1))
+        return {'FINISHED'}
@@ -19,6 +19,12 @@ from pathlib import Path
 import bpy.types
 
 from .. import bpyx
+from ..exts import stdx
+from ..core.persistence import library_paths_get
+from ..core.persistence import library_suffix
+from ..core.persistence import templates_dicts_load
+from ..core.persistence import templates_dicts_load_dir
+from ..prefs import config
 from ..props.Props import props_templates_get_or_crt
 from .TemplatesBaseOperator import TemplatesBaseOperator
 
@@ -42,28 +48,55 @@ class TemplatesImportOperator(TemplatesPersistenceOperator):
     bl_label = "Import Templates"
     bl_description = "Import templates from TOML file"
     ui_icon = 'IMPORT'
+    def templates_dicts_load(self, cache_dir: str) -> list[dict] | None:
+        templates_dicts = templates_dicts_load(Path(bpy.path.abspath(self.filepath)), cache_dir)
+        if not templates_dicts:
+            self.report_info("TOML file is empty, nothing to import")
+        return templates_dicts
     def execute(self, context: bpy.types.Context):
         try:
-            with open(Path(bpy.path.abspath(self.filepath)), "rb") as file:
-                try:
-                    templates_dicts = tomllib.load(file).get("templates")
-                except tomllib.TOMLDecodeError as exc:
-                    self.report_error(f"TOML decoding error: {exc}")
-                    return {'CANCELLED'}
+            cache_dir = bpy.utils.extension_path_user(config.addon_package, path = "cache", create = True)
+            try:
+                templates_dicts = self.templates_dicts_load(cache_dir)
+            except tomllib.TOMLDecodeError as exc:
+                self.report_error(f"TOML decoding error: {exc}")
+                return {'CANCELLED'}
             if not templates_dicts:
-                self.report_info("TOML file is empty, nothing to import")
                 return {'CANCELLED'}
             templates = props_templates_get_or_crt()
             for template_dict in templates_dicts:
                 template = templates.add()
                 template.from_dict(template_dict)
         except OSError as exc:
-            self.report_invalid_input(f"Could not save the file due to an OS error: {exc}")
+            self.report_invalid_input(f"Could not read due to an OS error: {exc}")
+            return {'CANCELLED'}
         except Exception as exc:
             self.report_exception_current(f'"{self.filepath}" {self.format}')
             return {'CANCELLED'}
         return {'FINISHED'}
 
+@bpyx.addon_setup.registree
+class TemplatesImportDirectoryOperator(TemplatesImportOperator):
+    bl_idname = f"{TemplatesPersistenceOperator.idname}_import_directory"
+    bl_label = "Import Templates Directory"
+    bl_description = "Import templates from all TOML files in a directory"
+    ui_icon = 'FILE_FOLDER'
+    directory: bpy.props.StringProperty(subtype = 'DIR_PATH')
+    filter_folder: bpy.props.BoolProperty(default = True, options = {'HIDDEN'})
+    def invoke(self, context: bpy.types.Context, event: bpy.types.Event):
+        # a directory is chosen, without a file name
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+    def templates_dicts_load(self, cache_dir: str) -> list[dict] | None:
+        directory_path = Path(bpy.path.abspath(self.directory))
+        if not library_paths_get(directory_path):
+            self.report_info(f"No {library_suffix} files in directory, nothing to import")
+            return None
+        templates_dicts = templates_dicts_load_dir(directory_path, cache_dir)
+        if not templates_dicts:
+            self.report_info(f"{library_suffix} files in directory are empty, nothing to import")
+        return templates_dicts
+
 @bpyx.addon_setup.registree
 class TemplatesExportOperator(TemplatesPersistenceOperator):
     bl_idname = f"{TemplatesPersistenceOperator.idname}_export"
@@ -73,9 +106,8 @@ class TemplatesExportOperator(TemplatesPersistenceOperator):
     def execute(self, context: bpy.types.Context):
         try:
             templates = props_templates_get_or_crt()
-            with open(Path(bpy.path.abspath(self.filepath)), "w") as file:
-                for template in templates:
-                    file.write(f"[[templates]]\n{template.to_toml()}\n\n")
+            stdx.tomlx.tables_array_dump(Path(bpy.path.abspath(self.filepath)), "templates",
+                (template.to_toml_items() for template in templates))
         except Exception as exc:
             self.report_exception_current(f'"{self.filepath}" {self.format}')
             return {'CANCELLED'}
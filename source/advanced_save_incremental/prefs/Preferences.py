@@ -46,6 +46,19 @@ class Preferences(stdx.SafeCallMixIn, bpyx.AddonPreferences):
     def should_load_all_files_get(self) -> bool:
         return self.should_load_all_files
     #
+    should_index_files_key = "should_index_files"
+    should_index_files_def = bpy.props.BoolProperty(
+        name = "Index Files",
+        default = True,
+        description = (
+            "Keep the files and their versions of the templates directories in a database "
+            "in the add-on cache, to show them without listing the directories again. "
+            "Helps with slow directories, like the ones on network drives"),
+    )
+    should_index_files: should_index_files_def
+    def should_index_files_get(self) -> bool:
+        return self.should_index_files
+    #
     file_list_rows_min_key = "file_list_rows_min"
     file_list_rows_min_def = bpy.props.IntProperty(
         name = "Min Rows",
@@ -69,6 +82,30 @@ class Preferences(stdx.SafeCallMixIn, bpyx.AddonPreferences):
     def file_list_rows_max_get(self) -> int:
         return self.file_list_rows_max
     #
+    file_list_page_size_key = "file_list_page_size"
+    file_list_page_size_def = bpy.props.IntProperty(
+        name = "Page Size",
+        default = 100,
+        min = 10, max = 10000,
+        description = "Number of files per page of the files openers shown in pages",
+    )
+    file_list_page_size: file_list_page_size_def
+    def file_list_page_size_get(self) -> int:
+        return self.file_list_page_size
+    #
+    file_list_paged_threshold_key = "file_list_paged_threshold"
+    file_list_paged_threshold_def = bpy.props.IntProperty(
+        name = "Pages Above",
+        default = 1000,
+        min = 0,
+        description = (
+            "Show the files openers in pages, newest first, when a template has more files than this. "
+            "Zero to always show pages"),
+    )
+    file_list_paged_threshold: file_list_paged_threshold_def
+    def file_list_paged_threshold_get(self) -> int:
+        return self.file_list_paged_threshold
+    #
     file_items_emboss_key = "file_items_emboss"
     file_items_emboss_def = bpy.props.BoolProperty(
         name = "Display Files as Buttons",
@@ -113,8 +150,11 @@ class Preferences(stdx.SafeCallMixIn, bpyx.AddonPreferences):
         col_files.prop(self, Preferences.should_show_file_openers_key)
         if self.should_show_file_openers_get():
             col_files.prop(self, Preferences.should_load_all_files_key)
+            col_files.prop(self, Preferences.should_index_files_key)
             col_files.prop(self, Preferences.file_list_rows_min_key)
             col_files.prop(self, Preferences.file_list_rows_max_key)
+            col_files.prop(self, Preferences.file_list_paged_threshold_key)
+            col_files.prop(self, Preferences.file_list_page_size_key)
             col_files.prop(self, Preferences.file_items_emboss_key)
         layout.prop(self, Preferences.text_name_key)
         layout.prop(self, Preferences.should_show_intro_buttons_key)
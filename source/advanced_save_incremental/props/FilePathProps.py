@@ -13,6 +13,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import os
 from pathlib import Path
 
 import bpy
@@ -34,3 +35,8 @@ class FilePathProps(bpy.types.PropertyGroup):
     def set(self, path: Path):
         self.path = str(path)
         self.stem = path.stem
+    def path_set(self, path: str) -> int:
+        """ `set` without building a `Path`, writes only changed properties and returns their count """
+        stem = os.path.splitext(os.path.basename(path))[0]
+        return (bpyx.diff.prop_set_if_changed(self, FilePathProps.path_key, path)
+            + bpyx.diff.prop_set_if_changed(self, FilePathProps.stem_key, stem))
@@ -43,6 +43,9 @@ class FileSaveOperatorProps(bpy.types.PropertyGroup):
     def label_get(self) -> str:
         return self.label
     #
-    def from_core(self, v: FileSaveData):
-        self.file_name_set(v.file_name)
-        self.label_set(v.label)
+    def from_core(self, v: FileSaveData) -> int:
+        """ writes only changed properties and returns their count """
+        return (bpyx.diff.prop_set_if_changed(self, FileSaveOperatorProps.filename_key, v.file_name)
+            + bpyx.diff.prop_set_if_changed(self, FileSaveOperatorProps.label_key, v.label))
+    def to_core(self) -> FileSaveData:
+        return FileSaveData(label = self.label_get(), file_name = self.file_name_get())
@@ -14,6 +14,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import logging
+from string import digits
 
 import bpy
 
@@ -23,6 +24,7 @@ from .. import core
 from ..prefs.Preferences import Preferences
 from .info import info_code_get
 from .TemplateProps import TemplateProps
+from . import watching  # registers the templates directories watching timer
 
 logger = logging.getLogger(__name__)
 
@@ -55,12 +57,13 @@ class Props(bpy.types.PropertyGroup):
     #
     version_separator_key = "version_separator"
     def version_separator_set(self, value):
-        if value: self[Props.version_separator_key] = value
+        if value and all(d not in value for d in digits):
+            self[Props.version_separator_key] = value
     def version_separator_get(self) -> str:
         return self.get(Props.version_separator_key, ".")
     version_separator_def = bpy.props.StringProperty(
         name = "Version Separator",
-        description = "Version elements separator. Cannot be empty",
+        description = "Version elements separator. Cannot be empty or contain digits",
         set = version_separator_set,
         get = version_separator_get,
         update = _update,
@@ -13,15 +13,28 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import hashlib
+import logging
+import os
+from typing import Any
+
 import bpy
 
 from .. import bpyx
+from .. import config
 from .. import core
+from ..exts import stdx
 from ..prefs.Preferences import Preferences
 from .FilePathProps import FilePathProps
 from .FileSaveOperatorProps import FileSaveOperatorProps
+from .scanning import directories_scanner
+from .scanning import directory_realpath_get
+from .scanning import files_indices_update
+from .scanning import files_pages_get
 from .VersionTemplateProps import VersionTemplateProps
 
+logger = logging.getLogger(__name__)
+
 @bpyx.addon_setup.registree
 class TemplateProps(bpy.types.PropertyGroup):
     #
@@ -36,6 +49,30 @@ class TemplateProps(bpy.types.PropertyGroup):
         root = main.root_get()
         version_parts = main.version_parts_get()
         self.saves_datas_update(root, version_parts)
+    def files_scan_update(self, value = None):
+        if type(self) != TemplateProps:
+            return
+        # import here to prevent circular dependencies
+        from .Props import props_get
+        main = props_get()
+        if main is None:
+            return
+        self.files_update(main.root_get())
+    def files_paging_update(self, value = None):
+        if type(self) != TemplateProps:
+            return
+        # import here to prevent circular dependencies
+        from .Props import props_get
+        main = props_get()
+        if main is None:
+            return
+        self.files_page_update(main.root_get())
+    def files_filter_update(self, value = None):
+        if type(self) != TemplateProps:
+            return
+        # the first page of the newly filtered files, updated by the page property if it changes
+        if not bpyx.diff.prop_set_if_changed(self, TemplateProps.files_page_key, 0):
+            self.files_paging_update()
     #
     dirpath_key = "dirpath"
     dirpath_def = bpy.props.StringProperty(
@@ -142,15 +179,55 @@ class TemplateProps(bpy.types.PropertyGroup):
     def saves_datas_get(self) -> bpyx.PropCollection[FileSaveOperatorProps]:
         return self.saves_data
     def saves_datas_update(self, root: str, version_parts: core.VersionParts):
-        datas = self.saves_datas_get()
-        datas.clear()
         phrase = (("Overwrite" if self.save_overwrite_get() else "Save") +
                   (" Copy" if self.save_copy_get() else ""))
-        for core_save_data in core.build.files_save_datas_gen(
-                template = self.core_get(),
-                version_parts = version_parts,
-                root = root, phrase = phrase):
-            datas.add().from_core(core_save_data)
+        template = self.core_get()
+        # offer only versions not taken in the directory yet, as found by the last files update.
+        # the index is opened and its versions read by the scanner, only its cached versions are used here
+        directory_versions = None
+        if (files_index := core.files_indices.get(self.directory_realpath_get(), should_open = False)) is not None:
+            directory_versions = files_index.directory_versions_cached_get(template)
+        if directory_versions is None:
+            directory_versions = core.directory_versions_get(template, frozenset(
+                e for e in self.files_pages_get().file_paths if not os.path.dirname(e)))
+        version_index = directory_versions.index_get(root)
+        version_keys = tuple(version_index.keys) if version_index is not None else ()
+        inputs = (template, tuple(version_parts), root, phrase, version_keys)
+        # skip rewriting the collection if it was built from the same inputs.
+        # saved in the blend-file, so not with `hash` which differs between Python processes
+        fingerprint = hashlib.blake2b(repr(inputs).encode(), digest_size = 16).hexdigest()
+        if fingerprint == self.saves_datas_fingerprint_get():
+            return
+        datas = self.saves_datas_get()
+        diff = stdx.diffx.items_diff_positional(
+            [e.to_core() for e in datas], core.files_save_datas_get(*inputs))
+        writes = bpyx.diff.collection_diff_apply(datas, diff, FileSaveOperatorProps.from_core)
+        bpyx.diff.rna_writes_counter["saves_datas"] += writes
+        if config.log: logger.debug(f"{self.name!r} save buttons updated with {writes} RNA writes")
+        if version_index is not None and not version_index.is_latest(version_parts):
+            version_latest_str = core.template_builder_get(template).version_str_get(
+                version_index.latest_get())
+        else:
+            version_latest_str = ""
+        if self.version_latest_str != version_latest_str:
+            self.version_latest_str = version_latest_str
+        self.saves_datas_fingerprint = fingerprint
+    #
+    saves_datas_fingerprint_key = "saves_datas_fingerprint"
+    saves_datas_fingerprint: bpy.props.StringProperty(
+        name = "Save Operators Data Fingerprint",
+        description = "Hash of the inputs the save operators data was built from (computed value)",
+    )
+    def saves_datas_fingerprint_get(self) -> str:
+        return self.saves_datas_fingerprint
+    #
+    version_latest_str_key = "version_latest_str"
+    version_latest_str: bpy.props.StringProperty(
+        name = "Latest Version",
+        description = "The latest version in the directory if it is newer than the current one (computed value)",
+    )
+    def version_latest_str_get(self) -> str:
+        return self.version_latest_str
     #
     # files openers
     files_key = "files"
@@ -167,6 +244,68 @@ class TemplateProps(bpy.types.PropertyGroup):
         name = "Active File Index",
     )
     #
+    files_recursive_key = "files_recursive"
+    files_recursive_def = bpy.props.BoolProperty(
+        name = "Recursive",
+        default = False,
+        description = "Find files in subdirectories too",
+        update = files_scan_update,
+    )
+    files_recursive: files_recursive_def
+    #
+    files_depth_max_key = "files_depth_max"
+    files_depth_max_def = bpy.props.IntProperty(
+        name = "Depth",
+        default = 3,
+        min = 1, max = 32,
+        description = "How many levels of subdirectories to search",
+        update = files_scan_update,
+    )
+    files_depth_max: files_depth_max_def
+    #
+    files_exclude_key = "files_exclude"
+    files_exclude_def = bpy.props.StringProperty(
+        name = "Exclude",
+        default = ".*, *cache*, *render*",
+        description = "Comma-separated patterns of subdirectories names to skip, e.g. \"*cache*, render*\"",
+        update = files_scan_update,
+    )
+    files_exclude: files_exclude_def
+    def files_excludes_get(self) -> tuple[str, ...]:
+        return tuple(e for e in (e.strip() for e in self.files_exclude.split(",")) if e)
+    #
+    files_page_key = "files_page"
+    files_page: bpy.props.IntProperty(
+        name = "Page",
+        min = 0,
+        description = "Page of the files openers shown, the first one has the newest files",
+        update = files_paging_update,
+    )
+    #
+    files_filter_key = "files_filter"
+    files_filter: bpy.props.StringProperty(
+        name = "Filter",
+        description = "Show only the files with names containing this, in any case",
+        options = {'TEXTEDIT_UPDATE'},
+        update = files_filter_update,
+    )
+    #
+    files_pages_count_key = "files_pages_count"
+    files_pages_count: bpy.props.IntProperty(
+        name = "Pages",
+        description = "Number of pages of the files openers, zero if all the files are shown (computed value)",
+    )
+    def files_pages_count_get(self) -> int:
+        return self.files_pages_count
+    #
+    files_count_key = "files_count"
+    files_count: bpy.props.IntProperty(
+        name = "Files Count",
+        description = "Number of the files of the pages of the files openers (computed value)",
+    )
+    def files_count_get(self) -> int:
+        return self.files_count
+    #
     ui_opened_key = "ui_opened"
     ui_opened: bpy.props.BoolProperty(
         name = "Open Template",
@@ -179,22 +318,28 @@ class TemplateProps(bpy.types.PropertyGroup):
         default = False,
     )
     #
-    def to_toml(self) -> str:
-        lines = [f'name = "{self.name}"'] if self.name else []
-        lines.append(f'{self.dirpath_key} = "{self.dirpath}"')
+    def to_toml_items(self) -> list[tuple[str, Any]]:
+        items = [("name", self.name)] if self.name else []
+        items.append((self.dirpath_key, self.dirpath))
         if self.prefix_use:
-            lines.append(f'{self.prefix_key} = "{self.prefix}"')
+            items.append((self.prefix_key, self.prefix))
         if self.suffix_use:
-            lines.append(f'{self.suffix_key} = "{self.suffix}"')
+            items.append((self.suffix_key, self.suffix))
         if self.version_use:
-            lines.append(self.version_get().to_toml())
-        def bool_str(b: bool):
-            return "true" if b else "false"
-        lines += [
-            f'{self.save_copy_key} = {bool_str(self.save_copy)}',
-            f'{self.save_overwrite_key} = {bool_str(self.save_overwrite)}',
+            items += self.version_get().to_toml_items()
+        if self.files_recursive:
+            items += [
+                (self.files_recursive_key, self.files_recursive),
+                (self.files_depth_max_key, self.files_depth_max),
+                (self.files_exclude_key, self.files_exclude),
+            ]
+        items += [
+            (self.save_copy_key, self.save_copy),
+            (self.save_overwrite_key, self.save_overwrite),
         ]
-        return '\n'.join(lines)
+        return items
+    def to_toml(self) -> str:
+        return stdx.tomlx.items_dumps(self.to_toml_items())
     #
     def from_dict(self, d: dict):
         if d is not None:
@@ -218,21 +363,68 @@ class TemplateProps(bpy.types.PropertyGroup):
                 self.save_copy = v
             if (v := d.get(self.save_overwrite_key)) is not None:
                 self.save_overwrite = v
+            self.files_recursive = d.get(self.files_recursive_key, False)
+            if (v := d.get(self.files_depth_max_key)) is not None:
+                self.files_depth_max = v
+            if (v := d.get(self.files_exclude_key)) is not None:
+                self.files_exclude = v
         return self
     #
+    def directory_realpath_get(self) -> str:
+        """ the resolved directory path, cached, see `scanning.directory_realpath_get` """
+        return directory_realpath_get(self.dirpath)
+    def files_scan_key_get(self) -> core.ScanKey:
+        directory_path = self.directory_realpath_get()
+        if self.files_recursive:
+            return directory_path, self.files_depth_max, self.files_excludes_get()
+        else:
+            return directory_path, 0, ()
     def files_update(self, root: str):
-        directory_path = bpyx.path_abs_get(self.dirpath)
-        if directory_path.exists():
-            self.files_get().clear()
-        should_load_all = Preferences.instance_get().should_load_all_files_get()
-        if not should_load_all and root:
-            pattern = f"*{root}*.blend"
+        """ scan the directory in the background, see `files_page_update` """
+        files_indices_update()
+        directories_scanner.submit(*self.files_scan_key_get(), templates = [self.core_get()])
+    def files_scanning_get(self) -> bool:
+        """ whether the directory is being scanned in the background """
+        return directories_scanner.is_pending(self.files_scan_key_get())
+    def files_pages_get(self) -> core.FilesPages:
+        """ all the files found by the last scan of the directory, see `files_page_update` """
+        return files_pages_get(self.files_scan_key_get())
+    def files_page_update(self, root: str):
+        """
+        update the files with the ones found by the scans and the directory changes so far.
+        a directory with more files than the preferences threshold is shown a page at a time,
+        so the files collection and its UI list do not grow with the directory
+        """
+        preferences = Preferences.instance_get()
+        directory_path = str(bpyx.path_abs_get(self.dirpath))
+        # the root is matched literally, names with glob characters like "[" work
+        root_filter = root if not preferences.should_load_all_files_get() else ""
+        files_pages = self.files_pages_get()
+        is_paged = len(files_pages) > preferences.file_list_paged_threshold_get()
+        if is_paged:
+            page = files_pages.page_get(
+                self.files_page, preferences.file_list_page_size_get(), root_filter, self.files_filter)
+        else:
+            page = files_pages.page_get(0, max(1, len(files_pages)), root_filter)
+        paths = [os.path.join(directory_path, e) for e in page.file_paths]
+        files = self.files_get()
+        paths_old = [e.path_get() for e in files]
+        if is_paged:
+            # the pages are in their order, the UI list does not sort them
+            diff = stdx.diffx.items_diff_positional(paths_old, paths)
         else:
-            pattern = "*.blend"
-        other_files_paths = list(directory_path.glob(pattern))
-        for other_file_path in other_files_paths:
-            self.files_get().add().set(other_file_path)
+            # only the changed files are written, the others keep their order and selection
+            diff = stdx.diffx.items_diff(paths_old, paths)
+        writes = bpyx.diff.collection_diff_apply(files, diff, FilePathProps.path_set,
+            self, TemplateProps.files_active_index_key)
+        writes += bpyx.diff.prop_set_if_changed(self, TemplateProps.files_count_key, page.count)
+        writes += bpyx.diff.prop_set_if_changed(
+            self, TemplateProps.files_pages_count_key, page.pages_count if is_paged else 0)
+        if is_paged:
+            writes += bpyx.diff.prop_set_if_changed(self, TemplateProps.files_page_key, page.page)
+        bpyx.diff.rna_writes_counter["files"] += writes
+        if config.log: logger.debug(f"{self.name!r} files updated with {writes} RNA writes")
     #
     def update(self, root: str, version_parts: core.VersionParts):
-        self.saves_datas_update(root, version_parts)
         self.files_update(root)
+        self.saves_datas_update(root, version_parts)
@@ -14,11 +14,13 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from string import digits
+from typing import Any
 
 import bpy
 
 from .. import bpyx
 from .. import core
+from ..exts import stdx
 
 @bpyx.addon_setup.registree
 class VersionTemplateProps(bpy.types.PropertyGroup):
@@ -82,14 +84,14 @@ class VersionTemplateProps(bpy.types.PropertyGroup):
             width = self.width_get(),
         )
     #
-    def to_toml(self) -> str:
-        lines = [f'name = "{self.name}"'] if self.name else []
-        lines += [
-            f'version.{self.separator_key} = "{self.separator}"',
-            f'version.{self.count_key} = {self.count}',
-            f'version.{self.width_key} = {self.width}',
+    def to_toml_items(self) -> list[tuple[str, Any]]:
+        return [
+            (f'version.{self.separator_key}', self.separator),
+            (f'version.{self.count_key}', self.count),
+            (f'version.{self.width_key}', self.width),
         ]
-        return '\n'.join(lines)
+    def to_toml(self) -> str:
+        return stdx.tomlx.items_dumps(self.to_toml_items())
     #
     def from_dict(self, d: dict):
         if d is not None:
@@ -0,0 +1,135 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+""" templates directories listing in the background, off the UI thread """
+
+import functools
+import logging
+import os
+
+import bpy
+
+from .. import bpyx
+from .. import config
+from .. import core
+from ..prefs.Preferences import Preferences
+
+logger = logging.getLogger(__name__)
+
+directories_scanner = core.DirectoriesScanner()
+
+scans_directories: dict[core.ScanKey, list[str]] = {}
+""" subdirectories found so far by the scans streaming in batches """
+
+files_pages: dict[core.ScanKey, core.FilesPages] = {}
+""" all the files found per scan, the files openers of the templates show pages of them """
+
+trees_directories: dict[core.ScanKey, frozenset[str]] = {}
+""" subdirectories listed by the last complete recursive scans, see `watching` """
+
+def files_pages_get(key: core.ScanKey) -> core.FilesPages:
+    return files_pages.setdefault(key, core.FilesPages())
+
+@functools.lru_cache(maxsize = 256)
+def _directory_realpath_get(dirpath: str, blend_file_path: str) -> str:
+    return os.path.realpath(bpyx.path_abs_get(dirpath))
+
+def directory_realpath_get(dirpath: str) -> str:
+    """ the resolved absolute path of a templates directory, resolved again only if it or the blend-file path change """
+    return _directory_realpath_get(dirpath, bpy.data.filepath)
+
+def files_indices_update():
+    """ keep the directories files indices in the add-on cache if enabled in the preferences """
+    if Preferences.instance_get().should_index_files_get():
+        if core.files_indices.databases_path is None:
+            core.files_indices.databases_path_set(
+                bpy.utils.extension_path_user(config.addon_package, path = "cache", create = True))
+    else:
+        core.files_indices.databases_path_set(None)
+
+@bpyx.addon_setup.unregister_hook
+def scanning_shutdown():
+    """ stop the scans workers and release the files found and the files indices databases """
+    directories_scanner.shutdown(wait = False)
+    scans_directories.clear()
+    files_pages.clear()
+    trees_directories.clear()
+    _directory_realpath_get.cache_clear()
+    core.files_indices.databases_path_set(None)
+
+scans_apply_interval_busy = 0.1
+scans_apply_interval_idle = 0.5
+
+@bpyx.addon_setup.timer(persistent = True)
+def scans_apply() -> float:
+    """ apply the batches of finished scans to the files of the templates they were scanned for """
+    results = directories_scanner.results_pop()
+    keys_changed = {}
+    """ whether the scan is complete per scan with new files """
+    for key, batch in results:
+        # a directory which cannot be listed keeps its files as they were
+        if isinstance(batch, OSError):
+            scans_directories.pop(key, None)
+            continue
+        if batch.is_last and batch.pages is None:
+            # stopped before it completed, e.g. on unregister
+            scans_directories.pop(key, None)
+            continue
+        if batch.is_first:
+            scans_directories[key] = []
+        scans_directories.setdefault(key, []).extend(batch.directories)
+        if batch.is_last:
+            # the complete files sorted by the scanner, without the ones not found anymore
+            files_pages[key] = batch.pages
+            trees_directories[key] = frozenset(scans_directories.pop(key))
+            keys_changed[key] = True
+        else:
+            # partial scans only add files
+            files_pages_get(key).update(batch.files)
+            keys_changed.setdefault(key, False)
+    # versions indexed since the watched changes were applied, the save buttons were built without them
+    directories_indexed = directories_scanner.names_updated_pop()
+    if keys_changed or directories_indexed:
+        # import here to prevent circular dependencies
+        from .Props import props_get
+        props = props_get()
+        if props is not None:
+            root = props.root_get()
+            version_parts = props.version_parts_get()
+            templates_per_key = {}
+            for template in props.templates_get():
+                templates_per_key.setdefault(template.files_scan_key_get(), []).append(template)
+            for key, is_complete in keys_changed.items():
+                for template in templates_per_key.get(key, []):
+                    template.files_page_update(root)
+                    if is_complete:
+                        template.saves_datas_update(root, version_parts)
+            for template in props.templates_get():
+                if template.directory_realpath_get() in directories_indexed:
+                    template.saves_datas_update(root, version_parts)
+            # the files of directories not used by the templates anymore
+            keys_unused = files_pages.keys() - templates_per_key.keys() - scans_directories.keys()
+            for key in keys_unused:
+                del files_pages[key]
+                trees_directories.pop(key, None)
+            directories_scanner.trees_discard(keys_unused)
+            if config.log: logger.debug(f"applied scans: {len(keys_changed)}")
+    if results or directories_indexed:
+        # the files, the save buttons and the scanning state are shown in the file browser
+        bpyx.ui.areas_tag_redraw('FILE_BROWSER')
+    if directories_scanner.is_pending():
+        return scans_apply_interval_busy
+    else:
+        return scans_apply_interval_idle
@@ -0,0 +1,125 @@
+# Copyright (C) 2024 Danylo Dubinin
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+""" templates directories watching, to update the files openers when other programs or artists change them """
+
+import logging
+
+from .. import bpyx
+from .. import config
+from .. import core
+from .scanning import directories_scanner
+from .scanning import files_pages_get
+from .scanning import trees_directories
+
+logger = logging.getLogger(__name__)
+
+directory_watcher: core.DirectoryWatcher | None = None
+""" created on the first watch, closed on unregister """
+
+watch_events_apply_interval = 0.5
+
+def directory_watcher_get() -> core.DirectoryWatcher:
+    global directory_watcher
+    if directory_watcher is None:
+        directory_watcher = core.directory_watcher_get()
+    return directory_watcher
+
+@bpyx.addon_setup.unregister_hook
+def watching_close():
+    global directory_watcher
+    if directory_watcher is not None:
+        directory_watcher.close()
+        directory_watcher = None
+
+@bpyx.addon_setup.timer(persistent = True)
+def watch_events_apply() -> float:
+    """
+    watch the templates directories and the subdirectories of the recursive ones, and apply their changes
+    to the listings caches and the files. the directories are watched and read on a scanner worker
+    """
+    # import here to prevent circular dependencies
+    from .Props import props_get
+    props = props_get()
+    templates_per_directory = {}
+    templates_recursive_per_subdirectory = {}
+    if props is not None:
+        for template in props.templates_get():
+            templates_per_directory.setdefault(template.directory_realpath_get(), []).append(template)
+            if template.files_recursive:
+                for directory_path in trees_directories.get(template.files_scan_key_get(), ()):
+                    templates_recursive_per_subdirectory.setdefault(directory_path, []).append(template)
+    directories_scanner.watch_submit(directory_watcher_get(),
+        templates_per_directory.keys() | templates_recursive_per_subdirectory.keys())
+    events = directories_scanner.watch_events_pop()
+    if not events:
+        return watch_events_apply_interval
+    if config.log: logger.debug(f"directories events: {len(events)}")
+    core.listing_cache.events_apply(events)
+    directories_scanner.tree_cache.events_apply(events)
+    # the last change of a name wins, e.g. a file created and deleted meanwhile is deleted
+    files_present_per_directory: dict[str, dict[str, bool]] = {}
+    directories_rescan = set()
+    directories_subdirectories_changed = set()
+    files_index_names_per_directory: dict[str, set[str]] = {}
+    for event in events:
+        if event.kind != "rescan" and not event.is_directory:
+            files_index_names_per_directory.setdefault(event.directory, set()).add(event.name)
+        if event.kind == "rescan":
+            directories_rescan.add(event.directory)
+        elif event.is_directory:
+            directories_subdirectories_changed.add(event.directory)
+        elif core.blend_file_name_matches(event.name):
+            files_present_per_directory.setdefault(event.directory, {})[event.name] = event.kind == "created"
+    for directory_path, names in files_index_names_per_directory.items():
+        directories_scanner.names_submit(directory_path, names,
+            [e.core_get() for e in templates_per_directory.get(directory_path, ())])
+    if props is None:
+        return watch_events_apply_interval
+    root = props.root_get()
+    version_parts = props.version_parts_get()
+    templates_updated = set()
+    directories_changed = directories_rescan | directories_subdirectories_changed | files_present_per_directory.keys()
+    for directory_path in directories_changed:
+        for template in templates_recursive_per_subdirectory.get(directory_path, ()):
+            if template.as_pointer() not in templates_updated:
+                # listed again in the background, the unchanged subdirectories from the cache
+                template.files_update(root)
+                templates_updated.add(template.as_pointer())
+    for directory_path, templates in templates_per_directory.items():
+        files_present = files_present_per_directory.get(directory_path, {})
+        keys_updated = set()
+        for template in templates:
+            if template.as_pointer() in templates_updated:
+                continue
+            if directory_path in directories_rescan or (template.files_recursive and (
+                    files_present or directory_path in directories_subdirectories_changed)):
+                # listed again in the background, the unchanged subdirectories from the cache
+                template.files_update(root)
+            elif files_present and directories_scanner.is_pending(template.files_scan_key_get()):
+                # the pending scan listed the directory before the changes, its files replace the updated ones
+                template.files_update(root)
+            elif files_present:
+                # the files of the directory are shared by the templates with the same scan
+                key = template.files_scan_key_get()
+                if key not in keys_updated:
+                    files_pages_get(key).update(
+                        [name for name, is_present in files_present.items() if is_present],
+                        [name for name, is_present in files_present.items() if not is_present])
+                    keys_updated.add(key)
+                template.files_page_update(root)
+                template.saves_datas_update(root, version_parts)
+    bpyx.ui.areas_tag_redraw('FILE_BROWSER')
+    return watch_events_apply_interval
@@ -56,13 +56,16 @@ class ASI_UL_files(bpy.types.UIList):
             property_identifier: str,
     ):
         # https://github.com/blender/blender/blob/v4.2.1/scripts/startup/bl_ui/__init__.py#L205
+        if list_data.files_pages_count_get() > 0:
+            # a page of the files, filtered and sorted when it was made, see `TemplateProps.files_page_update`
+            return [], []
         items: Sequence[FilePathProps] = getattr(list_data, property_identifier)
         def sorting_key(p: tuple[int, FilePathProps]):
-            value = p[1].stem_get().lower()
+            value = p[1].stem_get()
             if self.use_filter_sort_alpha:
-                res = value
+                res = value.lower()
             else:
-                res = core.tokenize_words_and_numbers(value)
+                res = core.natural_key_get(value)
             return res
         sorting = sorted(enumerate(items), key = sorting_key)
         filter_neworder = [0] * len(sorting)
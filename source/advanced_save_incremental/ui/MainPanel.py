@@ -28,8 +28,10 @@ from ..props.TemplateProps import TemplateProps
 from ..props.VersionTemplateProps import VersionTemplateProps
 from ..ops.CreateOrUpdateOperator import CreateOrUpdateOperator
 from ..ops.FileSaveOperator import FileSaveOperator
+from ..ops.FilesPageOperator import FilesPageOperator
 from ..ops.TemplatesAddOperator import TemplatesAddOperator
 from ..ops.TemplateMoveOperator import TemplateMoveOperator
+from ..ops.TemplatesPersistenceOperator import TemplatesImportDirectoryOperator
 from ..ops.TemplatesPersistenceOperator import TemplatesImportOperator
 from ..ops.TemplatesPersistenceOperator import TemplatesExportOperator
 from ..ops.TemplatesRemoveAllOperator import TemplatesRemoveAllOperator
@@ -94,6 +96,27 @@ def draw_template_save_buttons(
         op.save_copy = template.save_copy
         op.save_overwrite = template.save_overwrite
 
+def draw_template_files_pages(
+        layout: bpy.types.UILayout,
+        template: TemplateProps,
+        template_idx: int,
+):
+    layout.prop(template, TemplateProps.files_filter_key, text = "", icon = 'VIEWZOOM')
+    pages_count = template.files_pages_count_get()
+    row = layout.row(align = True)
+    previous_row = row.row(align = True)
+    previous_row.enabled = template.files_page > 0
+    op: FilesPageOperator
+    op = FilesPageOperator.drawx(previous_row, icon = 'TRIA_LEFT', text = "")
+    op.index = template_idx
+    op.delta = -1
+    row.label(text = f"Page {template.files_page + 1} / {pages_count} ({template.files_count_get()} files)")
+    next_row = row.row(align = True)
+    next_row.enabled = template.files_page < pages_count - 1
+    op = FilesPageOperator.drawx(next_row, icon = 'TRIA_RIGHT', text = "")
+    op.index = template_idx
+    op.delta = 1
+
 def draw_template_files_list(
         layout: bpy.types.UILayout,
         template: TemplateProps,
@@ -110,7 +133,16 @@ def draw_template_files_list(
     data_update_row.alignment = 'RIGHT'
     data_update_row.label()  # please don't ask me why
     if template.ui_show_files:
+        if template.files_scanning_get():
+            data_update_row.label(text = "Scanning…")
         CreateOrUpdateOperator.drawx(data_update_row)
+        scan_row = layout.row(align = True)
+        scan_row.prop(template, TemplateProps.files_recursive_key, toggle = True)
+        if template.files_recursive:
+            scan_row.prop(template, TemplateProps.files_depth_max_key)
+            scan_row.prop(template, TemplateProps.files_exclude_key, text = "")
+        if template.files_pages_count_get() > 0:
+            draw_template_files_pages(layout, template, template_idx)
         list_row = layout.row()
         list_row.separator()  # just a small gap for aesthetics
         cls_name = ASI_UL_files.__name__
@@ -166,6 +198,8 @@ def draw_templates(
             draw_template_core(template_box, template)
         # save buttons
         draw_template_save_buttons(template_box, template)
+        if version_latest_str := template.version_latest_str_get():
+            template_box.label(text = f"Newer version exists: {version_latest_str}", icon = 'ERROR')
         # files openers
         if files_should_show:
             draw_template_files_list(template_box, template, template_idx,
@@ -223,6 +257,7 @@ class MainPanel(bpy.types.Panel, stdx.SafeCallMixIn):
         layout.separator(type = 'LINE')
         layout.prop(data, Props.ui_list_buttons_key)
         TemplatesImportOperator.drawx(layout)
+        TemplatesImportDirectoryOperator.drawx(layout)
         TemplatesExportOperator.drawx(layout)
         layout.separator(type = 'LINE')
         row = layout.row()
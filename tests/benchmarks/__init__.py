@@ -0,0 +1,7 @@
+"""
+benchmarks for the core logic. not collected by pytest, run them as modules, e.g.:
+
+.. code-block:: shell
+
+    python -m benchmarks.bench_parse
+"""
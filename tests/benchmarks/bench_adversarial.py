@@ -0,0 +1,61 @@
+"""
+adversarial stems for version parsing with time budgets per case.
+exits with non-zero status if any case exceeds its budget.
+"""
+
+import sys
+import time
+from collections.abc import Callable
+from typing import get_args
+
+from advanced_save_incremental.core import parse_stem
+from advanced_save_incremental.core import parse_stems
+from advanced_save_incremental.core import ParseEngine
+from advanced_save_incremental.core import Template
+from advanced_save_incremental.core import templates_matcher_get
+from advanced_save_incremental.core import VersionTemplate
+
+cases: dict[str, tuple[str, float]] = {
+    # name: (stem, budget in milliseconds)
+    "digits 10k": ("1" * 10_000, 5),
+    "digits 10k then letter": ("1" * 10_000 + "x", 5),
+    "letter then digits 10k": ("x" + "1" * 10_000, 5),
+    "separators 5k": ("." * 5_000, 5),
+    "digits and separators 10k": ("1." * 5_000, 5),
+    "digits and separators 10k then digit": ("1." * 5_000 + "1", 5),
+    "long digit runs and separators": (".".join(["1" * 1_000] * 10), 5),
+    "hash-like": ("render_" + "0123456789abcdef" * 640, 5),
+    "timestamps": ("shot_" + "_".join(["20241018"] * 1_000) + " v1.2.3", 5),
+}
+
+def time_ms(func: Callable[[], object]) -> float:
+    time_start = time.perf_counter()
+    func()
+    return (time.perf_counter() - time_start) * 1e3
+
+def main() -> int:
+    template = Template(
+        prefix = "",
+        suffix = " v",
+        version = VersionTemplate(separator = ".", count = 3, width = 1),
+    )
+    matcher = templates_matcher_get((
+        template,
+        Template(suffix = "_", version = VersionTemplate(separator = "_", count = 2)),
+        Template(version = VersionTemplate(count = 1)),
+    ))
+    failures = 0
+    for name, (stem, budget) in cases.items():
+        timings = {}
+        for engine in get_args(ParseEngine):
+            timings[f"parse_stem[{engine}]"] = time_ms(lambda: parse_stem(stem, template, engine))
+            timings[f"parse_stems[{engine}]"] = time_ms(lambda: parse_stems([stem], template, engine))
+        timings["TemplatesMatcher.match"] = time_ms(lambda: matcher.match(stem))
+        for func_name, timing in timings.items():
+            status = "ok" if timing <= budget else "OVER BUDGET"
+            failures += timing > budget
+            print(f"{name} ({len(stem)} chars), {func_name}: {timing:.3f} ms / {budget} ms {status}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
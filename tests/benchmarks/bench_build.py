@@ -0,0 +1,30 @@
+import time
+
+from advanced_save_incremental.core import build_version_str
+from advanced_save_incremental.core import Template
+from advanced_save_incremental.core import template_builder_get
+from advanced_save_incremental.core import VersionTemplate
+
+def main(count: int = 100_000):
+    template = Template(
+        prefix = "John Doe - ",
+        suffix = " v",
+        version = VersionTemplate(separator = ".", count = 3, width = 3),
+    )
+    versions_parts = [[idx // 10_000, idx // 100 % 100, idx % 100] for idx in range(count)]
+    time_start = time.perf_counter()
+    for version_parts in versions_parts:
+        # the template interpreted for every name
+        prefix = template.prefix if template.prefix else ""
+        suffix = template.suffix if template.suffix else ""
+        version = build_version_str(template.version, version_parts)
+        f"{prefix}Project Foobar{suffix}{version}.blend"
+    time_total = time.perf_counter() - time_start
+    print(f"interpreted: {count} names, {time_total / count * 1e6:.2f} us/name")
+    time_start = time.perf_counter()
+    template_builder_get(template).names_get("Project Foobar", versions_parts)
+    time_total = time.perf_counter() - time_start
+    print(f"TemplateBuilder.names_get: {count} names, {time_total / count * 1e6:.2f} us/name")
+
+if __name__ == "__main__":
+    main()
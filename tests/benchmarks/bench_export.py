@@ -0,0 +1,32 @@
+import tempfile
+import time
+from pathlib import Path
+
+from advanced_save_incremental.core import Template
+from advanced_save_incremental.core import VersionTemplate
+from advanced_save_incremental.core.persistence import templates_export
+from advanced_save_incremental.core.persistence import templates_import
+
+def main(count: int = 10_000):
+    templates = [Template(f"Template {idx}", "John \"Doe\" - ", " v", VersionTemplate(".", 3, 2))
+        for idx in range(count)]
+    with tempfile.TemporaryDirectory() as dir_path:
+        file_path = Path(dir_path) / "templates.toml"
+        time_start = time.perf_counter()
+        templates_export(file_path, templates)
+        time_total = time.perf_counter() - time_start
+        print(f"export: {count} templates, {time_total * 1e3:.1f} ms")
+        time_start = time.perf_counter()
+        assert templates_import(file_path) == templates
+        time_total = time.perf_counter() - time_start
+        print(f"import: {count} templates, {time_total * 1e3:.1f} ms")
+        cache_dir = Path(dir_path) / "cache"
+        cache_dir.mkdir()
+        for label in ["import, cache miss", "import, cache hit"]:
+            time_start = time.perf_counter()
+            assert templates_import(file_path, cache_dir) == templates
+            time_total = time.perf_counter() - time_start
+            print(f"{label}: {count} templates, {time_total * 1e3:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import time
+from dataclasses import fields
+from typing import get_args
+from typing import get_origin
+from types import UnionType
+
+from advanced_save_incremental.core import Template
+from advanced_save_incremental.exts.stdx import DataclassFromDictMixIn
+
+def from_dict_reflected(cls, d: dict):
+    """ decoding with the field types inspected for every dict, as before the decoding plans """
+    args = {}
+    for f in fields(cls):
+        if f.name in d:
+            if get_origin(f.type) is UnionType:
+                for t in get_args(f.type):
+                    if issubclass(t, DataclassFromDictMixIn):
+                        args[f.name] = from_dict_reflected(t, d[f.name])
+                        break
+                else:
+                    args[f.name] = d[f.name]
+            elif issubclass(f.type, DataclassFromDictMixIn):
+                args[f.name] = from_dict_reflected(f.type, d[f.name])
+            else:
+                args[f.name] = d[f.name]
+    return cls(**args)
+
+def main(count: int = 10_000):
+    templates_dicts = [{
+        "name": f"Template {idx}",
+        "prefix": "John Doe - ",
+        "suffix": " v",
+        "version": {"separator": ".", "count": 3, "width": 2},
+    } for idx in range(count)]
+    time_start = time.perf_counter()
+    [from_dict_reflected(Template, d) for d in templates_dicts]
+    time_total = time.perf_counter() - time_start
+    print(f"reflected: {count} templates, {time_total * 1e3:.1f} ms")
+    time_start = time.perf_counter()
+    [Template.from_dict(d) for d in templates_dicts]
+    time_total = time.perf_counter() - time_start
+    print(f"from_dict: {count} templates, {time_total * 1e3:.1f} ms")
+    time_start = time.perf_counter()
+    Template.from_dicts(templates_dicts)
+    time_total = time.perf_counter() - time_start
+    print(f"from_dicts: {count} templates, {time_total * 1e3:.1f} ms")
+
+if __name__ == "__main__":
+    main()
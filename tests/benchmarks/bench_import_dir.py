@@ -0,0 +1,28 @@
+import tempfile
+import time
+from pathlib import Path
+
+from advanced_save_incremental.core import Template
+from advanced_save_incremental.core import VersionTemplate
+from advanced_save_incremental.core.persistence import templates_dicts_load_dir
+from advanced_save_incremental.core.persistence import templates_export
+
+def main(libraries_count: int = 64, count: int = 200):
+    with tempfile.TemporaryDirectory() as dir_path:
+        for library_idx in range(libraries_count):
+            templates_export(Path(dir_path) / f"library {library_idx}.toml", [
+                Template(f"Template {idx}", "John Doe - ", " v", VersionTemplate(".", 3, 2))
+                for idx in range(count)])
+        cache_dir = Path(dir_path) / "cache"
+        cache_dir.mkdir()
+        templates_dicts_load_dir(dir_path, cache_dir)
+        for workers in [1, None]:
+            for cache in [None, cache_dir]:
+                time_start = time.perf_counter()
+                templates_dicts_load_dir(dir_path, cache, workers)
+                time_total = time.perf_counter() - time_start
+                print(f"workers={workers or 'default'} cached={cache is not None}: "
+                    f"{libraries_count} libraries of {count} templates, {time_total * 1e3:.1f} ms")
+
+if __name__ == "__main__":
+    main()
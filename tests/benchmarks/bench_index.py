@@ -0,0 +1,44 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from advanced_save_incremental.core import DirectoryListing
+from advanced_save_incremental.core import DirectoryVersions
+from advanced_save_incremental.core import FilesIndex
+from advanced_save_incremental.core import Template
+from advanced_save_incremental.core import VersionTemplate
+
+def main(count: int = 20_000):
+    template = Template(prefix = "", suffix = "", version = VersionTemplate())
+    with tempfile.TemporaryDirectory() as dir_path:
+        dir_path = Path(dir_path)
+        directory_path = dir_path / "project"
+        directory_path.mkdir()
+        for idx in range(count):
+            (directory_path / f"shot {idx % 20} v{idx // 100}.{idx % 100}.0.blend").touch()
+        os.utime(directory_path, ns = (0, 0))
+        time_start = time.perf_counter()
+        listing = DirectoryListing.scan(directory_path, os.stat(directory_path))
+        DirectoryVersions.from_file_names(listing.files, template).latest_get("shot 0 v")
+        time_scan = time.perf_counter() - time_start
+        database_path = dir_path / "index.sqlite3"
+        index = FilesIndex(directory_path, database_path)
+        time_start = time.perf_counter()
+        index.refresh()
+        index.directory_versions_get(template).latest_get("shot 0 v")
+        time_first = time.perf_counter() - time_start
+        index.close()
+        # e.g. the next Blender session
+        index = FilesIndex(directory_path, database_path)
+        time_start = time.perf_counter()
+        index.refresh()
+        index.file_names_get()
+        index.directory_versions_get(template).latest_get("shot 0 v")
+        time_next = time.perf_counter() - time_start
+        index.close()
+        print(f"{count} files: listing and parsing {time_scan * 1e3:.1f} ms, "
+            f"index first visit {time_first * 1e3:.1f} ms, next visit {time_next * 1e3:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import fnmatch
+import tempfile
+import time
+from pathlib import Path
+
+from advanced_save_incremental.core import ListingCache
+
+def main(count: int = 10_000, templates_count: int = 4):
+    with tempfile.TemporaryDirectory() as dir_path:
+        dir_path = Path(dir_path)
+        for idx in range(count):
+            (dir_path / f"Project {idx % 100} v{idx // 100}.blend").touch()
+        pattern = "*Project 7 *.blend"
+        time_start = time.perf_counter()
+        for _ in range(templates_count):
+            list(dir_path.glob(pattern))
+        time_total = time.perf_counter() - time_start
+        print(f"glob per template: {templates_count} templates, {count} files, {time_total * 1e3:.1f} ms")
+        cache = ListingCache()
+        for label in ["cold", "warm"]:
+            time_start = time.perf_counter()
+            for _ in range(templates_count):
+                fnmatch.filter(cache.get(dir_path).files, pattern)
+            time_total = time.perf_counter() - time_start
+            print(f"listing cache {label}: {templates_count} templates, {count} files, {time_total * 1e3:.1f} ms")
+
+if __name__ == "__main__":
+    main()
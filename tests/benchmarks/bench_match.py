@@ -0,0 +1,39 @@
+import random
+import time
+
+from advanced_save_incremental.core import parse_stem
+from advanced_save_incremental.core import Template
+from advanced_save_incremental.core import templates_matcher_get
+from advanced_save_incremental.core import VersionTemplate
+
+def templates_gen(count: int) -> tuple[Template, ...]:
+    return tuple(
+        Template(
+            name = f"Template {idx}",
+            prefix = f"dept{idx} - ",
+            suffix = " v" if idx % 2 else "_v",
+            version = VersionTemplate(separator = "." if idx % 3 else "_", count = 1 + idx % 3),
+        )
+        for idx in range(count))
+
+def main(templates_count: int = 40, stems_count: int = 10_000):
+    templates = templates_gen(templates_count)
+    rng = random.Random(0)
+    stems = [f"dept{rng.randrange(templates_count)} - shot{idx} v1.2.3" for idx in range(stems_count)]
+    time_start = time.perf_counter()
+    for stem in stems:
+        for template in templates:
+            parse_stem(stem, template)
+    time_total = time.perf_counter() - time_start
+    print(f"parse_stem per template: {templates_count} templates, {stems_count} stems, "
+          f"{time_total / stems_count * 1e6:.2f} us/stem")
+    time_start = time.perf_counter()
+    matcher = templates_matcher_get(templates)
+    for stem in stems:
+        matcher.match(stem)
+    time_total = time.perf_counter() - time_start
+    print(f"TemplatesMatcher.match: {templates_count} templates, {stems_count} stems, "
+          f"{time_total / stems_count * 1e6:.2f} us/stem")
+
+if __name__ == "__main__":
+    main()
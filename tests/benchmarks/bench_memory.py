@@ -0,0 +1,33 @@
+import tracemalloc
+
+from advanced_save_incremental.core import parse_stem
+from advanced_save_incremental.core import parse_stems
+from advanced_save_incremental.core import Template
+from advanced_save_incremental.core import VersionTemplate
+
+from .bench_parse import stems_gen
+
+def main(count: int = 100_000):
+    template = Template(
+        prefix = "John Doe - ",
+        suffix = " v",
+        version = VersionTemplate(separator = ".", count = 3, width = 1),
+    )
+    stems = stems_gen(count)
+    tracemalloc.start()
+    snapshot_start = tracemalloc.take_snapshot()
+    stems_parts = [parse_stem(stem, template) for stem in stems]
+    snapshot_end = tracemalloc.take_snapshot()
+    size = sum(e.size_diff for e in snapshot_end.compare_to(snapshot_start, "filename"))
+    print(f"parse_stem: {count} stems, {size / count:.0f} bytes/file")
+    del stems_parts
+    snapshot_start = tracemalloc.take_snapshot()
+    columns = parse_stems(stems, template)
+    snapshot_end = tracemalloc.take_snapshot()
+    size = sum(e.size_diff for e in snapshot_end.compare_to(snapshot_start, "filename"))
+    print(f"parse_stems: {count} stems, {size / count:.0f} bytes/file")
+    del columns
+    tracemalloc.stop()
+
+if __name__ == "__main__":
+    main()
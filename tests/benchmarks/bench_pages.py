@@ -0,0 +1,34 @@
+import re
+import time
+
+from advanced_save_incremental.core import FilesPages
+from advanced_save_incremental.core import natural_key_get
+
+def main(count: int = 50_000, page_size: int = 100):
+    file_paths = [f"shot {idx % 20} v{idx // 20}.blend" for idx in range(count)]
+    stems = [e[:-len(".blend")] for e in file_paths]
+    # what the files openers list did per redraw with all the files in the collection
+    time_start = time.perf_counter()
+    sorted(enumerate(stems), key = lambda p: natural_key_get(p[1]))
+    [bool(re.match(r".*shot 3.*", e, re.IGNORECASE)) for e in stems]
+    time_list = time.perf_counter() - time_start
+    time_start = time.perf_counter()
+    pages = FilesPages(file_paths)
+    time_build = time.perf_counter() - time_start
+    time_start = time.perf_counter()
+    page = pages.page_get(3, page_size, "shot 3")
+    time_page = time.perf_counter() - time_start
+    time_start = time.perf_counter()
+    pages.update([f"shot 3 v{count}.blend"], [file_paths[0]])
+    time_update = time.perf_counter() - time_start
+    # a complete scan with more files, merged instead of sorted with all the others
+    file_paths_new = [f"shot {idx % 20} v{idx // 20}.blend" for idx in range(count, count + 1000)]
+    time_start = time.perf_counter()
+    pages.file_paths_set(pages.file_paths + file_paths_new)
+    time_merge = time.perf_counter() - time_start
+    print(f"{count} files: list filtering and sorting per redraw {time_list * 1e3:.1f} ms; "
+        f"pages of {len(page.file_paths)}: build {time_build * 1e3:.1f} ms, page {time_page * 1e3:.2f} ms, "
+        f"update {time_update * 1e3:.2f} ms, merge of {len(file_paths_new)} {time_merge * 1e3:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import random
+import time
+from typing import get_args
+
+from advanced_save_incremental.core import parse_stem
+from advanced_save_incremental.core import parse_stems
+from advanced_save_incremental.core import ParseEngine
+from advanced_save_incremental.core import Template
+from advanced_save_incremental.core import VersionTemplate
+from advanced_save_incremental.core.parse import version_pattern_get
+
+def stems_gen(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        f"John Doe - Project {rng.randrange(100)} v"
+        f"{rng.randrange(10)}.{rng.randrange(10)}.{rng.randrange(100)}"
+        for _ in range(count)]
+
+def main(count: int = 50_000):
+    template = Template(
+        prefix = "John Doe - ",
+        suffix = " v",
+        version = VersionTemplate(separator = ".", count = 3, width = 1),
+    )
+    stems = stems_gen(count)
+    for engine in get_args(ParseEngine):
+        version_pattern_get.cache_clear()
+        time_start = time.perf_counter()
+        for stem in stems:
+            parse_stem(stem, template, engine)
+        time_total = time.perf_counter() - time_start
+        info = version_pattern_get.cache_info()
+        hit_rate = info.hits / max(1, info.hits + info.misses)
+        print(f"parse_stem[{engine}]: {count} stems, {time_total / count * 1e6:.2f} us/parse, "
+              f"pattern cache hit rate: {hit_rate:.2%} ({info})")
+        time_start = time.perf_counter()
+        parse_stems(stems, template, engine)
+        time_total = time.perf_counter() - time_start
+        print(f"parse_stems[{engine}]: {count} stems, {time_total / count * 1e6:.2f} us/stem")
+
+if __name__ == "__main__":
+    main()
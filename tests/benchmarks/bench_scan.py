@@ -0,0 +1,25 @@
+import tempfile
+import time
+from pathlib import Path
+
+from advanced_save_incremental.core import blend_files_scan
+
+def main(counts: tuple[int, ...] = (1_000, 10_000, 100_000)):
+    for count in counts:
+        with tempfile.TemporaryDirectory() as dir_path:
+            dir_path = Path(dir_path)
+            for idx in range(count):
+                suffix = ".blend" if idx % 4 else ".blend1"
+                (dir_path / f"Project {idx % 100} v{idx // 100}{suffix}").touch()
+            root = "Project 7"
+            time_start = time.perf_counter()
+            paths = list(dir_path.glob(f"*{root}*.blend"))
+            time_glob = time.perf_counter() - time_start
+            time_start = time.perf_counter()
+            entries = list(blend_files_scan(dir_path, root))
+            time_scan = time.perf_counter() - time_start
+            assert sorted(e.name for e in entries) == sorted(p.name for p in paths)
+            print(f"{count} entries: glob {time_glob * 1e3:.1f} ms, scandir {time_scan * 1e3:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import random
+import re
+import time
+
+from advanced_save_incremental.core import natural_key_get
+
+def tokenize_words_and_numbers(stem: str) -> tuple[str, ...]:
+    """ the former sorting key, for comparison """
+    return tuple(int(e) if e.isdigit() else e
+        for e in re.split(r"(\d+)", stem))
+
+def main(count: int = 100_000):
+    rng = random.Random(0)
+    stems = [f"shot{rng.randrange(1000)}_task{rng.randrange(20)} v{rng.randrange(10)}.{rng.randrange(100)}"
+        for _ in range(count)]
+    time_start = time.perf_counter()
+    sorted(stems, key = lambda e: tokenize_words_and_numbers(e.lower()))
+    time_total = time.perf_counter() - time_start
+    print(f"tokenize_words_and_numbers: {count} stems, {time_total * 1e3:.1f} ms")
+    natural_key_get.cache_clear()
+    time_start = time.perf_counter()
+    sorted(stems, key = natural_key_get)
+    time_total = time.perf_counter() - time_start
+    print(f"natural_key_get, cold cache: {count} stems, {time_total * 1e3:.1f} ms")
+    time_start = time.perf_counter()
+    sorted(stems, key = natural_key_get)
+    time_total = time.perf_counter() - time_start
+    print(f"natural_key_get, warm cache: {count} stems, {time_total * 1e3:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import time
+
+from advanced_save_incremental.core import build_version_str
+from advanced_save_incremental.core import version_increment
+from advanced_save_incremental.core import VersionTable
+from advanced_save_incremental.core import VersionTemplate
+
+def main(count: int = 100_000):
+    version_template = VersionTemplate(separator = ".", count = 3, width = 3)
+    roots = [f"Project {idx % 1000}" for idx in range(count)]
+    versions_parts = [[idx // 10_000, idx // 100 % 100, idx % 100] for idx in range(count)]
+    time_start = time.perf_counter()
+    for version_parts in versions_parts:
+        build_version_str(version_template, version_increment(version_parts, 1))
+    time_total = time.perf_counter() - time_start
+    print(f"per file loop: {count} versions, {time_total * 1e3:.1f} ms")
+    for use_numpy in [False, True]:
+        try:
+            time_start = time.perf_counter()
+            table = VersionTable.from_parts(version_template, roots, versions_parts, use_numpy)
+        except ImportError as e:
+            print(e)
+            continue
+        time_build = time.perf_counter() - time_start
+        time_start = time.perf_counter()
+        table.increment(1).version_strs_get()
+        time_total = time.perf_counter() - time_start
+        time_start = time.perf_counter()
+        table.latest_per_root_get()
+        time_latest = time.perf_counter() - time_start
+        print(f"VersionTable numpy={use_numpy}: {count} versions, build {time_build * 1e3:.1f} ms, "
+            f"increment and format {time_total * 1e3:.1f} ms, latest per root {time_latest * 1e3:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import tempfile
+import time
+from pathlib import Path
+
+from advanced_save_incremental.core import DirectoriesScanner
+from advanced_save_incremental.core import ListingCache
+
+def main(shots_count: int = 200, tasks_count: int = 10, files_count: int = 20):
+    with tempfile.TemporaryDirectory() as dir_path:
+        dir_path = Path(dir_path)
+        for shot_idx in range(shots_count):
+            for task_idx in range(tasks_count):
+                task_path = dir_path / "shots" / f"{shot_idx:03}" / f"task {task_idx}"
+                (task_path / "cache").mkdir(parents = True)
+                for idx in range(files_count):
+                    (task_path / f"shot {shot_idx} v{idx}.blend").touch()
+                    (task_path / "cache" / f"{idx}.vdb").touch()
+        count = shots_count * tasks_count * files_count
+        time_start = time.perf_counter()
+        paths = [p for p in dir_path.rglob("*.blend") if "cache" not in p.parts]
+        time_total = time.perf_counter() - time_start
+        print(f"rglob: {count} files, {time_total * 1e3:.1f} ms")
+        scanner = DirectoriesScanner(cache = ListingCache())
+        time_start = time.perf_counter()
+        time_first = None
+        files = []
+        scanner.submit(dir_path, 3, ["cache"])
+        while scanner.is_pending():
+            for _, batch in scanner.results_pop():
+                if time_first is None and batch.files:
+                    time_first = time.perf_counter() - time_start
+                files += batch.files
+            time.sleep(0.001)
+        time_total = time.perf_counter() - time_start
+        scanner.shutdown()
+        assert len(files) == len(paths)
+        print(f"DirectoriesScanner: {count} files, first batch {time_first * 1e3:.1f} ms, "
+            f"total {time_total * 1e3:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import random
+import time
+
+from advanced_save_incremental.core import Version
+from advanced_save_incremental.core import versions_dedup
+from advanced_save_incremental.core import versions_sort
+from advanced_save_incremental.core import VersionTemplate
+
+def main(count: int = 100_000):
+    rng = random.Random(0)
+    version_template = VersionTemplate(separator = ".", count = 3, width = 1)
+    parts_lists = [[rng.randrange(10), rng.randrange(10), rng.randrange(100)] for _ in range(count)]
+    time_start = time.perf_counter()
+    sorted(parts_lists)
+    time_total = time.perf_counter() - time_start
+    print(f"sort parts lists: {count} versions, {time_total * 1e3:.1f} ms")
+    versions = [Version(parts, version_template) for parts in parts_lists]
+    time_start = time.perf_counter()
+    sorted(versions)
+    time_total = time.perf_counter() - time_start
+    print(f"sort versions: {count} versions, {time_total * 1e3:.1f} ms")
+    time_start = time.perf_counter()
+    versions_sort(versions)
+    time_total = time.perf_counter() - time_start
+    print(f"sort versions by key: {count} versions, {time_total * 1e3:.1f} ms")
+    time_start = time.perf_counter()
+    len(set(versions))
+    time_total = time.perf_counter() - time_start
+    print(f"deduplicate versions: {count} versions, {time_total * 1e3:.1f} ms")
+    time_start = time.perf_counter()
+    versions_dedup(versions)
+    time_total = time.perf_counter() - time_start
+    print(f"deduplicate versions by key: {count} versions, {time_total * 1e3:.1f} ms")
+
+if __name__ == "__main__":
+    main()
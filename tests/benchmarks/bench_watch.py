@@ -0,0 +1,35 @@
+import tempfile
+import time
+from pathlib import Path
+
+from advanced_save_incremental.core import DirectoryWatcher
+from advanced_save_incremental.core import InotifyWatcher
+
+def main(count: int = 20_000, reads_count: int = 1000):
+    with tempfile.TemporaryDirectory() as dir_path:
+        dir_path = Path(dir_path)
+        for idx in range(count):
+            (dir_path / f"Project v{idx}.blend").touch()
+        for watcher_cls in [DirectoryWatcher, InotifyWatcher]:
+            try:
+                watcher = watcher_cls()
+            except OSError as exc:
+                print(f"{watcher_cls.__name__}: {exc}")
+                continue
+            watcher.watch(dir_path)
+            time_start = time.perf_counter()
+            for _ in range(reads_count):
+                watcher.events_read()
+            time_idle = time.perf_counter() - time_start
+            (dir_path / f"Project v{count}.blend").touch()
+            time_start = time.perf_counter()
+            events = watcher.events_read()
+            time_event = time.perf_counter() - time_start
+            (dir_path / f"Project v{count}.blend").unlink()
+            watcher.events_read()
+            watcher.close()
+            print(f"{watcher_cls.__name__}: {count} files, idle read {time_idle / reads_count * 1e6:.1f} us, "
+                f"read of {len(events)} event {time_event * 1e3:.2f} ms")
+
+if __name__ == "__main__":
+    main()
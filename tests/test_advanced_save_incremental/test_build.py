@@ -1,8 +1,14 @@
 from advanced_save_incremental.core import build_version_str
+from advanced_save_incremental.core import DirectoryVersions
+from advanced_save_incremental.core import directory_versions_get
 from advanced_save_incremental.core import file_name_get
+from advanced_save_incremental.core import FileSaveData
+from advanced_save_incremental.core import files_save_datas_get
 from advanced_save_incremental.core import version_increment
 from advanced_save_incremental.core import Template
+from advanced_save_incremental.core import template_builder_get
 from advanced_save_incremental.core import VersionTemplate
+from advanced_save_incremental.core.build import files_save_datas_gen
 
 def test_file_name_get():
     file_name = f"John Doe - Project Foobar v03.00.12.blend"
@@ -33,3 +39,81 @@ def test_build_version_str():
     assert build_version_str(VersionTemplate(".", 1, 1), [3, 0, 12]) == "3"
     assert build_version_str(VersionTemplate(".", 1, 2), [3, 0, 12]) == "03"
     assert build_version_str(VersionTemplate(".", 1, 3), [3, 0, 12]) == "003"
+
+def test_template_builder():
+    templates = [
+        Template(prefix = "John Doe - ", suffix = " v", version = VersionTemplate(".", 3, 2)),
+        Template(prefix = "{braces}", suffix = "_v", version = VersionTemplate("}{", 2, 1)),
+        Template(suffix = "-"),
+        Template(version = VersionTemplate("_", 1, 3)),
+    ]
+    versions_parts = [[], [3], [3, 0, 12], [3, 0, 12, 4], [1234, 5]]
+    for template in templates:
+        builder = template_builder_get(template)
+        assert builder is template_builder_get(template)
+        for version_parts in versions_parts:
+            version_str = build_version_str(template.version, version_parts)
+            assert builder.version_str_get(version_parts) == version_str
+            file_name = f"{template.prefix or ''}root{template.suffix or ''}{version_str}.blend"
+            assert builder.name_get("root", version_parts) == file_name
+        assert builder.names_get("root", versions_parts) == [
+            builder.name_get("root", version_parts) for version_parts in versions_parts]
+
+def test_files_save_datas_gen():
+    template = Template(prefix = "", suffix = " v", version = VersionTemplate(".", 3, 2))
+    assert list(files_save_datas_gen(template, [3, 0], "Foobar")) == [
+        FileSaveData("Save", "Foobar v03.00.00.blend"),
+        FileSaveData("Save Incremented Major: 04.00.00", "Foobar v04.00.00.blend"),
+        FileSaveData("Save Incremented Minor: 03.01.00", "Foobar v03.01.00.blend"),
+        FileSaveData("Save Incremented Patch: 03.00.01", "Foobar v03.00.01.blend"),
+    ]
+    template = Template(suffix = "_", version = VersionTemplate(".", 1, 1))
+    assert list(files_save_datas_gen(template, [3, 1], "Foobar", "Overwrite")) == [
+        FileSaveData("Overwrite", "Foobar_3.blend"),
+        FileSaveData("Overwrite Incremental: 4", "Foobar_4.blend"),
+    ]
+    assert list(files_save_datas_gen(Template(), [3], "Foobar")) == [
+        FileSaveData("Save", "Foobar.blend"),
+    ]
+
+def test_directory_versions():
+    template = Template(prefix = "", suffix = " v", version = VersionTemplate(".", 3, 2))
+    file_names = [
+        "Foobar v03.00.12.blend",
+        "Foobar v3.1.0.blend",
+        "Foobar v03.04.00.blend",
+        "Foobar v04.00.00.blend",
+        "Foobar v05.00.00.blend1",
+        "Foobar 06.00.00.blend",
+        "Other v09.00.00.blend",
+        "Foobar.blend",
+    ]
+    directory_versions = DirectoryVersions.from_file_names(file_names, template)
+    assert directory_versions.latest_get("Foobar") == [4, 0, 0]
+    assert directory_versions.latest_get("Other") == [9, 0, 0]
+    assert directory_versions.latest_get("Missing") is None
+    assert directory_versions.increment_free_get("Foobar", [3, 0, 12], 0) == [5, 0, 0]
+    assert directory_versions.increment_free_get("Foobar", [3, 0, 12], 1) == [3, 5, 0]
+    assert directory_versions.increment_free_get("Foobar", [3, 0, 12], 2) == [3, 0, 13]
+    assert directory_versions.increment_free_get("New", [1], 1) == [1, 1, 0]
+    assert [e.file_name for e in files_save_datas_gen(template, [3, 0, 12], "Foobar",
+        directory_versions = directory_versions)] == [
+        "Foobar v03.00.12.blend",
+        "Foobar v05.00.00.blend",
+        "Foobar v03.05.00.blend",
+        "Foobar v03.00.13.blend",
+    ]
+
+def test_files_save_datas_get():
+    template = Template(prefix = "", suffix = " v", version = VersionTemplate(".", 3, 2))
+    file_names = frozenset(["Foobar v03.00.12.blend", "Foobar v04.00.00.blend"])
+    directory_versions = directory_versions_get(template, file_names)
+    assert directory_versions is directory_versions_get(template, file_names)
+    version_keys = tuple(directory_versions.index_get("Foobar").keys)
+    files_save_datas_get.cache_clear()
+    datas = files_save_datas_get(template, (3, 0, 12), "Foobar", "Save", version_keys)
+    assert datas == tuple(files_save_datas_gen(template, [3, 0, 12], "Foobar", "Save",
+        directory_versions = directory_versions))
+    assert datas[1].file_name == "Foobar v05.00.00.blend"
+    assert datas is files_save_datas_get(template, (3, 0, 12), "Foobar", "Save", version_keys)
+    assert files_save_datas_get.cache_info().hits == 1
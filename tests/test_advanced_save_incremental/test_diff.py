@@ -0,0 +1,41 @@
+import pytest
+
+from advanced_save_incremental.exts.stdx.diffx import items_diff
+from advanced_save_incremental.exts.stdx.diffx import items_diff_positional
+
+def diff_apply(items: list, diff) -> list:
+    items = list(items)
+    for idx in diff.removed:
+        del items[idx]
+    for idx, item in diff.updated:
+        items[idx] = item
+    return items + diff.added
+
+@pytest.mark.parametrize("old, new", [
+    ([], []),
+    ([], ["a", "b"]),
+    (["a", "b"], []),
+    (["a", "b", "c"], ["c", "d", "a"]),
+    (["a", "a", "b"], ["b", "a"]),
+])
+def test_items_diff(old, new):
+    diff = items_diff(old, new)
+    assert sorted(diff_apply(old, diff)) == sorted(set(new))
+    # kept items keep their order
+    kept = [e for e in old if e in new]
+    assert diff_apply(old, diff)[:len(set(kept))] == list(dict.fromkeys(kept))
+
+def test_items_diff_unchanged():
+    assert not items_diff(["a", "b"], ["b", "a"])
+    diff = items_diff([("a", 1), ("b", 2)], [("b", 3), ("a", 1)], key = lambda e: e[0])
+    assert (diff.removed, diff.updated, diff.added) == ([], [(1, ("b", 3))], [])
+
+@pytest.mark.parametrize("old, new", [
+    ([], ["a"]),
+    (["a", "b", "c"], ["a"]),
+    (["a", "b"], ["a", "c", "d"]),
+])
+def test_items_diff_positional(old, new):
+    diff = items_diff_positional(old, new)
+    assert diff_apply(old, diff) == new
+    assert len(diff.updated) == sum(e != e_new for e, e_new in zip(old, new))
@@ -0,0 +1,146 @@
+import os
+import time
+
+from advanced_save_incremental.core import DirectoriesScanner
+from advanced_save_incremental.core import FilesIndex
+from advanced_save_incremental.core import FilesIndices
+from advanced_save_incremental.core import ListingCache
+from advanced_save_incremental.core import Template
+from advanced_save_incremental.core import VersionTemplate
+
+template = Template(prefix = "", suffix = "", version = VersionTemplate(separator = ".", count = 3, width = 1))
+
+def directory_touch(path, mtime_ns: int):
+    """ an old modification time, so a refresh trusts it """
+    os.utime(path, ns = (mtime_ns, mtime_ns))
+
+def test_files_index(tmp_path):
+    directory_path = tmp_path / "project"
+    directory_path.mkdir()
+    for name in ["shot v1.0.0.blend", "shot v1.2.0.blend", "shot v1.10.0.blend", "other v2.0.0.blend", "x.txt"]:
+        (directory_path / name).touch()
+    directory_touch(directory_path, 1_000_000_000)
+    index = FilesIndex(directory_path, tmp_path / "index.sqlite3")
+    assert index.refresh()
+    assert not index.refresh()
+    assert index.file_names_get() == ["other v2.0.0.blend", "shot v1.0.0.blend", "shot v1.10.0.blend", "shot v1.2.0.blend"]
+    assert index.file_names_get("shot") == ["shot v1.0.0.blend", "shot v1.10.0.blend", "shot v1.2.0.blend"]
+    directory_versions = index.directory_versions_get(template)
+    assert directory_versions.latest_get("shot v") == [1, 10, 0]
+    assert index.directory_versions_get(template) is directory_versions
+    assert index.directory_versions_get(template).latest_get("shot v") == [1, 10, 0]
+    assert index.directory_versions_get(template).latest_get("missing") is None
+    # only the changed directory is listed again, only the changed files are written
+    (directory_path / "shot v1.0.0.blend").unlink()
+    (directory_path / "shot v2.0.0.blend").touch()
+    directory_touch(directory_path, 2_000_000_000)
+    generation = index.generation
+    assert index.refresh()
+    assert index.generation == generation + 1
+    assert "shot v1.0.0.blend" not in index.file_names_get()
+    assert index.directory_versions_get(template).latest_get("shot v") == [2, 0, 0]
+    assert index.directory_versions_get(template).index_get("shot v").keys[0] != 0
+    # e.g. after a save
+    (directory_path / "shot v3.0.0.blend").touch()
+    index.names_update(["shot v3.0.0.blend", "shot v1.2.0.blend-missing", "gone.blend"])
+    assert index.directory_versions_get(template).latest_get("shot v") == [3, 0, 0]
+    index.close()
+    # persisted
+    index = FilesIndex(directory_path, tmp_path / "index.sqlite3")
+    assert len(index) == 5
+    assert index.directory_versions_get(template).latest_get("shot v") == [3, 0, 0]
+    index.close()
+
+def test_files_index_big_keys(tmp_path):
+    """ keys of versions with big parts do not fit SQLite integers, but still sort """
+    for name in ["a v1.99999999999.0.blend", "a v2.0.0.blend", "a v1.0.99999999999.blend"]:
+        (tmp_path / name).touch()
+    index = FilesIndex(tmp_path, tmp_path / "index.sqlite3")
+    index.refresh()
+    assert index.directory_versions_get(template).latest_get("a v") == [2, 0, 0]
+    assert index.directory_versions_get(template).index_get("a v").latest_with_get([1]) == [1, 99999999999, 0]
+    index.close()
+
+def test_files_index_recent(tmp_path):
+    """ a directory modified very recently is listed again, in case it changes within its mtime resolution """
+    (tmp_path / "a.blend").touch()
+    index = FilesIndex(tmp_path, tmp_path / "index.sqlite3")
+    assert index.refresh()
+    assert index.directory_stat_get() is None
+    (tmp_path / "a.blend").write_bytes(b"saved")
+    assert index.refresh()
+    assert not index.refresh()
+    index.close()
+
+def test_files_indices(tmp_path):
+    (tmp_path / "a.blend").touch()
+    indices = FilesIndices()
+    assert indices.get(tmp_path) is None
+    databases_path = tmp_path / "cache"
+    databases_path.mkdir()
+    indices.databases_path_set(databases_path)
+    assert indices.get(tmp_path / "missing") is None
+    assert indices.get(tmp_path, should_open = False) is None
+    index = indices.get(tmp_path)
+    assert indices.get(tmp_path / "cache" / "..") is index
+    database_path = index.database_path
+    indices.close()
+    # a damaged database is recreated
+    with open(database_path, "wb") as f:
+        f.write(b"not a database" * 1000)
+    index = indices.get(tmp_path)
+    assert index is not None
+    assert index.refresh()
+    assert index.file_names_get() == ["a.blend"]
+    indices.databases_path_set(None)
+    assert indices.get(tmp_path) is None
+
+def test_directories_scanner_indexed(tmp_path):
+    databases_path = tmp_path / "cache"
+    databases_path.mkdir()
+    (tmp_path / "a.blend").touch()
+    indices = FilesIndices(databases_path)
+    scanner = DirectoriesScanner(cache = ListingCache(), indices = indices)
+    key = scanner.submit(tmp_path)
+    time_end = time.monotonic() + 5.0
+    results = []
+    while scanner.is_pending() and time.monotonic() < time_end:
+        results += scanner.results_pop()
+        time.sleep(0.001)
+    assert dict(results)[key].files == ("a.blend",)
+    assert indices.get(tmp_path, should_open = False).file_names_get() == ["a.blend"]
+    scanner.shutdown()
+    indices.close()
+
+def test_directories_scanner_versions_warm(tmp_path):
+    """ the versions are read from the index by the scanner, the UI thread uses the cached ones """
+    databases_path = tmp_path / "cache"
+    databases_path.mkdir()
+    (tmp_path / "a1.0.0.blend").touch()
+    indices = FilesIndices(databases_path)
+    scanner = DirectoriesScanner(cache = ListingCache(), indices = indices)
+    scanner.submit(tmp_path, templates = [template])
+    time_end = time.monotonic() + 5.0
+    while scanner.is_pending() and time.monotonic() < time_end:
+        scanner.results_pop()
+        time.sleep(0.001)
+    index = indices.get(tmp_path, should_open = False)
+    assert index.directory_versions_cached_get(template).latest_get("a") == [1, 0, 0]
+    (tmp_path / "a1.0.1.blend").touch()
+    scanner.names_submit(index.directory_path, ["a1.0.1.blend"], [template])
+    # not the versions before the change while it is indexed, the caller falls back to its files
+    directory_versions = index.directory_versions_cached_get(template)
+    assert directory_versions is None or directory_versions.latest_get("a") == [1, 0, 1]
+    directories_indexed = set()
+    time_end = time.monotonic() + 5.0
+    while not directories_indexed and time.monotonic() < time_end:
+        directories_indexed = scanner.names_updated_pop()
+        time.sleep(0.001)
+    # reported, to read the versions again
+    assert directories_indexed == {index.directory_path}
+    assert index.directory_versions_cached_get(template).latest_get("a") == [1, 0, 1]
+    scanner.shutdown(wait = True)
+    index.names_update(["a1.0.0.blend"])
+    # changed since, read again by the next scan
+    assert index.directory_versions_cached_get(template) is None
+    indices.close()
@@ -0,0 +1,238 @@
+import fnmatch
+import os
+import time
+
+import pytest
+
+from advanced_save_incremental.core import blend_file_name_matches
+from advanced_save_incremental.core import blend_file_names_filter
+from advanced_save_incremental.core import blend_files_scan
+from advanced_save_incremental.core import DirectoriesScanner
+from advanced_save_incremental.core import FilesPages
+from advanced_save_incremental.core import ListingCache
+from advanced_save_incremental.core import ScanBatch
+from advanced_save_incremental.core import scan
+
+def test_listing_cache(tmp_path):
+    (tmp_path / "a v1.blend").touch()
+    (tmp_path / "renders").mkdir()
+    cache = ListingCache(entries_max = 2)
+    listing = cache.get(tmp_path)
+    assert listing.files == ("a v1.blend",)
+    assert listing.directories == ("renders",)
+    assert cache.get(tmp_path / "renders" / "..") is listing
+    assert (cache.hits, cache.misses) == (1, 1)
+    # a changed directory is scanned again
+    (tmp_path / "a v2.blend").touch()
+    os.utime(tmp_path, ns = (0, 0))
+    assert sorted(cache.get(tmp_path).files) == ["a v1.blend", "a v2.blend"]
+    assert cache.misses == 2
+    # least recently used listings are evicted
+    cache.get(tmp_path / "renders")
+    (tmp_path / "other").mkdir()
+    cache.get(tmp_path / "other")
+    assert list(cache.entries) == [str((tmp_path / d).resolve()) for d in ["renders", "other"]]
+
+def test_listing_cache_ttl(tmp_path):
+    cache = ListingCache(ttl = 0)
+    listing = cache.get(tmp_path)
+    assert cache.get(tmp_path) is not listing
+    assert cache.misses == 2
+
+def results_wait(scanner: DirectoriesScanner, timeout: float = 5.0):
+    results = []
+    time_end = time.monotonic() + timeout
+    while scanner.is_pending() and time.monotonic() < time_end:
+        results += scanner.results_pop()
+        time.sleep(0.001)
+    return results
+
+def test_directories_scanner(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "x.blend").touch()
+    (tmp_path / "a" / "x.txt").touch()
+    scanner = DirectoriesScanner(cache = ListingCache())
+    key_a = scanner.submit(tmp_path / "a")
+    key_missing = scanner.submit(tmp_path / "missing")
+    assert scanner.is_pending(key_a)
+    results = dict(results_wait(scanner))
+    assert results[key_a].files == ("x.blend",)
+    # sorted on the worker
+    assert results[key_a].pages.file_paths == ["x.blend"]
+    assert isinstance(results[key_missing], OSError)
+    assert not scanner.is_pending()
+    scanner.shutdown()
+    # e.g. the add-on enabled again
+    assert scanner.executor is None
+    key_a = scanner.submit(tmp_path / "a")
+    assert dict(results_wait(scanner))[key_a].files == ("x.blend",)
+    scanner.shutdown()
+
+def test_directories_scanner_stale(tmp_path):
+    scanner = DirectoriesScanner(cache = ListingCache(ttl = 0))
+    for _ in range(10):
+        scanner.submit(tmp_path)
+    # only the result of the latest submission is given
+    assert len(results_wait(scanner)) == 1
+    scanner.shutdown()
+
+def test_directories_scanner_resubmit_pending(tmp_path):
+    """ files created while a scan is pending are found by submitting it again, e.g. on watched changes """
+    (tmp_path / "a v1.blend").touch()
+    scanner = DirectoriesScanner(cache = ListingCache(ttl = 0))
+    key = scanner.submit(tmp_path, 1)
+    (tmp_path / "a v2.blend").touch()
+    if scanner.is_pending(key):
+        scanner.submit(tmp_path, 1)
+    results = results_wait(scanner)
+    assert results[-1][1].pages.file_paths == ["a v1.blend", "a v2.blend"]
+    scanner.shutdown()
+
+def test_directories_scanner_stale_after_shutdown(tmp_path):
+    """ a scan still running on shutdown, e.g. the add-on disabled, is stale after submitting again """
+    scanner = DirectoriesScanner(cache = ListingCache())
+    key = scanner.submit(tmp_path, 1)
+    generation = scanner.generations[key]
+    scanner.shutdown(wait = True)
+    # the last batch of the stopped scan, put after shutdown drained the results
+    scanner.results.put((key, generation, ScanBatch(is_last = True)))
+    scanner.submit(tmp_path, 1)
+    results = results_wait(scanner)
+    assert len(results) == 1
+    assert results[0][1].pages is not None
+    scanner.shutdown()
+
+@pytest.mark.parametrize("file_name", [
+    "shot v1.blend", "shot.blend", "my shot v1.blend", "shot v1.blend1", "shot v1.blend.png", "v1.blend", ".blend",
+])
+@pytest.mark.parametrize("root", ["", "shot", "blend", "v1.blend"])
+def test_blend_file_name_matches_glob(file_name, root):
+    assert blend_file_name_matches(file_name, root) == fnmatch.fnmatchcase(file_name, f"*{root}*.blend")
+
+def test_blend_file_name_matches_literally():
+    assert blend_file_name_matches("shot[1] v1.blend", "shot[1]")
+    assert not blend_file_name_matches("shot1 v1.blend", "shot[1]")
+    assert list(blend_file_names_filter(["a*b v1.blend", "ab v1.blend", "a*b.txt"], "a*b")) == ["a*b v1.blend"]
+
+def test_blend_files_scan(tmp_path):
+    for name in ["shot v1.blend", "shot v1.blend1", "other v1.blend"]:
+        (tmp_path / name).touch()
+    (tmp_path / "shot v2.blend").mkdir()
+    assert [e.name for e in blend_files_scan(tmp_path, "shot")] == ["shot v1.blend"]
+    assert sorted(e.name for e in blend_files_scan(tmp_path)) == ["other v1.blend", "shot v1.blend"]
+
+def test_directories_scanner_recursive(tmp_path):
+    for directory in ["shots/010/anim", "shots/010/cache", "shots/020/anim/deep", "renders"]:
+        (tmp_path / directory).mkdir(parents = True)
+    for file_path in ["a.blend", "shots/010/anim/a.blend", "shots/010/cache/a.blend",
+            "shots/020/anim/a.blend", "shots/020/anim/deep/a.blend", "renders/a.blend"]:
+        (tmp_path / file_path).touch()
+    scanner = DirectoriesScanner(cache = ListingCache(), batch_size = 1)
+    key = scanner.submit(tmp_path, 3, ["cache", "render*"])
+    results = results_wait(scanner)
+    assert all(k == key for k, _ in results)
+    assert [batch.is_first for _, batch in results] == [True] + [False] * (len(results) - 1)
+    assert [batch.is_last for _, batch in results] == [False] * (len(results) - 1) + [True]
+    files = sorted(f.replace(os.sep, "/") for _, batch in results for f in batch.files)
+    assert files == ["a.blend", "shots/010/anim/a.blend", "shots/020/anim/a.blend"]
+    # all the files of the scan with its last batch
+    assert sorted(e.replace(os.sep, "/") for e in results[-1][1].pages.file_paths) == files
+    assert all(batch.pages is None for _, batch in results[:-1])
+    # the listed subdirectories, to watch them
+    directories = sorted(d for _, batch in results for d in batch.directories)
+    assert directories == sorted(str((tmp_path / e).resolve())
+        for e in ["shots", "shots/010", "shots/010/anim", "shots/020", "shots/020/anim"])
+    scanner.shutdown()
+
+def test_directories_scanner_tree_cache(tmp_path):
+    """ listings of a deep tree do not evict the other directories listings """
+    for idx in range(8):
+        (tmp_path / "tree" / f"{idx}" / "sub").mkdir(parents = True)
+    (tmp_path / "other").mkdir()
+    cache = ListingCache(entries_max = 2)
+    scanner = DirectoriesScanner(cache = cache, tree_cache = ListingCache(entries_max = 4))
+    key_other = scanner.submit(tmp_path / "other")
+    results_wait(scanner)
+    scanner.submit(tmp_path / "tree", 2)
+    results_wait(scanner)
+    assert list(cache.entries) == [key_other[0]]
+    # grown to the tree size after its first scan
+    assert scanner.tree_cache.entries_max == 17
+    scanner.submit(tmp_path / "tree", 2)
+    results_wait(scanner)
+    assert len(scanner.tree_cache.entries) == 17
+    # an unchanged tree is listed from its cache
+    misses = scanner.tree_cache.misses
+    scanner.submit(tmp_path / "tree", 2)
+    results_wait(scanner)
+    assert scanner.tree_cache.misses == misses
+    # shrunk when the tree is not scanned anymore
+    scanner.trees_discard([scanner.key_get(tmp_path / "tree", 2)])
+    assert scanner.tree_cache.entries_max == 4
+    assert len(scanner.tree_cache.entries) == 4
+    scanner.shutdown()
+    assert scanner.tree_cache.entries_max == 4
+    # and bounded whatever the trees
+    scanner = DirectoriesScanner(cache = cache, tree_cache = ListingCache(entries_max = 4), tree_cache_entries_max = 8)
+    scanner.submit(tmp_path / "tree", 2)
+    results_wait(scanner)
+    assert scanner.tree_cache.entries_max == 8
+    scanner.shutdown()
+
+def test_files_pages():
+    pages = FilesPages([f"a v{idx}.blend" for idx in range(1, 26)] + ["b v1.blend", os.path.join("old", "a v0.blend")])
+    assert pages.file_paths[:3] == [os.path.join("old", "a v0.blend"), "a v1.blend", "a v2.blend"]
+    page = pages.page_get(0, 10, "a v")
+    assert page.file_paths == tuple(f"a v{idx}.blend" for idx in range(25, 15, -1))
+    assert (page.page, page.pages_count, page.count) == (0, 3, 26)
+    page = pages.page_get(5, 10, "a v")
+    assert page.page == 2
+    assert page.file_paths == tuple(f"a v{idx}.blend" for idx in range(5, 0, -1)) + (os.path.join("old", "a v0.blend"),)
+    assert pages.page_get(0, 10, "", "V2").file_paths == tuple(f"a v{idx}.blend" for idx in [25, 24, 23, 22, 21, 20, 2])
+    empty = pages.page_get(3, 10, "missing")
+    assert (empty.file_paths, empty.page, empty.pages_count, empty.count) == ((), 0, 1, 0)
+
+def test_files_pages_update():
+    pages = FilesPages(["a v1.blend", "a v3.blend"])
+    assert pages.update(["a v2.blend", "a v10.blend"], ["a v3.blend", "missing.blend"])
+    assert not pages.update(["a v2.blend"])
+    assert pages.file_paths == ["a v1.blend", "a v2.blend", "a v10.blend"]
+    assert "a v2.blend" in pages and "a v3.blend" not in pages
+    assert not pages.file_paths_set(reversed(pages.file_paths))
+    file_paths = [f"b v{idx}.blend" for idx in range(FilesPages.updates_max + 1)]
+    assert pages.file_paths_set(file_paths + ["a v1.blend"])
+    assert pages.file_paths == ["a v1.blend"] + file_paths
+
+def test_files_pages_merge():
+    """ many files are merged with the sorted ones, as if inserted one by one """
+    count = FilesPages.updates_max * 2
+    pages = FilesPages([f"a v{idx}.blend" for idx in range(0, count, 2)])
+    pages_inserted = FilesPages(pages.file_paths)
+    added = [f"a v{idx}.blend" for idx in range(1, count, 2)] + ["a v0.blend"]
+    assert pages.update(added)
+    for file_path in added:
+        pages_inserted.update([file_path])
+    assert pages.file_paths == pages_inserted.file_paths == [f"a v{idx}.blend" for idx in range(count)]
+    assert pages.names == pages_inserted.names
+    assert pages.keys == sorted(pages.keys)
+    assert not pages.update(added)
+    removed = [f"a v{idx}.blend" for idx in range(1, count, 2)]
+    assert pages.update(["b v1.blend"], removed + ["missing.blend"])
+    assert pages.file_paths == [f"a v{idx}.blend" for idx in range(0, count, 2)] + ["b v1.blend"]
+    assert pages.update((), pages.file_paths)
+    assert (pages.keys, pages.file_paths, pages.names) == ([], [], [])
+
+def test_blend_file_names_case_insensitive(monkeypatch, tmp_path):
+    """ on Windows names match in any case, like `Path.glob` matched them there """
+    names = ["Shot v2.blend", "shot v3.BLEND", "other.blend"]
+    monkeypatch.setattr(scan, "is_case_insensitive", False)
+    assert list(blend_file_names_filter(names, "shot")) == []
+    monkeypatch.setattr(scan, "is_case_insensitive", True)
+    assert blend_file_name_matches("Shot v2.blend", "shot")
+    assert blend_file_name_matches("shot v3.BLEND", "SHOT")
+    assert list(blend_file_names_filter(names, "shot")) == ["Shot v2.blend", "shot v3.BLEND"]
+    assert list(blend_file_names_filter(names)) == names
+    for name in names:
+        (tmp_path / name).touch()
+    assert sorted(e.name for e in blend_files_scan(tmp_path, "shot")) == ["Shot v2.blend", "shot v3.BLEND"]
+    assert FilesPages(names).page_get(0, 10, "shot").file_paths == ("shot v3.BLEND", "Shot v2.blend")
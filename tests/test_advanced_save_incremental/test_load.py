@@ -1,7 +1,15 @@
+import os
 import pathlib
+import tomllib
 
+import pytest
+
+from advanced_save_incremental.core import Template
+from advanced_save_incremental.core import VersionTemplate
 from advanced_save_incremental.core.persistence import templates_export
 from advanced_save_incremental.core.persistence import templates_import
+from advanced_save_incremental.exts.stdx.tomlx import items_dumps
+from advanced_save_incremental.exts.stdx.tomlx import value_dump
 from test_advanced_save_incremental.fixtures import default_templates_example
 
 dir_path = pathlib.Path(__file__).absolute().parent
@@ -14,3 +22,84 @@ def test_export():
     file_path = dir_path / "output/exported-templates-example.toml"
     templates_export(file_path, default_templates_example)
     assert default_templates_example == templates_import(file_path)
+
+def test_from_dicts():
+    templates_dicts = [
+        {"name": "a", "prefix": "x", "version": {"separator": "-", "count": 2}},
+        {"name": "b"},
+        None,
+    ]
+    templates = Template.from_dicts(templates_dicts)
+    assert templates == [Template.from_dict(d) for d in templates_dicts]
+    assert templates[0] == Template("a", "x", None, VersionTemplate("-", 2))
+    assert templates[2] == Template()
+
+def test_export_escaping(tmp_path):
+    file_path = tmp_path / "templates.toml"
+    templates = [
+        Template("quote \"", 'C:\\renders\\', "\ttab\n", VersionTemplate("'", 2, 2)),
+        Template("unicode ✓ \x7f \x00", None, "a\"\"\"b"),
+    ]
+    templates_export(file_path, templates)
+    assert templates_import(file_path) == templates
+
+def test_toml_items_dumps():
+    """ the values written without escaping are read back as the escaped ones """
+    values = ["plain", "", "✓ \u2028", "\x85", "a\"b", "a\\b", "tab\t", "\x7f", True, False, 0, -3, 2.5]
+    items = [(f"k{idx}", value) for idx, value in enumerate(values)]
+    text = items_dumps(items)
+    assert tomllib.loads(text) == dict(items)
+    assert text.split("\n") == [f"{key} = {value_dump(value)}" for key, value in items]
+    with pytest.raises(TypeError):
+        items_dumps([("k", None)])
+
+def test_export_round_trip_large(tmp_path):
+    file_path = tmp_path / "templates.toml"
+    templates = [
+        Template(f"Template {idx}", f"Artist \"{idx}\" - ", " v\\", VersionTemplate(".", idx % 3 + 1, idx % 3 + 1))
+        for idx in range(10_000)]
+    templates_export(file_path, templates)
+    assert templates_import(file_path) == templates
+    assert [p.name for p in tmp_path.iterdir()] == ["templates.toml"]
+
+def test_export_atomic(tmp_path):
+    file_path = tmp_path / "templates.toml"
+    templates_export(file_path, default_templates_example)
+    def templates_gen():
+        yield default_templates_example[0]
+        raise RuntimeError("export interrupted")
+    with pytest.raises(RuntimeError):
+        templates_export(file_path, templates_gen())
+    assert [p.name for p in tmp_path.iterdir()] == ["templates.toml"]
+    assert templates_import(file_path) == default_templates_example
+
+def test_import_cache(tmp_path):
+    file_path = tmp_path / "templates.toml"
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    templates_export(file_path, default_templates_example)
+    assert templates_import(file_path, cache_dir) == default_templates_example
+    [cache_path] = cache_dir.iterdir()
+    # a cache hit does not parse the library
+    cache_path.write_bytes(cache_path.read_bytes().replace(b"1st Template", b"1st Cached  "))
+    assert templates_import(file_path, cache_dir)[0].name == "1st Cached  "
+    # a touched but unchanged library is validated by its content hash
+    os.utime(file_path, ns = (0, 0))
+    assert templates_import(file_path, cache_dir)[0].name == "1st Cached  "
+    # a changed library is parsed again
+    templates_export(file_path, default_templates_example[1:])
+    assert templates_import(file_path, cache_dir) == default_templates_example[1:]
+    # a corrupted cache is ignored
+    cache_path.write_bytes(b"corrupted")
+    assert templates_import(file_path, cache_dir) == default_templates_example[1:]
+
+def test_import_dir(tmp_path):
+    templates_export(tmp_path / "b-modeling.toml", [Template("Shot"), Template("Asset")])
+    templates_export(tmp_path / "a-layout.toml", [Template("Shot", prefix = "x"), Template("Shot.001")])
+    templates_export(tmp_path / "c-empty.toml", [])
+    (tmp_path / "notes.txt").write_text("Shot")
+    assert [t.name for t in templates_import(tmp_path)] == ["Shot", "Shot.001", "Shot.002", "Asset"]
+    assert templates_import(tmp_path)[0].prefix == "x"
+    (tmp_path / "d-broken.toml").write_text("[[templates]\n")
+    with pytest.raises(tomllib.TOMLDecodeError, match = "d-broken.toml"):
+        templates_import(tmp_path)
@@ -1,10 +1,23 @@
+import time
+from dataclasses import FrozenInstanceError
+
+import pytest
+
 from advanced_save_incremental.core import parse_stem
+from advanced_save_incremental.core import parse_stems
 from advanced_save_incremental.core import StemParts
 from advanced_save_incremental.core import Template
+from advanced_save_incremental.core import templates_matcher_get
 from advanced_save_incremental.core import Version
 from advanced_save_incremental.core import VersionTemplate
+from advanced_save_incremental.core.parse import version_pattern_get
+from advanced_save_incremental.core.parse import version_scan
+from advanced_save_incremental.core.parse import version_search
+
+engines = ["regex", "scan"]
 
-def test_parse():
+@pytest.mark.parametrize("engine", engines)
+def test_parse(engine):
     stem = "John Doe - Project Foobar v3.0.12"
     version_template = VersionTemplate(
         separator = ".",
@@ -25,4 +38,147 @@ def test_parse():
             template = version_template,
         )
     )
-    assert parse_stem(stem, template) == expected_stem_parts
+    assert parse_stem(stem, template, engine) == expected_stem_parts
+
+@pytest.mark.parametrize("engine", engines)
+def test_parse_does_not_mutate_template(engine):
+    version_template = VersionTemplate(separator = ".", count = 3, width = 0)
+    template = Template(prefix = "", suffix = " v", version = version_template)
+    stem_parts = parse_stem("Project Foobar v03.00.12", template, engine)
+    assert template.version == VersionTemplate(separator = ".", count = 3, width = 0)
+    assert stem_parts.version.template.width == 2
+    assert hash(template) == hash(Template(prefix = "", suffix = " v", version = version_template))
+
+def test_parse_version_pattern_cache():
+    version_pattern_get.cache_clear()
+    template = Template(prefix = "", suffix = " v", version = VersionTemplate(".", 2, 1))
+    for stem in ["a v1.2", "b v3.4", "c v5.6"]:
+        parse_stem(stem, template)
+    info = version_pattern_get.cache_info()
+    assert (info.hits, info.misses) == (2, 1)
+
+@pytest.mark.parametrize("engine", engines)
+def test_parse_stems(engine):
+    template = Template(
+        prefix = "John Doe - ",
+        suffix = " v",
+        version = VersionTemplate(separator = ".", count = 3, width = 1),
+    )
+    stems = [
+        "John Doe - Project Foobar v3.0.12",
+        "Project Foobar v03.01.02",
+        "John Doe - Project Foobar",
+        "Project Foobar v1.2",
+    ]
+    columns = parse_stems(stems, template, engine)
+    assert len(columns) == len(stems)
+    for idx, stem in enumerate(stems):
+        stem_parts = parse_stem(stem, template, engine)
+        assert columns.prefixes[idx] == stem_parts.prefix
+        assert columns.roots[idx] == stem_parts.root
+        assert columns.suffixes[idx] == stem_parts.suffix
+    assert [columns.matched_get(idx) for idx in range(len(stems))] == [True, True, False, False]
+    assert columns.version_parts_get(0) == [3, 0, 12]
+    assert columns.version_parts_get(1) == [3, 1, 2]
+    assert columns.version_parts_get(2) == [0, 0, 0]
+    assert list(columns.versions_widths) == [1, 2, 0, 0]
+
+def test_templates_matcher():
+    templates = (
+        Template(name = "any", version = VersionTemplate(".", 1, 1)),
+        Template(name = "author", prefix = "John Doe - ", suffix = " v",
+            version = VersionTemplate(".", 3, 1)),
+        Template(name = "wip", suffix = "_wip"),
+        Template(name = "underscored", suffix = "_v", version = VersionTemplate("_", 2, 2)),
+    )
+    matcher = templates_matcher_get(templates)
+    assert matcher is templates_matcher_get(templates)
+    stems = [
+        "John Doe - Project Foobar v3.0.12",
+        "Project Foobar_v03_01",
+        "Project Foobar_v3_1",
+        "Project Foobar 7",
+        "Project Foobar_wip",
+        "Project Foobar",
+    ]
+    assert matcher.indices_get(stems) == [1, 3, 0, 0, 2, -1]
+    assert matcher.match("John Doe - Project Foobar v3.0.12") == (1, StemParts(
+        prefix = "John Doe - ",
+        root = "Project Foobar",
+        suffix = " v",
+        version = Version([3, 0, 12], VersionTemplate(".", 3, 1)),
+    ))
+    assert matcher.match("Project Foobar_v03_01") == (3, StemParts(
+        prefix = "",
+        root = "Project Foobar",
+        suffix = "_v",
+        version = Version([3, 1], VersionTemplate("_", 2, 2)),
+    ))
+    assert matcher.match("Project Foobar_wip") == (2, StemParts("", "Project Foobar", "_wip", None))
+    assert matcher.match("Project Foobar") is None
+
+def test_templates_matcher_version_count():
+    """ of the templates with the same affixes the one with more version parts matches """
+    templates = (
+        Template(name = "one", version = VersionTemplate("_", 1, 1)),
+        Template(name = "two", version = VersionTemplate("_", 2, 1)),
+    )
+    for templates_ordered in [templates, templates[::-1]]:
+        matcher = templates_matcher_get(templates_ordered)
+        idx, stem_parts = matcher.match("a_1_2")
+        assert templates_ordered[idx].name == "two"
+        assert stem_parts.root == "a_"
+        assert stem_parts.version.parts == (1, 2)
+
+def test_version_engines_agree():
+    version_templates = [
+        VersionTemplate(".", 1, 1),
+        VersionTemplate(".", 3, 1),
+        VersionTemplate(".", 2, 2),
+        VersionTemplate("..", 2, 0),
+        VersionTemplate("_v", 2, 1),
+        VersionTemplate("1", 2, 1),
+    ]
+    stems = [
+        "", "1", "a", "a1", "a1.2", "a1.2.3", "a1.2.3.4", "1.2.3", "a.1.2", "a1..2", "a1...2",
+        "a01.02", "a1.02", "a123", "a1_v2", "a_v1_v2", "a1.2x", "a\u0663.\u0664", "a\u00b2.3", "a112",
+    ]
+    for version_template in version_templates:
+        for stem in stems:
+            assert version_scan(stem, version_template) == version_search(stem, version_template), \
+                (stem, version_template)
+
+@pytest.mark.parametrize("engine", engines)
+def test_parse_adversarial(engine):
+    template = Template(prefix = "", suffix = "", version = VersionTemplate(".", 3, 1))
+    matcher = templates_matcher_get((template,))
+    stems = [
+        "1" * 100_000,
+        "1" * 100_000 + "x",
+        "x" + "1" * 100_000,
+        "1." * 50_000,
+        ".".join(["1" * 1_000] * 100),
+    ]
+    time_start = time.perf_counter()
+    for stem in stems:
+        stem_parts = parse_stem(stem, template, engine)
+        assert stem_parts.root == stem
+        assert stem_parts.version.parts == (0,)
+        assert matcher.match(stem) is None
+    # quadratic matching takes minutes on these
+    assert time.perf_counter() - time_start < 1
+    digits = "1" * VersionTemplate.config.part_digits_max
+    stem_parts = parse_stem(f"a{digits}.2.3", template, engine)
+    assert (stem_parts.root, stem_parts.version.parts) == ("a", (int(digits), 2, 3))
+    stem_parts = parse_stem(f"a1{digits}.2.3", template, engine)
+    assert (stem_parts.root, stem_parts.version.parts) == (f"a1{digits}.2.3", (0,))
+
+def test_parse_results_frozen():
+    template = Template(prefix = "", suffix = " v", version = VersionTemplate(".", 3, 1))
+    stem_parts = parse_stem("Project Foobar v3.0.12", template)
+    for obj in [template, template.version, stem_parts, stem_parts.version]:
+        assert not hasattr(obj, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        stem_parts.root = "Other"
+    with pytest.raises(FrozenInstanceError):
+        stem_parts.version.parts = (4, 0, 0)
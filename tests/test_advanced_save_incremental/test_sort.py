@@ -0,0 +1,11 @@
+from advanced_save_incremental.core import natural_key_get
+
+def test_natural_key_get():
+    stems = ["v10", "v2", "V1", "1st", "v", "", "v2a", "v02", "v²", "v" + "9" * 5_000, "v3"]
+    assert sorted(stems, key = natural_key_get) == [
+        "", "1st", "v", "V1", "v2", "v02", "v2a", "v3", "v10", "v" + "9" * 5_000, "v²"]
+
+def test_natural_key_get_mixed_chunks():
+    # the first chunk is a number in one stem and a word in the other
+    assert natural_key_get("2 foo") < natural_key_get("foo 1")
+    assert natural_key_get("foo 1") > natural_key_get("10 foo")
@@ -0,0 +1,111 @@
+import pytest
+
+from advanced_save_incremental.core import build_version_str
+from advanced_save_incremental.core import DirectoryVersions
+from advanced_save_incremental.core import parse_stems
+from advanced_save_incremental.core import Template
+from advanced_save_incremental.core import Version
+from advanced_save_incremental.core import version_increment
+from advanced_save_incremental.core import versions_dedup
+from advanced_save_incremental.core import versions_sort
+from advanced_save_incremental.core import VersionIndex
+from advanced_save_incremental.core import version_key_get
+from advanced_save_incremental.core import version_parts_from_key
+from advanced_save_incremental.core import VersionTable
+from advanced_save_incremental.core import VersionTemplate
+
+def test_version_key():
+    assert version_key_get([3, 0, 12], 3) < version_key_get([3, 1, 0], 3)
+    assert version_key_get([3], 3) == version_key_get([3, 0, 0], 3)
+    assert version_key_get([3, 0, 12, 4], 3) == version_key_get([3, 0, 12], 3)
+    assert version_parts_from_key(version_key_get([3, 0, 12], 3), 3) == [3, 0, 12]
+    with pytest.raises(ValueError):
+        version_key_get([1 << 64], 1)
+
+def test_version_ordering():
+    version_template = VersionTemplate(".", 3, 1)
+    versions = [Version(parts, version_template) for parts in [[3, 0, 12], [3, 0, 2], [10], [3, 1]]]
+    assert [v.parts for v in sorted(versions)] == [(3, 0, 2), (3, 0, 12), (3, 1), (10,)]
+    assert max(versions).parts == (10,)
+    assert Version([3, 1], version_template) == Version([3, 1, 0], version_template)
+    assert len({Version([3, 1], version_template), Version([3, 1, 0], version_template)}) == 1
+    assert Version([1], VersionTemplate(".", 1, 1)) != Version([1], version_template)
+    with pytest.raises(TypeError):
+        Version([1], VersionTemplate(".", 1, 1)) < Version([1], version_template)
+    assert versions_sort(versions) == sorted(versions)
+    assert versions_sort(versions, reverse = True) == sorted(versions, reverse = True)
+    # the separator and width are not compared
+    assert Version([1, 2], VersionTemplate(".", 2, 1)) == Version([1, 2], VersionTemplate("_", 2, 2))
+    deduped = versions_dedup([Version([3, 1], version_template), *versions])
+    assert [v.parts for v in deduped] == [(3, 1), (3, 0, 12), (3, 0, 2), (10,)]
+
+def test_stems_columns_versions_keys():
+    template = Template(prefix = "", suffix = " v", version = VersionTemplate(".", 2, 1))
+    columns = parse_stems(["a v1.2", "a v1.10", "a"], template)
+    assert columns.versions_keys_get() == [
+        version_key_get([1, 2], 2), version_key_get([1, 10], 2), 0]
+
+def test_version_index():
+    index = VersionIndex.from_keys(
+        [version_key_get(parts, 3) for parts in [[1, 0, 0], [1, 0, 3], [1, 2, 0], [2, 0, 0], [1, 0, 3]]], 3)
+    assert len(index) == 4
+    assert index.latest_get() == [2, 0, 0]
+    assert index.is_latest([2, 0, 0]) and not index.is_latest([1, 2, 0])
+    assert [1, 0, 3] in index and [1, 0, 2] not in index
+    assert index.previous_get([1, 2, 0]) == [1, 0, 3]
+    assert index.previous_get([1, 1, 0]) == [1, 0, 3]
+    assert index.previous_get([1, 0, 0]) is None
+    assert index.next_get([1, 0, 3]) == [1, 2, 0]
+    assert index.next_get([2, 0, 0]) is None
+    assert index.count_get([1]) == 3
+    assert index.count_get([1, 0]) == 2
+    assert index.count_get([3]) == 0
+    assert index.latest_with_get([1]) == [1, 2, 0]
+    assert index.latest_with_get([3]) is None
+    assert index.missing_get() == [[1, 0, 1], [1, 0, 2]]
+    assert index.missing_get(1) == [[1, 1, 0]]
+    index.add([1, 0, 1])
+    index.add([3])
+    assert index.latest_get() == [3, 0, 0]
+    assert index.missing_get() == [[1, 0, 2]]
+    index.discard([3, 0, 0])
+    index.discard([4, 0, 0])
+    assert index.latest_get() == [2, 0, 0]
+
+def test_directory_versions_file_name_add():
+    template = Template(prefix = "", suffix = "_v", version = VersionTemplate(".", 2, 1))
+    directory_versions = DirectoryVersions.from_file_names(["a_v1.0.blend", "b_v1.0.blend"], template)
+    directory_versions.file_name_add("a_v1.4.blend")
+    directory_versions.file_name_add("c_v2.1.blend")
+    directory_versions.file_name_add("not versioned.blend")
+    assert directory_versions.latest_get("a") == [1, 4]
+    assert directory_versions.latest_get("c") == [2, 1]
+    assert directory_versions.index_get("not versioned") is None
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_version_table(use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    version_template = VersionTemplate("-", 3, 2)
+    table = VersionTable.from_parts(version_template,
+        ["a", "b", "a", "b"], [[1, 2, 3], [4], [1, 10], [4, 0, 0, 7]], use_numpy)
+    assert table.is_numpy == use_numpy
+    assert table.parts_get() == [[1, 2, 3], [4, 0, 0], [1, 10, 0], [4, 0, 0]]
+    for idx in [0, 1, 2, -1]:
+        assert table.increment(idx).parts_get() == [
+            version_increment(parts, idx) for parts in table.parts_get()]
+    with pytest.raises(IndexError):
+        table.increment(3)
+    assert list(table.compare(table.increment(1))) == [-1] * 4
+    assert list(table.increment(0).compare(table)) == [1] * 4
+    assert list(table.compare(table)) == [0] * 4
+    assert table.latest_per_root_get() == {"a": [1, 10, 0], "b": [4, 0, 0]}
+    assert table.version_strs_get() == [
+        build_version_str(version_template, parts) for parts in table.parts_get()]
+    assert table.version_strs_get()[0] == "01-02-03"
+
+def test_version_table_from_columns():
+    template = Template(prefix = "", suffix = " v", version = VersionTemplate(".", 2, 1))
+    table = VersionTable.from_columns(template.version, parse_stems(["a v1.2", "b", "a v1.10"], template))
+    assert table.roots == ["a", "a"]
+    assert table.latest_per_root_get() == {"a": [1, 10]}
@@ -0,0 +1,104 @@
+import os
+import time
+
+import pytest
+
+from advanced_save_incremental.core import DirectoriesScanner
+from advanced_save_incremental.core import DirectoryWatcher
+from advanced_save_incremental.core import InotifyWatcher
+from advanced_save_incremental.core import ListingCache
+from advanced_save_incremental.core import WatchEvent
+
+@pytest.fixture(params = [DirectoryWatcher, InotifyWatcher])
+def watcher(request):
+    try:
+        watcher = request.param()
+    except OSError as exc:
+        pytest.skip(str(exc))
+    yield watcher
+    watcher.close()
+
+def events_get(watcher: DirectoryWatcher) -> set[tuple]:
+    return {(e.kind, e.name, e.is_directory) for e in watcher.events_read()}
+
+def test_watcher(watcher, tmp_path):
+    directory = str(tmp_path.resolve())
+    (tmp_path / "a v1.blend").touch()
+    watcher.watched_set([tmp_path, tmp_path / "missing"])
+    assert watcher.watched == {directory}
+    assert events_get(watcher) == set()
+    (tmp_path / "a v2.blend").touch()
+    (tmp_path / "renders").mkdir()
+    # polling compares the modification times
+    os.utime(tmp_path, ns = (1, 1))
+    assert events_get(watcher) == {("created", "a v2.blend", False), ("created", "renders", True)}
+    os.rename(tmp_path / "a v2.blend", tmp_path / "a v3.blend")
+    (tmp_path / "a v1.blend").unlink()
+    os.utime(tmp_path, ns = (2, 2))
+    assert events_get(watcher) == {
+        ("deleted", "a v2.blend", False), ("created", "a v3.blend", False), ("deleted", "a v1.blend", False)}
+    watcher.watched_set([])
+    (tmp_path / "a v4.blend").touch()
+    os.utime(tmp_path, ns = (3, 3))
+    assert events_get(watcher) == set()
+
+def test_watcher_directory_removed(watcher, tmp_path):
+    (tmp_path / "shots").mkdir()
+    watcher.watch(tmp_path / "shots")
+    (tmp_path / "shots").rmdir()
+    assert ("rescan", "", False) in events_get(watcher)
+    assert watcher.watched == set()
+
+def test_watcher_remote(tmp_path, monkeypatch):
+    """ the directories on network filesystems are polled, inotify misses their remote changes """
+    try:
+        watcher = InotifyWatcher()
+    except OSError as exc:
+        pytest.skip(str(exc))
+    monkeypatch.setattr(watcher, "is_remote", lambda path: True)
+    watcher.watch(tmp_path)
+    assert watcher.descriptors == {}
+    assert watcher.watched == {str(tmp_path.resolve())}
+    (tmp_path / "a v1.blend").touch()
+    os.utime(tmp_path, ns = (1, 1))
+    assert events_get(watcher) == {("created", "a v1.blend", False)}
+    watcher.unwatch(tmp_path)
+    assert watcher.watched == set()
+    watcher.close()
+
+def test_directories_scanner_watch(tmp_path):
+    """ the watched directories are read on a worker, the events popped later """
+    watcher = DirectoryWatcher()
+    watcher.watched_set([tmp_path])
+    scanner = DirectoriesScanner(cache = ListingCache())
+    (tmp_path / "a v1.blend").touch()
+    os.utime(tmp_path, ns = (1, 1))
+    events = []
+    time_end = time.monotonic() + 5.0
+    while not events and time.monotonic() < time_end:
+        scanner.watch_submit(watcher, [str(tmp_path)])
+        events += scanner.watch_events_pop()
+        time.sleep(0.001)
+    assert [(e.kind, e.name) for e in events] == [("created", "a v1.blend")]
+    scanner.shutdown(wait = True)
+    assert not scanner.is_watching
+
+def test_listing_cache_events_apply(tmp_path):
+    (tmp_path / "a v1.blend").touch()
+    (tmp_path / "shots").mkdir()
+    cache = ListingCache()
+    directory = cache.get(tmp_path).path
+    directory_shots = cache.get(tmp_path / "shots").path
+    (tmp_path / "a v2.blend").touch()
+    cache.events_apply([
+        WatchEvent(directory, "created", "a v2.blend"),
+        WatchEvent(directory, "deleted", "a v1.blend"),
+        WatchEvent(directory, "created", "a v3.blend"),
+        WatchEvent(directory, "deleted", "a v3.blend"),
+    ])
+    # the listing is updated in place instead of scanning the directory again
+    assert cache.get(tmp_path).files == ("a v2.blend",)
+    assert cache.misses == 2
+    cache.events_apply([WatchEvent(directory, "rescan"), WatchEvent(directory_shots, "created", "x.blend")])
+    assert list(cache.entries) == [directory_shots]
+    assert cache.entries[directory_shots].files == ("x.blend",)